@@ -3,23 +3,61 @@ Business requirements module for Tampere Explorer Hub.
 This module contains functions for processing business requirements.
 """
 
+import asyncio
+import difflib
+import hashlib
+import json
 import logging
-import os
-import openai
+from collections import Counter
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
 from dotenv import load_dotenv
-from app.models import BusinessType, BusinessIntent, BusinessRequirementNotSupported
+from app import config
+from app.llm import LLMUnavailableError, create_chat_completion, stream_chat_completion
+from app.singleflight import SingleFlight
+from app.llm_cache import LLMCache, normalize_text, prompt_version
+from app.metrics import LOCAL_CLASSIFIER_AGREEMENT, LOCAL_CLASSIFIER_RESULTS
+from app.models import (
+    BusinessType,
+    BusinessIntent,
+    BusinessPreferences,
+    BusinessRequirementNotSupported,
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
 logger = logging.getLogger(__name__)
 
+CLASSIFY_MODEL = "gpt-4.1-nano"
+CLASSIFY_PROMPT = (
+    "You are a business requirement classifier for a city business planning tool.\n"
+    "Supported business types: Static (Car Wash), Mobile (Food Stall, Artisan Stall).\n"
+    "Supported intents: Research, Setup.\n"
+    "Supported location: Tampere.\n"
+    "Classify the following user business requirement into one of:\n"
+    "- Static: Car Wash\n"
+    "- Mobile: Food Stall\n"
+    "- Mobile: Artisan Stall\n"
+    "If the requirement does not fit any of these, respond with 'not supported'.\n"
+    "Also, determine the user's intent: 'Research' (if they are exploring, comparing, or gathering information) or 'Setup' (if they are ready to start or open the business).\n"
+    "Extract any city or geographical location mentioned in the requirement (null if none).\n"
+    "Respond in JSON with keys: supported (bool), business_type (Static|Mobile|null), business (Car Wash|Food Stall|Artisan Stall|null), intent (Research|Setup|null), location (str|null), message (str).\n"
+    "User requirement: {text}"
+)
+
+# Coalesces identical concurrent LLM calls (classification and summaries)
+llm_flight = SingleFlight("llm")
+
+# Parsed classifier answers keyed by normalized requirement text. The version
+# changes with the prompt or model, so stale answers are never served.
+classification_cache = LLMCache(
+    "classification",
+    version=prompt_version(CLASSIFY_PROMPT, CLASSIFY_MODEL),
+    path=config.LLM_CACHE_PATH,
+    ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+)
+
 
 def get_business_requirements_response(text: str) -> dict:
     """
@@ -77,10 +115,30 @@ def sanitize_user_input(text: str, max_length: int = 500) -> str:
     return text
 
 
-def classify_business_requirement_with_openai(text: str) -> dict:
+def _classification_result(parsed: dict, text: str) -> dict:
+    """Turn a parsed classifier answer into the classification result dict."""
+    if not parsed.get("supported", False):
+        return BusinessRequirementNotSupported(
+            message=parsed.get("message", "Business requirement not supported."),
+            input_text=text,
+        ).dict()
+
+    return {
+        "supported": True,
+        "business_type": parsed.get("business_type"),
+        "business": parsed.get("business"),
+        "intent": parsed.get("intent"),
+        "location": parsed.get("location"),
+        "message": parsed.get("message", "Business requirement classified."),
+    }
+
+
+async def classify_business_requirement_with_openai(text: str) -> dict:
     """
     Classify the business requirement using OpenAI's GPT-4.1-nano via the modern responses API.
     Returns a dict with either a supported business classification or a not-supported message.
+
+    Answers are cached by normalized text, so repeated phrasings skip the API call.
     """
     try:
         sanitized_text = sanitize_user_input(text)
@@ -88,89 +146,673 @@ def classify_business_requirement_with_openai(text: str) -> dict:
         logger.warning(f"Rejected user input: {e}")
         return BusinessRequirementNotSupported(message=str(e), input_text=text).dict()
 
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY environment variable not set.")
-
-    client = openai.OpenAI(api_key=api_key)
-
-    prompt = (
-        "You are a business requirement classifier for a city business planning tool.\n"
-        "Supported business types: Static (Car Wash), Mobile (Food Stall, Artisan Stall).\n"
-        "Supported intents: Research, Setup.\n"
-        "Supported location: Tampere.\n"
-        "Classify the following user business requirement into one of:\n"
-        "- Static: Car Wash\n"
-        "- Mobile: Food Stall\n"
-        "- Mobile: Artisan Stall\n"
-        "If the requirement does not fit any of these, respond with 'not supported'.\n"
-        "Also, determine the user's intent: 'Research' (if they are exploring, comparing, or gathering information) or 'Setup' (if they are ready to start or open the business).\n"
-        "Extract any city or geographical location mentioned in the requirement (null if none).\n"
-        "Respond in JSON with keys: supported (bool), business_type (Static|Mobile|null), business (Car Wash|Food Stall|Artisan Stall|null), intent (Research|Setup|null), location (str|null), message (str).\n"
-        f"User requirement: {sanitized_text}"
-    )
-
-    response = client.chat.completions.create(
-        model="gpt-4.1-nano",
+    cache_key = normalize_text(sanitized_text)
+    cached = await classification_cache.aget(cache_key)
+    if cached is not None:
+        logger.debug(f"Classification cache hit for '{cache_key}'")
+        return _classification_result(cached, text)
+
+    # Concurrent requests with the same normalized text share one API call
+    parsed = await llm_flight.do(
+        ("classify", cache_key), _request_classification, sanitized_text, cache_key
+    )
+    if parsed is None:
+        return BusinessRequirementNotSupported(
+            message="Could not classify the business requirement.", input_text=text
+        ).dict()
+    return _classification_result(parsed, text)
+
+
+async def _request_classification(sanitized_text: str, cache_key: str) -> Optional[dict]:
+    """Ask OpenAI to classify a requirement; returns the parsed answer or None."""
+    prompt = CLASSIFY_PROMPT.format(text=sanitized_text)
+
+    response = await create_chat_completion(
+        "classify",
+        model=CLASSIFY_MODEL,
         messages=[{"role": "user", "content": prompt}],
         response_format={"type": "json_object"},
         max_tokens=200,
         temperature=0.0,
     )
     result = response.choices[0].message.content
-    import json
 
     try:
         parsed = json.loads(result)
         logger.debug(f"OpenAI classification response: {parsed}")
     except Exception:
         logger.error("Failed to parse OpenAI response", exc_info=True)
-        return BusinessRequirementNotSupported(
-            message="Could not classify the business requirement.", input_text=text
-        ).dict()
+        return None
 
-    if not parsed.get("supported", False):
-        return BusinessRequirementNotSupported(
-            message=parsed.get("message", "Business requirement not supported."),
-            input_text=text,
-        ).dict()
+    await classification_cache.aset(cache_key, parsed)
+    return parsed
+
+
+SUMMARY_MODEL = "gpt-4.1-nano"
+SUMMARY_PROMPT = (
+    "You are a business location advisor for Tampere.\n"
+    "The user is interested in: {business_requirement}\n"
+    "Location type: {location_type}\n"
+    "Here are the relevant metrics for this zone (as JSON):\n{metrics}\n"
+    "Instructions: {instructions}\n"
+    "Create a concise, helpful summary for the user."
+)
+SUMMARY_FALLBACK = (
+    "This area has promising metrics for your business. (LLM summary unavailable)"
+)
+
+# Zone summaries keyed by a hash of the prompt inputs, so a zone summarized
+# for one user is served instantly to the next.
+summary_cache = LLMCache(
+    "summary",
+    version=prompt_version(SUMMARY_PROMPT, SUMMARY_MODEL),
+    path=config.LLM_CACHE_PATH if config.SUMMARY_CACHE_PERSIST else None,
+    ttl_seconds=config.SUMMARY_CACHE_TTL_SECONDS,
+    max_entries=config.SUMMARY_CACHE_MAX_ENTRIES,
+)
+
+# Local classifier vocabulary. Each phrase is a tuple of word stems matched
+# against consecutive tokens. A plain stem is a whole English word that may
+# take an ending from WORD_SUFFIXES ("stalls" matches "stall", "carpet" doesn't
+# match "car"); a stem ending in "-" matches any token it starts, which is how
+# Finnish stems cut before case endings work ("autopesulan" matches "autopesu-").
+BUSINESS_PHRASES = {
+    "Car Wash": [
+        ("car", "wash"),
+        ("carwash",),
+        ("car", "cleaning"),
+        ("car", "detailing"),
+        ("auto", "wash"),
+        ("autopesu-",),
+        ("autonpesu-",),
+        ("pesuhalli-",),
+        ("pesuasema-",),
+    ],
+    "Food Stall": [
+        ("food", "stall"),
+        ("food", "stand"),
+        ("food", "truck"),
+        ("food", "cart"),
+        ("street", "food"),
+        ("snack", "bar"),
+        ("hot", "dog"),
+        ("coffee", "cart"),
+        ("ruokakoj-",),
+        ("ruokarek-",),
+        ("ruokaauto-",),
+        ("ruokakärr-",),
+        ("katuruoka-",),
+        ("grillikoju-",),
+        ("nakkikioski-",),
+        ("kahvikärr-",),
+    ],
+    "Artisan Stall": [
+        ("artisan-",),
+        ("craft", "stall"),
+        ("craft", "stand"),
+        ("handicraft",),
+        ("handmade",),
+        ("crafts",),
+        ("käsityö-",),
+        ("taidekoju-",),
+        ("artesaani-",),
+    ],
+}
+BUSINESS_TYPES = {
+    "Car Wash": BusinessType.STATIC,
+    "Food Stall": BusinessType.MOBILE,
+    "Artisan Stall": BusinessType.MOBILE,
+}
+SETUP_STEMS = (
+    "open", "start", "launch", "setup", "establish", "run", "running", "begin",
+    "beginning", "perust-", "avaa-", "avat-", "aloit-", "käynnist-",
+)
+RESEARCH_STEMS = (
+    "research", "explor-", "compar-", "analy-", "study", "studies", "find",
+    "where", "best", "look", "plan", "planning", "consider", "tutki-",
+    "vertail-", "selvit-", "etsi-", "paras", "parha-", "missä", "mihin",
+    "harkit-", "suunnit-",
+)
+TAMPERE_STEMS = ("tamper-",)
+OTHER_CITY_STEMS = (
+    "helsin-", "espoo-", "espoos-", "vantaa-", "vantaal-", "turku-", "turus-",
+    "turun-", "oulu-", "oulus-", "jyväsky-", "lahti-", "lahde-", "kuopio-",
+    "pori-", "porin-", "stockholm-", "tukholm-", "london-", "lontoo-",
+    "tallin-", "berlin-",
+)
+# Endings a plain (whole word) stem may take
+WORD_SUFFIXES = ("", "s", "es", "ing", "ings", "er", "ers", "ed")
+NEGATION_WORDS = {"not", "no", "never", "without", "except", "ei", "en", "emme", "ilman"}
+# Filler words that don't lower confidence when left unexplained
+FILLER_WORDS = {
+    "a", "an", "the", "i", "we", "my", "our", "want", "would", "like", "to",
+    "in", "at", "for", "of", "on", "and", "or", "some", "new", "small",
+    "business", "shop", "stall", "city", "center", "centre", "area", "place",
+    "good", "location", "locations", "spot", "spots", "me", "help", "how",
+    "can", "could", "should", "is", "it", "be", "with", "near",
+    "haluan", "haluaisin", "haluamme", "minä", "oma", "uusi", "pieni",
+    "yritys", "keskusta", "keskustaan", "keskustassa", "paikka", "paikkaa",
+    "hyvä", "ja", "tai", "kanssa", "lähellä",
+}
+# Words that introduce a place ("in Paris", "Pirkkalan lähellä"), and Finnish
+# place case endings ("Rovaniemellä"); an unexplained place means the text may
+# be about another city, so the LLM decides
+PLACE_WORDS = {"in", "at", "near", "around", "outside", "lähellä"}
+PLACE_SUFFIXES = ("ssa", "ssä", "lla", "llä")
+# Similarity needed for a misspelled token to count as a stem (difflib ratio)
+FUZZY_CUTOFF = 0.85
+
+
+# Running totals for the hit rate and agreement log lines
+local_classifier_stats: Counter = Counter()
+
+
+class LocalClassification(NamedTuple):
+    """Result of the local classifier; preferences is None when nothing matched."""
+
+    preferences: Optional[BusinessPreferences]
+    confidence: float
+
+
+def _token_matches(token: str, stem: str, fuzzy: bool) -> float:
+    """Score how well a token matches a stem: 1.0 for an exact match, fuzzy ratio otherwise."""
+    if stem.endswith("-"):
+        stem = stem[:-1]
+        if token.startswith(stem):
+            return 1.0
+        candidate = token[: len(stem) + 2]
+    else:
+        if token.startswith(stem) and token[len(stem):] in WORD_SUFFIXES:
+            return 1.0
+        candidate = token
+    if not fuzzy or len(stem) < 5 or len(token) < 4:
+        return 0.0
+    matcher = difflib.SequenceMatcher(None, candidate, stem)
+    if matcher.real_quick_ratio() < FUZZY_CUTOFF or matcher.quick_ratio() < FUZZY_CUTOFF:
+        return 0.0
+    ratio = matcher.ratio()
+    return ratio if ratio >= FUZZY_CUTOFF else 0.0
+
+
+def _match_phrase(
+    tokens: List[str], phrase: Tuple[str, ...], fuzzy: bool
+) -> Tuple[float, Set[int]]:
+    """Best score of a phrase at any position, and the token positions it covers."""
+    best, best_span = 0.0, set()
+    first = phrase[0].rstrip("-")
+    for start in range(len(tokens) - len(phrase) + 1):
+        if not fuzzy and not tokens[start].startswith(first):
+            continue
+        score = 1.0
+        for offset, stem in enumerate(phrase):
+            score = min(score, _token_matches(tokens[start + offset], stem, fuzzy))
+            if not score:
+                break
+        if score > best:
+            best, best_span = score, set(range(start, start + len(phrase)))
+    return best, best_span
+
+
+def _match_stems(tokens: List[str], stems: Tuple[str, ...]) -> Set[int]:
+    """Positions of tokens that match any of the stems exactly."""
+    return {
+        i
+        for i, token in enumerate(tokens)
+        if any(_token_matches(token, stem, False) for stem in stems)
+    }
+
+
+def _names_unknown_place(
+    tokens: List[str], covered: Set[int], explained: Set[int]
+) -> bool:
+    """Whether the text names a place the vocabulary can't explain."""
+    for i, token in enumerate(tokens):
+        if token not in PLACE_WORDS:
+            if i not in explained and token.endswith(PLACE_SUFFIXES):
+                return True
+            continue
+        # The place is the first word after the filler ("in the Paris area",
+        # "in New York"); Finnish "lähellä" follows the place instead
+        step = -1 if token == "lähellä" else 1
+        place = i + step
+        while 0 <= place < len(tokens) and place not in covered:
+            if place not in explained:
+                return True
+            place += step
+    return False
+
+
+def classify_business_requirement_locally(text: str) -> LocalClassification:
+    """
+    Classify a business requirement with keyword, stem and fuzzy matching.
+
+    Recognizes the supported businesses, the intent and the location in
+    English and Finnish. Confidence is 0 when no business matched or another
+    city is named, low when several businesses match, the text is negated or
+    it names a place that isn't Tampere, and reduced by the share of words the
+    vocabulary can't explain.
+    """
+    tokens = normalize_text(text).split()
+    if not tokens:
+        return LocalClassification(None, 0.0)
+
+    scores: Dict[str, float] = {}
+    covered: Set[int] = set()
+    # Exact stem matches first; fuzzy matching (slower) only if nothing matched
+    for fuzzy in (False, True):
+        for business, phrases in BUSINESS_PHRASES.items():
+            for phrase in phrases:
+                score, span = _match_phrase(tokens, phrase, fuzzy)
+                if score:
+                    scores[business] = max(scores.get(business, 0.0), score)
+                    covered |= span
+        if scores:
+            break
+    if not scores:
+        return LocalClassification(None, 0.0)
+
+    business = max(scores, key=scores.get)
+    setup = _match_stems(tokens, SETUP_STEMS)
+    research = _match_stems(tokens, RESEARCH_STEMS)
+    tampere = _match_stems(tokens, TAMPERE_STEMS)
+    covered |= setup | research | tampere
+    intent = (
+        BusinessIntent.SETUP if setup and not research else BusinessIntent.RESEARCH
+    )
+    preferences = BusinessPreferences(
+        business_type=BUSINESS_TYPES[business],
+        business=business,
+        location="Tampere",
+        intent=intent,
+    )
+
+    if _match_stems(tokens, OTHER_CITY_STEMS):
+        return LocalClassification(preferences, 0.0)
+
+    explained = covered | {
+        i for i, token in enumerate(tokens) if token in FILLER_WORDS
+    }
+    confidence = scores[business] * (0.4 + 0.6 * len(explained) / len(tokens))
+    if (
+        len(scores) > 1
+        or NEGATION_WORDS.intersection(tokens)
+        or _names_unknown_place(tokens, covered, explained)
+    ):
+        confidence = min(confidence, 0.5)
+    return LocalClassification(preferences, round(confidence, 3))
+
+
+def _record_local_agreement(local: LocalClassification, result: dict) -> None:
+    """Compare a low-confidence local guess with the LLM answer and log it."""
+    if local.preferences is None:
+        return
+    agrees = (
+        result.get("supported", False)
+        and (result.get("business") or "").strip().lower()
+        == local.preferences.business.lower()
+    )
+    outcome = "agree" if agrees else "disagree"
+    local_classifier_stats[outcome] += 1
+    LOCAL_CLASSIFIER_AGREEMENT.labels(result=outcome).inc()
+    compared = local_classifier_stats["agree"] + local_classifier_stats["disagree"]
+    logger.info(
+        f"Local classifier {outcome}s with LLM "
+        f"(local={local.preferences.business}, confidence={local.confidence}, "
+        f"llm={result.get('business')}, "
+        f"agreement {local_classifier_stats['agree']}/{compared})"
+    )
+
+
+def _local_hit_rate() -> str:
+    hits = local_classifier_stats["hit"]
+    total = hits + local_classifier_stats["fallback"]
+    return f"{hits}/{total} ({hits / total:.0%})"
 
+
+async def classify_business_requirement(text: str) -> dict:
+    """
+    Classify a business requirement locally when confident, else with the LLM.
+
+    Returns the same dict as classify_business_requirement_with_openai.
+    """
+    if not config.LOCAL_CLASSIFIER_ENABLED:
+        return await classify_business_requirement_with_openai(text)
+
+    try:
+        sanitize_user_input(text)
+    except ValueError as e:
+        logger.warning(f"Rejected user input: {e}")
+        return BusinessRequirementNotSupported(message=str(e), input_text=text).dict()
+
+    local = classify_business_requirement_locally(text)
+    if local.confidence >= config.LOCAL_CLASSIFIER_THRESHOLD:
+        local_classifier_stats["hit"] += 1
+        LOCAL_CLASSIFIER_RESULTS.labels(outcome="hit").inc()
+        logger.info(
+            f"Local classifier hit: {local.preferences.business} "
+            f"(confidence={local.confidence}, hit rate {_local_hit_rate()})"
+        )
+        return _local_result(local.preferences)
+
+    local_classifier_stats["fallback"] += 1
+    LOCAL_CLASSIFIER_RESULTS.labels(outcome="fallback").inc()
+    logger.info(
+        f"Local classifier confidence {local.confidence} below threshold, asking the LLM "
+        f"(hit rate {_local_hit_rate()})"
+    )
+    try:
+        result = await classify_business_requirement_with_openai(text)
+    except Exception as e:
+        # Serve the local guess rather than failing while OpenAI is slow or down
+        if local.confidence > 0:
+            logger.warning(
+                f"LLM classification failed ({e}), using local guess "
+                f"{local.preferences.business} (confidence={local.confidence})"
+            )
+            return _local_result(local.preferences)
+        if isinstance(e, LLMUnavailableError):
+            raise
+        raise LLMUnavailableError(f"LLM classification failed: {e}") from e
+    _record_local_agreement(local, result)
+    return result
+
+
+def _local_result(preferences: BusinessPreferences) -> dict:
+    """Express a local classification as a classification result dict."""
     return {
         "supported": True,
-        "business_type": parsed.get("business_type"),
-        "business": parsed.get("business"),
-        "intent": parsed.get("intent"),
-        "location": parsed.get("location"),
-        "message": parsed.get("message", "Business requirement classified."),
+        "business_type": preferences.business_type.value,
+        "business": preferences.business,
+        "intent": preferences.intent.value,
+        "location": preferences.location,
+        "message": "Business requirement classified.",
     }
 
 
-def generate_llm_summary(metrics, business_requirement, location_type, instructions):
+def summary_cache_key(metrics, business_requirement, location_type, instructions) -> str:
+    """Canonical hash of everything that shapes a zone summary."""
+    payload = json.dumps(
+        {
+            "metrics": metrics,
+            "business_requirement": business_requirement,
+            "location_type": location_type,
+            "instructions": instructions,
+            "model": SUMMARY_MODEL,
+            "version": summary_cache.version,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def generate_llm_summary(metrics, business_requirement, location_type, instructions):
     """
     Generate a summary using OpenAI based on metrics, business requirement, location type, and instructions.
+
+    Summaries are cached by summary_cache_key; the fallback text is never cached.
     """
+    cache_key = summary_cache_key(
+        metrics, business_requirement, location_type, instructions
+    )
+    cached = await summary_cache.aget(cache_key)
+    if cached is not None:
+        logger.debug(f"Summary cache hit for {cache_key[:12]}")
+        return cached
     try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY environment variable not set.")
-        client = openai.OpenAI(api_key=api_key)
-        # Compose a prompt for the LLM
-        prompt = (
-            f"You are a business location advisor for Tampere.\n"
-            f"The user is interested in: {business_requirement}\n"
-            f"Location type: {location_type}\n"
-            f"Here are the relevant metrics for this zone (as JSON):\n{metrics}\n"
-            f"Instructions: {instructions}\n"
-            f"Create a concise, helpful summary for the user."
+        # Concurrent requests for the same zone share one API call
+        return await llm_flight.do(
+            ("summary", cache_key),
+            _request_summary,
+            cache_key,
+            metrics,
+            business_requirement,
+            location_type,
+            instructions,
         )
-        response = client.chat.completions.create(
-            model="gpt-4.1-nano",
+    except LLMUnavailableError as e:
+        logger.warning(f"LLM summary unavailable: {e}")
+        return SUMMARY_FALLBACK
+    except Exception as e:
+        logger.error(f"Failed to generate LLM summary: {e}", exc_info=True)
+        return SUMMARY_FALLBACK
+
+
+async def _request_summary(
+    cache_key, metrics, business_requirement, location_type, instructions
+) -> str:
+    """Ask OpenAI for a zone summary and cache it."""
+    # Compose a prompt for the LLM
+    prompt = SUMMARY_PROMPT.format(
+        business_requirement=business_requirement,
+        location_type=location_type,
+        metrics=metrics,
+        instructions=instructions,
+    )
+    response = await create_chat_completion(
+        "summary",
+        model=SUMMARY_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=200,
+        temperature=0.2,
+    )
+    summary = response.choices[0].message.content.strip()
+    await summary_cache.aset(cache_key, summary)
+    return summary
+
+
+async def stream_llm_summary(
+    metrics, business_requirement, location_type, instructions
+) -> AsyncIterator[Tuple[str, bool]]:
+    """
+    Stream a zone summary as (text delta, cached) pairs while it is generated.
+
+    A cached summary is replayed as a single delta. A completed stream is
+    cached like generate_llm_summary's result; if the call fails before any
+    text arrives, the fallback text is sent instead.
+    """
+    cache_key = summary_cache_key(
+        metrics, business_requirement, location_type, instructions
+    )
+    cached = await summary_cache.aget(cache_key)
+    if cached is not None:
+        yield cached, True
+        return
+
+    prompt = SUMMARY_PROMPT.format(
+        business_requirement=business_requirement,
+        location_type=location_type,
+        metrics=metrics,
+        instructions=instructions,
+    )
+    parts: List[str] = []
+    try:
+        async for delta in stream_chat_completion(
+            "summary",
+            model=SUMMARY_MODEL,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=200,
             temperature=0.2,
-        )
-        summary = response.choices[0].message.content.strip()
-        return summary
+        ):
+            # Strip leading whitespace like the non-streaming summary does
+            if not parts:
+                delta = delta.lstrip()
+                if not delta:
+                    continue
+            parts.append(delta)
+            yield delta, False
     except Exception as e:
-        logger.error(f"Failed to generate LLM summary: {e}", exc_info=True)
-        return "This area has promising metrics for your business. (LLM summary unavailable)"
+        if isinstance(e, LLMUnavailableError):
+            logger.warning(f"LLM summary stream unavailable: {e}")
+        else:
+            logger.error(f"Failed to stream LLM summary: {e}", exc_info=True)
+        if not parts:
+            yield SUMMARY_FALLBACK, False
+        return
+
+    summary = "".join(parts).strip()
+    if summary:
+        await summary_cache.aset(cache_key, summary)
+
+
+BATCH_SUMMARY_PROMPT = (
+    "You are a business location advisor for Tampere.\n"
+    "The user is interested in: {business_requirement}\n"
+    "Here are the metrics of the zones the user is comparing (as JSON, keyed by zone id):\n"
+    "{zones}\n"
+    "Instructions: {instructions}\n"
+    "For each zone create a concise, helpful summary for the user, then give a short "
+    "verdict comparing the zones and naming the best fit.\n"
+    'Respond in JSON: {{"summaries": {{"<zone id>": "<summary>", ...}}, "verdict": "<verdict>"}}.'
+)
+BATCH_VERDICT_FALLBACK = (
+    "Compare the zone summaries above to choose the best fit. (LLM verdict unavailable)"
+)
+
+
+async def generate_llm_summaries_batch(
+    zones: List[dict], business_requirement, instructions
+) -> dict:
+    """
+    Summarize several zones and compare them with one structured-JSON LLM call.
+
+    zones are dicts with id, metrics and location_type. Batch summaries are
+    written in the context of the other zones, so they are cached per zone
+    set, apart from /llm-summary's single-zone summaries. Zones the batch
+    answer misses (or all of them, if the call fails) are summarized with
+    bounded concurrent single-zone calls, which do share /llm-summary's cache. Everything shares one SUMMARY_BATCH_DEADLINE_SECONDS
+    budget; zones not summarized by then get the fallback text. Returns
+    {"summaries": {zone id: summary}, "verdict": str}.
+    """
+    zones = list({zone["id"]: zone for zone in zones}.values())
+    zone_keys = {
+        zone["id"]: summary_cache_key(
+            zone.get("metrics", {}),
+            business_requirement,
+            zone.get("location_type"),
+            instructions,
+        )
+        for zone in zones
+    }
+    # Batch summaries and the verdict depend on the whole set of zones
+    zone_set = ",".join(sorted(zone_keys.values()))
+    keys = {
+        zone_id: hashlib.sha256(f"batch:{zone_set}:{key}".encode()).hexdigest()
+        for zone_id, key in zone_keys.items()
+    }
+    verdict_key = hashlib.sha256(f"verdict:{zone_set}".encode()).hexdigest()
+    *cached_summaries, verdict = await asyncio.gather(
+        *(summary_cache.aget(key) for key in keys.values()),
+        summary_cache.aget(verdict_key),
+    )
+    summaries = {
+        zone_id: cached
+        for zone_id, cached in zip(keys, cached_summaries)
+        if cached is not None
+    }
+
+    async def fill() -> None:
+        """Ask the LLM for what isn't cached, filling summaries and verdict in place."""
+        nonlocal verdict
+        if verdict is None or len(summaries) < len(zones):
+            try:
+                answer = await llm_flight.do(
+                    ("batch", verdict_key),
+                    _request_batch_summary,
+                    zones,
+                    keys,
+                    verdict_key,
+                    business_requirement,
+                    instructions,
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate batch LLM summary: {e}", exc_info=True)
+                answer = {"summaries": {}, "verdict": None}
+            for zone_id, summary in answer["summaries"].items():
+                summaries.setdefault(zone_id, summary)
+            verdict = answer["verdict"] or verdict
+
+        missing = [zone for zone in zones if zone["id"] not in summaries]
+        if missing:
+            logger.info(f"Batch summary missed {len(missing)} zones, summarizing them one by one")
+            semaphore = asyncio.Semaphore(config.SUMMARY_BATCH_CONCURRENCY)
+
+            async def summarize(zone):
+                async with semaphore:
+                    summaries[zone["id"]] = await generate_llm_summary(
+                        metrics=zone.get("metrics", {}),
+                        business_requirement=business_requirement,
+                        location_type=zone.get("location_type"),
+                        instructions=instructions,
+                    )
+
+            await asyncio.gather(*(summarize(zone) for zone in missing))
+
+    # One budget for the batch call and the single-zone fallback together
+    try:
+        await asyncio.wait_for(fill(), config.SUMMARY_BATCH_DEADLINE_SECONDS)
+    except asyncio.TimeoutError:
+        # Calls still in flight finish in the background and fill the cache
+        logger.warning(
+            f"Batch summary exceeded {config.SUMMARY_BATCH_DEADLINE_SECONDS}s deadline, "
+            f"{len(zones) - len(summaries)} of {len(zones)} zones use the fallback text"
+        )
+
+    return {
+        "summaries": {
+            zone["id"]: summaries.get(zone["id"], SUMMARY_FALLBACK) for zone in zones
+        },
+        "verdict": verdict or BATCH_VERDICT_FALLBACK,
+    }
+
+
+async def _request_batch_summary(
+    zones: List[dict], keys: Dict[str, str], verdict_key: str, business_requirement, instructions
+) -> dict:
+    """
+    Ask OpenAI for per-zone summaries and a verdict in one JSON answer, and cache them.
+
+    keys maps zone ids to their batch summary cache keys. Returns the usable part of
+    the answer as {"summaries": {zone id: summary}, "verdict": str or None}.
+    """
+    prompt = BATCH_SUMMARY_PROMPT.format(
+        business_requirement=business_requirement,
+        zones=json.dumps(
+            {
+                zone["id"]: {
+                    "location_type": zone.get("location_type"),
+                    "metrics": zone.get("metrics", {}),
+                }
+                for zone in zones
+            },
+            default=str,
+        ),
+        instructions=instructions,
+    )
+    response = await create_chat_completion(
+        "summary_batch",
+        model=SUMMARY_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"},
+        max_tokens=150 * len(zones) + 150,
+        temperature=0.2,
+    )
+    parsed = json.loads(response.choices[0].message.content)
+    if not isinstance(parsed, dict):
+        parsed = {}
+
+    # Cached here rather than by the caller, so an answer that arrives after
+    # the caller's deadline is still kept
+    summaries = {}
+    for zone_id, summary in (parsed.get("summaries") or {}).items():
+        if zone_id in keys and isinstance(summary, str) and summary.strip():
+            summaries[zone_id] = summary.strip()
+            await summary_cache.aset(keys[zone_id], summaries[zone_id])
+    verdict = parsed.get("verdict")
+    if isinstance(verdict, str) and verdict.strip():
+        verdict = verdict.strip()
+        await summary_cache.aset(verdict_key, verdict)
+    else:
+        verdict = None
+    return {"summaries": summaries, "verdict": verdict}
@@ -0,0 +1,65 @@
+"""
+Cache module for Tampere Explorer Hub.
+This module provides the dict-like caches used by database.py, instrumented
+with hit/miss/eviction counters.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from app.metrics import CACHE_EVICTIONS, CACHE_REQUESTS
+
+
+class InstrumentedCache(OrderedDict):
+    """
+    Dictionary cache that counts hits and misses, optionally bounded.
+
+    Lookups follow the existing `if key in cache: return cache[key]` pattern,
+    so membership tests and get() are what count as hits or misses. With
+    max_entries set, the least recently used entry is evicted when full.
+    """
+
+    def __init__(self, name: str, max_entries: int = 0):
+        super().__init__()
+        self.name = name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Resolve the labelled children once instead of on every lookup
+        self._hits = CACHE_REQUESTS.labels(cache=name, result="hit")
+        self._misses = CACHE_REQUESTS.labels(cache=name, result="miss")
+        self._evictions = CACHE_EVICTIONS.labels(cache=name)
+
+    def __contains__(self, key: Any) -> bool:
+        found = super().__contains__(key)
+        (self._hits if found else self._misses).inc()
+        return found
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        if self.max_entries:
+            try:
+                self.move_to_end(key)
+            except KeyError:  # Evicted by another thread in the meantime
+                pass
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:  # Missing, or evicted by another thread since the check
+            self._misses.inc()
+            return default
+        self._hits.inc()
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            if self.max_entries:
+                while len(self) > self.max_entries:
+                    self.popitem(last=False)
+                    self._evictions.inc()
+
+    def __repr__(self) -> str:
+        return f"InstrumentedCache({self.name!r}, entries={len(self)})"
@@ -0,0 +1,129 @@
+"""
+Runtime configuration for Tampere Explorer Hub.
+Settings are read from environment variables (a .env file is loaded if present).
+"""
+
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable (1/true/yes/on), falling back to default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Root log level (DEBUG, INFO, WARNING, ...)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+# Log line format: "text" or "json" (one JSON object per line)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip().lower()
+# Write logs from a background thread instead of the logging call site
+LOG_QUEUE = _env_bool("LOG_QUEUE", True)
+# Keep one in N per-item debug lines (per map item, per event, ...); 1 keeps all
+LOG_SAMPLE_EVERY = _env_int("LOG_SAMPLE_EVERY", 100)
+
+# Executor used for CPU-bound request work: "thread" or "process"
+EXECUTOR_KIND = os.getenv("EXECUTOR_KIND", "thread").strip().lower()
+# Number of worker threads/processes in the pool
+EXECUTOR_MAX_WORKERS = _env_int("EXECUTOR_MAX_WORKERS", min(8, os.cpu_count() or 1))
+# Number of jobs allowed to run in the pool at the same time
+EXECUTOR_MAX_CONCURRENCY = _env_int("EXECUTOR_MAX_CONCURRENCY", EXECUTOR_MAX_WORKERS)
+# Number of jobs allowed to wait for a slot before requests are rejected (0 = unbounded)
+EXECUTOR_MAX_QUEUE = _env_int("EXECUTOR_MAX_QUEUE", 64)
+# Threads that produce the chunks of streaming responses
+STREAM_MAX_WORKERS = _env_int("STREAM_MAX_WORKERS", min(4, os.cpu_count() or 1))
+# Streaming responses open at once before new ones are rejected (0 = unbounded)
+STREAM_MAX_OPEN = _env_int("STREAM_MAX_OPEN", 32)
+
+# Where the road traffic pipeline runs: "inline" (in the request worker) or "process"
+ROAD_EXECUTOR_KIND = os.getenv("ROAD_EXECUTOR_KIND", "inline").strip().lower()
+# Number of road pipeline worker processes when ROAD_EXECUTOR_KIND is "process"
+ROAD_PROCESS_WORKERS = _env_int("ROAD_PROCESS_WORKERS", os.cpu_count() or 1)
+# Seconds to wait for the Overpass API when the road data isn't cached
+OVERPASS_TIMEOUT_SECONDS = _env_float("OVERPASS_TIMEOUT_SECONDS", 30.0)
+# Seconds before loading the road network is retried after a failure (mock roads meanwhile)
+ROAD_NETWORK_RETRY_SECONDS = _env_float("ROAD_NETWORK_RETRY_SECONDS", 60.0)
+
+# Grid cell size (meters) of the road vertex index used to place map items
+MAP_ITEMS_GRID_CELL_METERS = _env_float("MAP_ITEMS_GRID_CELL_METERS", 100.0)
+# Decimals map item centers are rounded to before caching (4 is about 11 m)
+MAP_ITEMS_CENTER_DECIMALS = _env_int("MAP_ITEMS_CENTER_DECIMALS", 4)
+# Bound for the map items cache (0 = unbounded)
+MAP_ITEMS_CACHE_MAX_ENTRIES = _env_int("MAP_ITEMS_CACHE_MAX_ENTRIES", 4096)
+
+# Send per-stage request timings in a Server-Timing header (and log them)
+SERVER_TIMING = _env_bool("SERVER_TIMING", False)
+
+# Serve Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR with several workers)
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+# Bounds for the location snapshot and foot traffic caches (0 = unbounded)
+LOCATION_CACHE_MAX_ENTRIES = _env_int("LOCATION_CACHE_MAX_ENTRIES", 2048)
+FOOT_TRAFFIC_CACHE_MAX_ENTRIES = _env_int("FOOT_TRAFFIC_CACHE_MAX_ENTRIES", 100_000)
+
+# OpenAI-compatible API to call instead of api.openai.com (e.g. benchmarks/openai_stub.py)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "").strip() or None
+# Seconds to wait for an OpenAI response, and for the connection to be set up
+OPENAI_TIMEOUT_SECONDS = _env_float("OPENAI_TIMEOUT_SECONDS", 20.0)
+OPENAI_CONNECT_TIMEOUT_SECONDS = _env_float("OPENAI_CONNECT_TIMEOUT_SECONDS", 5.0)
+# Retries made by the OpenAI SDK on connection errors and 429/5xx responses
+OPENAI_MAX_RETRIES = _env_int("OPENAI_MAX_RETRIES", 1)
+# OpenAI calls allowed in flight at once; the rest wait for a slot
+OPENAI_MAX_CONCURRENCY = _env_int("OPENAI_MAX_CONCURRENCY", 16)
+# Pooled (keep-alive) connections to the OpenAI API
+OPENAI_MAX_CONNECTIONS = _env_int("OPENAI_MAX_CONNECTIONS", 32)
+
+# Answer business requirement classification locally when confident enough
+LOCAL_CLASSIFIER_ENABLED = _env_bool("LOCAL_CLASSIFIER_ENABLED", True)
+# Local classifier confidence (0-1) needed to skip the LLM
+LOCAL_CLASSIFIER_THRESHOLD = _env_float("LOCAL_CLASSIFIER_THRESHOLD", 0.8)
+
+# Overall deadline for one LLM call, including retries, queueing and hedging
+LLM_DEADLINE_SECONDS = _env_float("LLM_DEADLINE_SECONDS", 10.0)
+# Send a second, hedged request when a call runs longer than the recent p95
+LLM_HEDGING = _env_bool("LLM_HEDGING", False)
+# Successful calls observed before the p95 is trusted for hedging
+LLM_HEDGE_MIN_SAMPLES = _env_int("LLM_HEDGE_MIN_SAMPLES", 20)
+# Consecutive LLM failures that open the circuit breaker, and how long it stays open
+LLM_BREAKER_FAILURES = _env_int("LLM_BREAKER_FAILURES", 5)
+LLM_BREAKER_RESET_SECONDS = _env_float("LLM_BREAKER_RESET_SECONDS", 30.0)
+
+# SQLite file for cached LLM results (empty = in-memory only)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3").strip()
+# Seconds before a cached LLM result is refreshed (0 = never expires)
+LLM_CACHE_TTL_SECONDS = _env_int("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+# In-memory entries kept per LLM cache
+LLM_CACHE_MAX_ENTRIES = _env_int("LLM_CACHE_MAX_ENTRIES", 1024)
+
+# Zone summary cache: lifetime, in-memory size and whether to keep it in LLM_CACHE_PATH
+SUMMARY_CACHE_TTL_SECONDS = _env_int("SUMMARY_CACHE_TTL_SECONDS", 6 * 3600)
+SUMMARY_CACHE_MAX_ENTRIES = _env_int("SUMMARY_CACHE_MAX_ENTRIES", 2048)
+SUMMARY_CACHE_PERSIST = _env_bool("SUMMARY_CACHE_PERSIST", True)
+
+# Single-zone LLM calls run at once when a batch summary falls back to them
+SUMMARY_BATCH_CONCURRENCY = _env_int("SUMMARY_BATCH_CONCURRENCY", 4)
+# Overall deadline for a batch summary, including the single-zone fallback
+SUMMARY_BATCH_DEADLINE_SECONDS = _env_float("SUMMARY_BATCH_DEADLINE_SECONDS", 15.0)
+
+# Encode large trusted responses with orjson and skip response-model validation
+FAST_JSON_RESPONSES = _env_bool("FAST_JSON_RESPONSES", False)
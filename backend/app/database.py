@@ -1,8 +1,11 @@
 import os
 import json
-import random
+import logging
 import math
 import string
+import threading
+import zlib
+from random import Random
 from app.models import (
     TrafficLevel,
     WeatherType,
@@ -19,23 +22,93 @@ from app.models import (
     FootTrafficData,
     HotspotType,
     Location,
+    LocationsTimelineResponse,
+    TimelineHour,
+    TimelineLocation,
+    TimelineRankingEntry,
+    TimelineRoads,
 )
-from typing import List, Dict, Callable, Optional, Tuple, Union
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from app.fetch_tampere_roads import fetch_tampere_roads, process_road_data
+from app import config
+from app.fetch_tampere_roads import (
+    RoadNetwork,
+    STATUS_BY_CODE,
+    TrafficPointStream,
+    TrafficSources,
+    TrafficSourcesLike,
+    classify_road_statuses,
+    generate_traffic_points,
+    load_road_network,
+    traffic_data_from_statuses,
+    traffic_points_from_arrays,
+)
+from app.road_pool import get_road_pool
+from app.timing import stage, timed
+from app.cache import InstrumentedCache
+from app.singleflight import ThreadSingleFlight
+from app.spatial_index import RoadVertexIndex
+from app.foot_traffic import (
+    generate_foot_traffic_matrix,
+    tag_foot_traffic,
+    format_foot_traffic,
+)
 import requests
 from math import sin, cos, sqrt, atan2, radians
 import time
 
 # Tampere center coordinates
+logger = logging.getLogger(__name__)
+
 TAMPERE_CENTER = (23.7610, 61.4978)
 
-# Global cache for foot traffic distributions by date/location
-foot_traffic_cache = {}
-# Caches for API responses
-events_cache = {}
-date_events_cache = {}
-location_cache = {}
+# Global cache for hourly foot traffic values by date/location and by event.
+# Curves don't depend on the selected hour; past/current/predicted labels are
+# applied per response with tag_foot_traffic.
+foot_traffic_cache = InstrumentedCache(
+    "foot_traffic", max_entries=config.FOOT_TRAFFIC_CACHE_MAX_ENTRIES
+)
+# Caches for API responses. events_cache is the only store of generated
+# events (get_event_by_id looks them up there), so it is never evicted.
+events_cache = InstrumentedCache("events")
+date_events_cache = InstrumentedCache("date_events")
+location_cache = InstrumentedCache(
+    "locations", max_entries=config.LOCATION_CACHE_MAX_ENTRIES
+)
+# Cache for static mock data files, loaded once per process
+mock_data_cache = InstrumentedCache("mock_data")
+
+# Coalesces concurrent road pipeline runs for the same hotspots
+road_flight = ThreadSingleFlight("roads")
+# Mock roads used while the real road network can't be loaded
+_mock_road_network: Optional[RoadNetwork] = None
+
+# Grid index of road vertices used to place map items (built once per network)
+_road_vertex_index: Optional[RoadVertexIndex] = None
+_road_vertex_index_lock = threading.Lock()
+# Placed map items per (rounded center, radius, types)
+map_items_cache = InstrumentedCache(
+    "map_items", max_entries=config.MAP_ITEMS_CACHE_MAX_ENTRIES
+)
+
+
+class _ThreadRandom(threading.local):
+    """A random.Random per thread, used like the random module.
+
+    Mock data generation reseeds the generator to get repeatable values. With
+    one generator per worker thread, concurrent requests can't disturb each
+    other's sequences, so the generators need no lock.
+    """
+
+    def __init__(self):
+        self.generator = Random()
+
+    def __getattr__(self, name):
+        return getattr(self.generator, name)
+
+
+_rng = _ThreadRandom()
+
 
 # Fixed hotspot locations and characteristics
 HOTSPOT_TEMPLATES = [
@@ -114,20 +187,107 @@ TAMPERE_ROADS_CACHE = os.path.join(os.path.dirname(__file__), "tampere_roads.jso
 
 
 # Traffic data
-def get_traffic_data(hotspots: Optional[List[Hotspot]] = None) -> TrafficData:
-    """Get traffic data for Tampere streets."""
+@timed("roads")
+def get_traffic_data(hotspots: Optional[TrafficSourcesLike] = None) -> TrafficData:
+    """Get traffic data for Tampere streets.
+
+    hotspots may be TrafficSources (see get_traffic_sources) or, for older
+    callers, a list of Hotspot models.
+    """
     try:
-        # Always fetch road data (will use cache if available)
-        osm_data = fetch_tampere_roads()
+        # Road geometry is parsed once per process; only statuses are per call
+        network = load_road_network()
+        if len(network) > 0:
+            status_codes = classify_road_statuses(network, hotspots)
+            return traffic_data_from_statuses(network, status_codes)
+    except Exception as e:
+        logger.error(f"Error generating traffic data: {e}")
+    # Fall back to the mock data if everything else fails
+    return get_mock_traffic_data()
+
 
-        # Process with current hotspots to get real-time traffic data
-        traffic_data = process_road_data(osm_data, hotspots)
-        return traffic_data
+def get_road_network() -> RoadNetwork:
+    """Get the road network, or the mock roads if it can't be loaded.
 
+    Like get_traffic_data, this never fails because the Overpass API is down.
+    """
+    global _mock_road_network
+    network = load_road_network()
+    if len(network) > 0:
+        return network
+    if _mock_road_network is None:
+        _mock_road_network = RoadNetwork.from_traffic_data(get_mock_traffic_data())
+    return _mock_road_network
+
+
+def _run_road_pool(hotspots: Optional[TrafficSourcesLike]):
+    """Run the road pipeline in the road process pool.
+
+    Returns (network, RoadPipelineResult), or None if the pool can't be used
+    and the caller should run the pipeline inline.
+    """
+    if config.ROAD_EXECUTOR_KIND != "process":
+        return None
+    try:
+        network = load_road_network()
+        if len(network) > 0:
+            with stage("roads.pool"):
+                result = get_road_pool(network).run(TrafficSources.coerce(hotspots))
+            return network, result
     except Exception as e:
-        print(f"Error generating traffic data: {e}")
-        # Fall back to the mock data if everything else fails
-        return get_mock_traffic_data()
+        logger.error(f"Error generating traffic data in road pool: {e}")
+    return None
+
+
+def get_traffic_snapshot(
+    hotspots: Optional[TrafficSourcesLike] = None,
+) -> Tuple[TrafficData, Dict]:
+    """Get traffic data and traffic points for Tampere streets.
+
+    With ROAD_EXECUTOR_KIND=process the road pipeline runs in the road process
+    pool, otherwise it runs inline in the calling thread. Concurrent calls for
+    the same hotspots share one run.
+    """
+    hotspots = TrafficSources.coerce(hotspots)
+    return road_flight.do(hotspots.key(), _compute_traffic_snapshot, hotspots)
+
+
+def _compute_traffic_snapshot(
+    hotspots: TrafficSources,
+) -> Tuple[TrafficData, Dict]:
+    """Run the road pipeline for get_traffic_snapshot."""
+    pooled = _run_road_pool(hotspots)
+    if pooled is not None:
+        network, result = pooled
+        traffic_data = traffic_data_from_statuses(network, result.status_codes)
+        traffic_points = traffic_points_from_arrays(
+            result.point_coords, result.point_codes
+        )
+        return traffic_data, traffic_points
+
+    traffic_data = get_traffic_data(hotspots)
+    return traffic_data, generate_traffic_points(traffic_data)
+
+
+def get_traffic_stream(
+    hotspots: Optional[TrafficSourcesLike] = None,
+) -> Tuple[TrafficData, TrafficPointStream]:
+    """Get traffic data and its lazily placed traffic point features.
+
+    Road statuses are computed up front; inline, points are only placed as
+    the stream is iterated (e.g. by a streaming response). Both results can
+    be pickled, so this can run in a process executor.
+    """
+    pooled = _run_road_pool(hotspots)
+    if pooled is not None:
+        network, result = pooled
+        traffic_data = traffic_data_from_statuses(network, result.status_codes)
+        return traffic_data, TrafficPointStream(
+            point_coords=result.point_coords, point_codes=result.point_codes
+        )
+
+    traffic_data = get_traffic_data(hotspots)
+    return traffic_data, TrafficPointStream(traffic_data)
 
 
 def get_mock_traffic_data() -> TrafficData:
@@ -292,7 +452,7 @@ def get_all_hotspots(
             label="",  # Will be assigned after sorting
             address=template["address"],
             trafficLevel=traffic_level,
-            weather=random.choice(list(WeatherType)),  # Random weather for now
+            weather=_rng.choice(list(WeatherType)),  # Random weather for now
             coordinates=template["coordinates"],
             population=template["population"],
             areaType=template["areaType"],
@@ -363,7 +523,7 @@ def get_all_events() -> List[Event]:
     for i in range(90):  # next 90 days
         future_date = current_date + timedelta(days=i)
         # Only include about 1/3 of all possible dates (to make it more realistic)
-        if random.random() < 0.33:
+        if _rng.random() < 0.33:
             future_dates.append(future_date)
 
     # Generate events for past dates
@@ -394,7 +554,7 @@ def generate_mock_events_for_date(date_str: str) -> List[Event]:
 
     # Generate a seed based on the date to ensure consistent events for the same date
     seed = sum(ord(c) for c in date_str)
-    random.seed(seed)
+    _rng.seed(seed)
 
     # These are our fixed events
     fixed_events = [
@@ -550,7 +710,7 @@ def get_event_by_id(event_id: str) -> Event:
                         events_cache[event_id] = event
                         return event
         except Exception as e:
-            print(f"Error parsing event ID: {e}")
+            logger.warning(f"Error parsing event ID: {e}")
 
     # If parsing the date failed or the event wasn't found,
     # get all events and search through them
@@ -564,17 +724,49 @@ def get_event_by_id(event_id: str) -> Event:
     return None
 
 
+def get_road_vertex_index() -> RoadVertexIndex:
+    """Get the vertex index of the road network, building it on first use.
+
+    While the roads can't be loaded the index covers the mock roads; it is
+    rebuilt once the real network loads.
+    """
+    global _road_vertex_index
+    network = get_road_network()
+    with _road_vertex_index_lock:
+        if _road_vertex_index is None or _road_vertex_index.network is not network:
+            with stage("map_items.index"):
+                _road_vertex_index = RoadVertexIndex(
+                    network, config.MAP_ITEMS_GRID_CELL_METERS
+                )
+            # Items placed on the previous network's roads are stale
+            map_items_cache.clear()
+            logger.info(
+                f"Built road vertex index: {len(network)} roads, "
+                f"{len(_road_vertex_index.xs)} vertices"
+            )
+        return _road_vertex_index
+
+
 def get_map_items(
     lat: float, lng: float, radius: float, types: Optional[List[str]] = None
 ) -> List[MapItem]:
     """Get map items within a specific area - places them near actual streets."""
-    # Convert radius from meters to degrees
-    # At Tampere's latitude (~61.5°N), longitude degrees are shorter
-    radius_deg_lat = radius / 111000  # 1 degree latitude is ~111km
-    radius_deg_lng = radius / (
-        111000 * math.cos(math.radians(lat))
-    )  # Adjust for longitude at this latitude
+    return get_map_items_batch([(lat, lng)], radius, types)[0]
 
+
+@timed("map_items")
+def get_map_items_batch(
+    centers: List[Tuple[float, float]],
+    radius: float,
+    types: Optional[List[str]] = None,
+) -> List[List[MapItem]]:
+    """Get map items around several (lat, lng) centers, e.g. every visible hotspot.
+
+    Centers are rounded to MAP_ITEMS_CENTER_DECIMALS and the items are cached
+    per (center, radius, types). Placement is seeded by that key, so a center
+    gets the same items on every request and in every worker. Centers missing
+    from the cache are looked up in one pass over the road vertex index.
+    """
     # Define the item types we want to generate
     required_types = [
         MapItemType.BUS,
@@ -588,6 +780,53 @@ def get_map_items(
     if types:
         required_types = [t for t in required_types if t.value in types]
 
+    type_values = tuple(t.value for t in required_types)
+    radius = float(round(radius))
+    keys = [
+        (
+            round(lat, config.MAP_ITEMS_CENTER_DECIMALS),
+            round(lng, config.MAP_ITEMS_CENTER_DECIMALS),
+            radius,
+            type_values,
+        )
+        for lat, lng in centers
+    ]
+    # Fetched first: switching road networks clears the cached items
+    index = get_road_vertex_index()
+    found = {key: map_items_cache.get(key) for key in keys}
+    missing = [key for key, items in found.items() if items is None]
+
+    if missing:
+        # Use a smaller search radius to ensure icons are closer to hotspot/center
+        search_radius = min(radius * 0.6, 300)  # Max 300m or 60% of original radius
+        with stage("map_items.search"):
+            nearby = index.ways_within_many(
+                [(key[0], key[1]) for key in missing], search_radius
+            )
+        for key, nearby_ways in zip(missing, nearby):
+            _rng.seed(f"map_items:{key}")
+            items = _place_map_items(
+                index, key[0], key[1], radius, required_types, nearby_ways
+            )
+            map_items_cache[key] = items
+            found[key] = items
+
+    return [found[key] for key in keys]
+
+
+def _place_map_items(
+    index: RoadVertexIndex,
+    lat: float,
+    lng: float,
+    radius: float,
+    required_types: List[MapItemType],
+    nearby_ways: List[int],
+) -> List[MapItem]:
+    """Place two items of each type on the roads near a center.
+
+    nearby_ways are the roads with a vertex within the search radius (see
+    get_map_items_batch); the search widens up to radius when there are none.
+    """
     # Prepare result list
     items: List[MapItem] = []
 
@@ -600,71 +839,30 @@ def get_map_items(
         MapItemType.AVAILABLE: "Available Location",
     }
 
-    # Get road data
-    traffic_data = get_traffic_data()
-
-    # Extract road segments
-    road_segments = []
-    for feature in traffic_data.features:
-        if feature.geometry and feature.geometry.coordinates:
-            road_segments.append(feature.geometry.coordinates)
+    network = index.network
 
     # If no road data is available, fall back to the original random method
-    if not road_segments:
-        print("No road data available, falling back to random placement")
+    if len(index) == 0:
+        logger.info("No road data available, falling back to random placement")
         return _get_random_map_items(lat, lng, radius, required_types, type_labels)
 
-    # Find road segments within radius
-    # Use a smaller search radius to ensure icons are closer to hotspot/center
-    search_radius = min(radius * 0.6, 300)  # Max 300m or 60% of original radius
-    nearby_segments = []
-
-    for segment in road_segments:
-        for point in segment:
-            point_lng, point_lat = point
-            distance = haversine_distance(lat, lng, point_lat, point_lng)
-            if distance <= search_radius:
-                nearby_segments.append(segment)
-                break
-
-    # If no nearby segments, gradually expand search until we find at least one
-    if not nearby_segments:
-        # Try with larger radius up to original
-        expanded_radius = search_radius
-        while expanded_radius < radius and not nearby_segments:
-            expanded_radius = min(expanded_radius * 1.5, radius)
-            print(f"Expanding search to {expanded_radius}m")
-
-            for segment in road_segments:
-                for point in segment:
-                    point_lng, point_lat = point
-                    distance = haversine_distance(lat, lng, point_lat, point_lng)
-                    if distance <= expanded_radius:
-                        nearby_segments.append(segment)
-                        break
-                if nearby_segments:
-                    break
-
-        # If still no segments, use closest one(s)
-        if not nearby_segments:
-            # Find the closest segments
-            segments_with_distances = []
+    search_radius = min(radius * 0.6, 300)
+    with stage("map_items.search"):
+        # If no nearby segments, gradually expand search until we find at least one
+        if not nearby_ways:
+            # Try with larger radius up to original
+            expanded_radius = search_radius
+            while expanded_radius < radius and not nearby_ways:
+                expanded_radius = min(expanded_radius * 1.5, radius)
+                logger.debug("Expanding search to %sm", expanded_radius)
+                # Keep only the first segment found, as the full scan did
+                nearby_ways = index.ways_within(lat, lng, expanded_radius)[:1]
 
-            for segment in road_segments:
-                # Find minimum distance from any point in segment to center
-                min_segment_distance = float("inf")
-                for point in segment:
-                    point_lng, point_lat = point
-                    distance = haversine_distance(lat, lng, point_lat, point_lng)
-                    min_segment_distance = min(min_segment_distance, distance)
+            # If still no segments, use the 2-3 closest ones
+            if not nearby_ways:
+                nearby_ways = index.nearest_ways(lat, lng, 3)
 
-                segments_with_distances.append((segment, min_segment_distance))
-
-            # Sort segments by distance
-            segments_with_distances.sort(key=lambda x: x[1])
-
-            # Take 2-3 closest segments
-            nearby_segments = [s[0] for s in segments_with_distances[:3]]
+    nearby_segments = [network.way_coordinates(way) for way in nearby_ways]
 
     # Generate items for each type
     for item_type in required_types:
@@ -672,10 +870,10 @@ def get_map_items(
             # Choose a segment prioritizing closer ones
             if i == 0 and len(nearby_segments) > 1:
                 # For first item, use segments very close to center
-                segment_idx = random.randint(0, min(1, len(nearby_segments) - 1))
-                segment = nearby_segments[segment_idx]
+                segment_idx = _rng.randint(0, min(1, len(nearby_segments) - 1))
             else:
-                segment = random.choice(nearby_segments)
+                segment_idx = _rng.randrange(len(nearby_segments))
+            segment = nearby_segments[segment_idx]
 
             # Choose a point along the segment
             if len(segment) < 2:
@@ -683,25 +881,19 @@ def get_map_items(
                 base_point = segment[0]
                 # Very small random offset (closer to the point)
                 offset_factor = (
-                    0.00005 * random.random()
+                    0.00005 * _rng.random()
                 )  # About 5m at Tampere's latitude
-                point_lng = base_point[0] + random.uniform(
+                point_lng = base_point[0] + _rng.uniform(
                     -offset_factor, offset_factor
                 )
-                point_lat = base_point[1] + random.uniform(
+                point_lat = base_point[1] + _rng.uniform(
                     -offset_factor, offset_factor
                 )
             else:
                 # Choose point in segment closest to center
-                closest_idx = 0
-                closest_distance = float("inf")
-
-                for idx, point in enumerate(segment):
-                    point_lng, point_lat = point
-                    distance = haversine_distance(lat, lng, point_lat, point_lng)
-                    if distance < closest_distance:
-                        closest_distance = distance
-                        closest_idx = idx
+                closest_idx = index.closest_vertex(
+                    nearby_ways[segment_idx], lat, lng
+                )
 
                 # Use adjacent points to closest point
                 idx = max(0, min(closest_idx, len(segment) - 2))
@@ -711,7 +903,7 @@ def get_map_items(
                 # Interpolate with bias towards closest side
                 # This ensures we're picking a point along the segment that is
                 # relatively close to the center coordinates
-                t = random.random() * 0.6 + 0.2  # Random value between 0.2-0.8
+                t = _rng.random() * 0.6 + 0.2  # Random value between 0.2-0.8
                 point_lng = p1[0] + t * (p2[0] - p1[0])
                 point_lat = p1[1] + t * (p2[1] - p1[1])
 
@@ -727,14 +919,14 @@ def get_map_items(
                     perp_dx, perp_dy = -dy, dx
 
                     # Smaller offset (0.5-2 meters) to keep closer to the road
-                    offset_meters = random.uniform(0.5, 2)
+                    offset_meters = _rng.uniform(0.5, 2)
                     offset_deg_lat = offset_meters / 111000
                     offset_deg_lng = offset_meters / (
                         111000 * math.cos(math.radians(point_lat))
                     )
 
                     # Apply offset in the perpendicular direction
-                    side = 1 if random.random() > 0.5 else -1
+                    side = 1 if _rng.random() > 0.5 else -1
                     point_lng += side * perp_dx * offset_deg_lng
                     point_lat += side * perp_dy * offset_deg_lat
 
@@ -751,18 +943,20 @@ def get_map_items(
                     "Market",
                     "Bookstore",
                 ]
-                label = f"{random.choice(business_names)} {i + 1}"
+                label = f"{_rng.choice(business_names)} {i + 1}"
 
             # Create the item
             mock_item = MapItem(
                 type=item_type,
-                id=f"mock-{item_type}-{i}",
+                id=f"mock-{item_type.value}-{i}",
                 coordinates=(point_lng, point_lat),
                 label=label,
             )
 
             items.append(mock_item)
-            print(f"Added street-based mock item: {mock_item}")
+            logger.debug(
+                "Added street-based mock item: %s", mock_item, extra={"sample": "map_item"}
+            )
 
     return items
 
@@ -788,14 +982,14 @@ def _get_random_map_items(
     for item_type in required_types:
         for i in range(2):  # Generate exactly 2 of each type
             # Generate a random angle and distance within the radius
-            angle = random.uniform(0, 2 * math.pi)  # Random angle in radians
+            angle = _rng.uniform(0, 2 * math.pi)  # Random angle in radians
 
             # Reduced distance factors to keep items closer to center
             # First item much closer (10-20% of radius), second still fairly close (20-30%)
             if i == 0:
-                distance_factor = random.uniform(0.10, 0.20)
+                distance_factor = _rng.uniform(0.10, 0.20)
             else:
-                distance_factor = random.uniform(0.20, 0.30)
+                distance_factor = _rng.uniform(0.20, 0.30)
 
             # Calculate coordinates with proper scaling
             # Use different scales for latitude and longitude to maintain circular distribution
@@ -818,18 +1012,20 @@ def _get_random_map_items(
                     "Market",
                     "Bookstore",
                 ]
-                label = f"{random.choice(business_names)} {i + 1}"
+                label = f"{_rng.choice(business_names)} {i + 1}"
 
             # Create the item
             mock_item = MapItem(
                 type=item_type,
-                id=f"mock-{item_type}-{i}",
+                id=f"mock-{item_type.value}-{i}",
                 coordinates=(new_lng, new_lat),
                 label=label,
             )
 
             items.append(mock_item)
-            print(f"Added random mock item: {mock_item}")
+            logger.debug(
+                "Added random mock item: %s", mock_item, extra={"sample": "map_item"}
+            )
 
     return items
 
@@ -850,8 +1046,10 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
 
 def get_traffic_pattern_values(pattern: str, hour: int, date_seed: int) -> int:
     """Generate foot traffic values based on pattern and hour."""
-    random.seed(date_seed + hash(pattern))  # Use date seed for consistent randomness
-    base = random.randint(20, 40)  # Base traffic level
+    # Use date seed for consistent randomness; crc32 (unlike hash()) is the
+    # same in every process, so pool workers agree on the values
+    _rng.seed(date_seed + zlib.crc32(pattern.encode()))
+    base = _rng.randint(20, 40)  # Base traffic level
 
     if pattern == "commercial":
         if 9 <= hour <= 20:  # Shopping hours
@@ -877,7 +1075,7 @@ def get_traffic_pattern_values(pattern: str, hour: int, date_seed: int) -> int:
                 base *= 3
 
     # Add some randomness
-    variation = random.uniform(0.8, 1.2)
+    variation = _rng.uniform(0.8, 1.2)
     return int(base * variation)
 
 
@@ -919,14 +1117,15 @@ def get_event_foot_traffic(
     if target_hour is None:
         target_hour = datetime.now().hour
 
-    # Create a cache key that includes the hour
-    cache_key = f"event_{event_id}_{target_hour}"
-    if cache_key in foot_traffic_cache:
-        return foot_traffic_cache[cache_key]
+    # Event curves don't depend on the hour, only their labels do
+    cache_key = f"event_{event_id}"
+    cached = foot_traffic_cache.get(cache_key)
+    if cached is not None:
+        return tag_foot_traffic(cached, target_hour)
 
     # Generate a seed based on the event ID to ensure consistent data for the same event
     seed = sum(ord(c) for c in event_id)
-    random.seed(seed)
+    _rng.seed(seed)
 
     # Find the event to adjust traffic based on event details
     event = get_event_by_id(event_id)
@@ -953,10 +1152,10 @@ def get_event_foot_traffic(
         pass
 
     # Generate values for all hours with peak around event time
-    data = []
+    values = []
     for hour in range(0, 24):
         # Base traffic is low
-        base_value = random.randint(5, 20)
+        base_value = _rng.randint(5, 20)
 
         # Traffic ramps up before event, peaks during, and decreases after
         time_factor = 1.0
@@ -971,21 +1170,11 @@ def get_event_foot_traffic(
         elif hours_to_event <= 4:  # Up to 4 hours before/after
             time_factor = 1.5
 
-        value = int(base_value * time_factor)
+        values.append(int(base_value * time_factor))
 
-        # Set data type based on current hour
-        if hour < target_hour:
-            data_type = FootTrafficType.PAST
-        elif hour > target_hour:
-            data_type = FootTrafficType.PREDICTED
-        else:
-            data_type = FootTrafficType.CURRENT
-
-        data.append(FootTrafficData(hour=hour, value=value, type=data_type))
-
-    # Cache the data with the hour-specific key
-    foot_traffic_cache[cache_key] = data
-    return data
+    # Cache the curve once for all hours
+    foot_traffic_cache[cache_key] = values
+    return tag_foot_traffic(values, target_hour)
 
 
 def get_hotspot_detailed_metrics(hotspot_id: str) -> dict:
@@ -1000,38 +1189,38 @@ def get_hotspot_detailed_metrics(hotspot_id: str) -> dict:
 
     # Generate a seed based on the hotspot ID for consistent random data
     seed = sum(ord(c) for c in hotspot_id)
-    random.seed(seed)
+    _rng.seed(seed)
 
     # Generate additional detailed metrics that weren't in the original hotspot data
     location_data = {
         "nearbyBusinessTypesBreakdown": {
-            "retail": random.randint(3, 15),
-            "food": random.randint(2, 10),
-            "services": random.randint(4, 12),
-            "entertainment": random.randint(1, 8),
-            "other": random.randint(2, 6),
+            "retail": _rng.randint(3, 15),
+            "food": _rng.randint(2, 10),
+            "services": _rng.randint(4, 12),
+            "entertainment": _rng.randint(1, 8),
+            "other": _rng.randint(2, 6),
         },
         "demographicsBreakdown": {
-            "18-24": random.randint(10, 30),
-            "25-34": random.randint(20, 40),
-            "35-44": random.randint(15, 35),
-            "45+": random.randint(10, 25),
+            "18-24": _rng.randint(10, 30),
+            "25-34": _rng.randint(20, 40),
+            "35-44": _rng.randint(15, 35),
+            "45+": _rng.randint(10, 25),
         },
         "footTrafficByTimeOfDay": {
-            "morning": random.randint(30, 70),
-            "afternoon": random.randint(50, 100),
-            "evening": random.randint(40, 90),
-            "night": random.randint(10, 50),
+            "morning": _rng.randint(30, 70),
+            "afternoon": _rng.randint(50, 100),
+            "evening": _rng.randint(40, 90),
+            "night": _rng.randint(10, 50),
         },
-        "businessOpportunityScore": random.randint(60, 95),
+        "businessOpportunityScore": _rng.randint(60, 95),
         "weekdayVsWeekend": {
-            "weekday": random.randint(70, 100),
-            "weekend": random.randint(80, 120),
+            "weekday": _rng.randint(70, 100),
+            "weekend": _rng.randint(80, 120),
         },
-        "growthTrend": random.choice(["increasing", "stable", "decreasing"]),
-        "seasonalityImpact": random.choice(["high", "medium", "low"]),
-        "competitionDensity": random.choice(["high", "medium", "low"]),
-        "averageVisitDuration": f"{random.randint(30, 120)} min",
+        "growthTrend": _rng.choice(["increasing", "stable", "decreasing"]),
+        "seasonalityImpact": _rng.choice(["high", "medium", "low"]),
+        "competitionDensity": _rng.choice(["high", "medium", "low"]),
+        "averageVisitDuration": f"{_rng.randint(30, 120)} min",
     }
 
     # Return combined data
@@ -1066,37 +1255,37 @@ def get_event_detailed_metrics(event_id: str) -> dict:
 
     # Generate a seed based on the event ID for consistent random data
     seed = sum(ord(c) for c in event_id)
-    random.seed(seed)
+    _rng.seed(seed)
 
     # Generate additional detailed metrics that weren't in the original event data
     event_data = {
         "eventTypeBreakdown": {
-            "music": random.randint(10, 80)
+            "music": _rng.randint(10, 80)
             if event.type == "Concert"
-            else random.randint(0, 20),
-            "sports": random.randint(10, 80)
+            else _rng.randint(0, 20),
+            "sports": _rng.randint(10, 80)
             if event.type == "Sports"
-            else random.randint(0, 20),
-            "cultural": random.randint(10, 80)
+            else _rng.randint(0, 20),
+            "cultural": _rng.randint(10, 80)
             if event.type == "Cultural"
-            else random.randint(0, 20),
-            "food": random.randint(10, 80)
+            else _rng.randint(0, 20),
+            "food": _rng.randint(10, 80)
             if event.type == "Food Festival"
-            else random.randint(0, 20),
-            "other": random.randint(5, 20),
+            else _rng.randint(0, 20),
+            "other": _rng.randint(5, 20),
         },
         "demographicsBreakdown": {
-            "18-24": random.randint(10, 30),
-            "25-34": random.randint(20, 40),
-            "35-44": random.randint(15, 35),
-            "45+": random.randint(10, 25),
+            "18-24": _rng.randint(10, 30),
+            "25-34": _rng.randint(20, 40),
+            "35-44": _rng.randint(15, 35),
+            "45+": _rng.randint(10, 25),
         },
         "timelineBreakdown": {
-            "setup": {"start": 0, "duration": random.randint(1, 3)},
-            "main": {"start": random.randint(1, 3), "duration": random.randint(2, 5)},
+            "setup": {"start": 0, "duration": _rng.randint(1, 3)},
+            "main": {"start": _rng.randint(1, 3), "duration": _rng.randint(2, 5)},
             "breakdown": {
-                "start": random.randint(6, 8),
-                "duration": random.randint(1, 2),
+                "start": _rng.randint(6, 8),
+                "duration": _rng.randint(1, 2),
             },
         },
         "capacityBreakdown": {
@@ -1109,24 +1298,24 @@ def get_event_detailed_metrics(event_id: str) -> dict:
                     (isinstance(event.capacity, int))
                     or (isinstance(event.capacity, str) and event.capacity.isdigit())
                 )
-                else random.randint(200, 1000)
+                else _rng.randint(200, 1000)
             ),
-            "current": random.randint(50, 100),
+            "current": _rng.randint(50, 100),
         },
         "trafficImpact": {
-            "before": random.randint(50, 70),
-            "during": random.randint(80, 100),
-            "after": random.randint(60, 80),
+            "before": _rng.randint(50, 70),
+            "during": _rng.randint(80, 100),
+            "after": _rng.randint(60, 80),
         },
         "ticketStatusBreakdown": {
-            "sold": random.randint(50, 80),
-            "reserved": random.randint(5, 20),
-            "available": random.randint(5, 30),
+            "sold": _rng.randint(50, 80),
+            "reserved": _rng.randint(5, 20),
+            "available": _rng.randint(5, 30),
         },
-        "environmentalImpact": random.choice(["low", "medium", "high"]),
-        "localBusinessBoost": f"+{random.randint(10, 50)}%",
-        "parkingAvailability": random.choice(["limited", "adequate", "plenty"]),
-        "publicTransportUsage": f"{random.randint(20, 60)}%",
+        "environmentalImpact": _rng.choice(["low", "medium", "high"]),
+        "localBusinessBoost": f"+{_rng.randint(10, 50)}%",
+        "parkingAvailability": _rng.choice(["limited", "adequate", "plenty"]),
+        "publicTransportUsage": f"{_rng.randint(20, 60)}%",
     }
 
     # Return combined data
@@ -1158,25 +1347,31 @@ def get_event_detailed_metrics(event_id: str) -> dict:
     }
 
 
+def _load_mock_json(filename):
+    """Load a static JSON file from the mock_data directory (cached)"""
+    if filename in mock_data_cache:
+        return mock_data_cache[filename]
+    with open(f"mock_data/{filename}", "r") as f:
+        data = json.load(f)
+    mock_data_cache[filename] = data
+    return data
+
+
 def load_locations_data():
     """Load location data from locations_data.json"""
     try:
-        with open("mock_data/locations_data.json", "r") as f:
-            locations = json.load(f)
-        return locations
+        return _load_mock_json("locations_data.json")
     except FileNotFoundError:
-        print(f"Error: Could not find locations_data.json in mock_data directory")
+        logger.error("Could not find locations_data.json in mock_data directory")
         return []
 
 
 def load_demographics_data():
     """Load demographics data from demographics-2.json"""
     try:
-        with open("mock_data/demographics-2.json", "r") as f:
-            demographics = json.load(f)
-        return demographics
+        return _load_mock_json("demographics-2.json")
     except FileNotFoundError:
-        print(f"Error: Could not find demographics-2.json in mock_data directory")
+        logger.error("Could not find demographics-2.json in mock_data directory")
         return []
 
 
@@ -1213,84 +1408,55 @@ def get_location_events(location_id):
 def load_all_events():
     """Load all events from consolidated_events.json"""
     try:
-        with open("mock_data/consolidated_events.json", "r") as f:
-            events = json.load(f)
-        return events
+        return _load_mock_json("consolidated_events.json")
     except FileNotFoundError:
-        print(f"Error: Could not find consolidated_events.json in mock_data directory")
+        logger.error("Could not find consolidated_events.json in mock_data directory")
         return []
 
 
-def generate_location_foot_traffic(location_id, target_date, target_hour):
-    """Generate foot traffic data for a location based on the date."""
-    # Create a cache key that includes the hour to ensure fresh data when hour changes
-    cache_key = f"{location_id}_{target_date}_{target_hour}"
-
-    # Check if we have a cached distribution
-    if cache_key in foot_traffic_cache:
-        return foot_traffic_cache[cache_key]
-
-    # Create a seed from the date and location ID
-    date_seed = sum(ord(c) for c in f"{target_date}_{location_id}")
-    random.seed(date_seed)
+def get_locations_foot_traffic_values(
+    location_ids: List[str], target_date: str
+) -> Dict[str, List[int]]:
+    """Get hourly foot traffic values for many locations at once (vectorized)."""
+    values_by_location = {}
+    missing_ids = []
+    for location_id in location_ids:
+        # Curves only depend on the location and date, not on the hour
+        cache_key = f"{location_id}_{target_date}"
+        cached = foot_traffic_cache.get(cache_key)
+        if cached is not None:
+            values_by_location[location_id] = cached
+        else:
+            missing_ids.append(location_id)
 
-    # Create a new distribution
-    traffic_data = []
-    for hour in range(24):
-        # Base traffic value
-        base_value = random.randint(30, 200)
+    if missing_ids:
+        # One locations x 24 matrix for every location not cached yet
+        matrix = generate_foot_traffic_matrix(missing_ids, target_date)
+        for location_id, values in zip(missing_ids, matrix.tolist()):
+            foot_traffic_cache[f"{location_id}_{target_date}"] = values
+            values_by_location[location_id] = values
 
-        # Adjust for time of day - morning peak (8-9am), lunch (12-1pm), evening peak (5-6pm)
-        time_factor = 1.0
-        if 7 <= hour <= 9:
-            time_factor = 1.5  # Morning peak
-        elif 11 <= hour <= 13:
-            time_factor = 1.3  # Lunch peak
-        elif 16 <= hour <= 18:
-            time_factor = 1.7  # Evening peak
-        elif 22 <= hour <= 23 or 0 <= hour <= 5:
-            time_factor = 0.4  # Night low
-
-        # Generate value for this hour
-        value = int(base_value * time_factor)
-
-        # Randomize slightly
-        value = max(10, int(value * random.uniform(0.8, 1.2)))
-
-        # Set data type - ensure there's a clear distinction at the current hour
-        if hour < target_hour:
-            data_type = FootTrafficType.PAST
-        elif hour > target_hour:
-            data_type = FootTrafficType.PREDICTED
-        else:
-            data_type = FootTrafficType.CURRENT
+    return values_by_location
 
-        # Add the data point
-        traffic_data.append(FootTrafficData(hour=hour, value=value, type=data_type))
 
-    # Cache the distribution with the hour-specific key
-    foot_traffic_cache[cache_key] = traffic_data
-    return traffic_data
+def _seed_location_attributes(location_id: str, target_date: str) -> None:
+    """Seed the random module so a location's generated attributes are stable for a date."""
+    _rng.seed(sum(ord(c) for c in f"{target_date}_{location_id}"))
 
 
-def generate_event_specific_foot_traffic(
-    location_foot_traffic: List[FootTrafficData],
-    start_time_str: str,
-    end_time_str: str,
-    target_hour: int,
-) -> List[FootTrafficData]:
+def event_specific_foot_traffic_values(
+    hour_to_value: Dict[int, int], start_time_str: str, end_time_str: str
+) -> List[int]:
     """
-    Generate event-specific foot traffic data with peaks at start and end times.
-    The peak values match the location's foot traffic values at those times.
+    Generate hourly event-specific foot traffic values with peaks at start and end times.
 
     Args:
-        location_foot_traffic: Regular foot traffic data for the location
+        hour_to_value: Regular foot traffic value for each hour at the location
         start_time_str: Event start time string
         end_time_str: Event end time string
-        target_hour: Current hour for setting data types (past/current/predicted)
 
     Returns:
-        List of FootTrafficData with peaks at start and end times
+        Foot traffic value for each hour 0-23
     """
     # Parse start and end times to get hours
     start_hour = 12  # Default to noon if we can't parse
@@ -1315,12 +1481,9 @@ def generate_event_specific_foot_traffic(
             start_hour = int(start_time_str.split(":")[0])
             end_hour = int(end_time_str.split(":")[0])
     except Exception as e:
-        print(f"Error parsing event times for foot traffic: {e}")
-
-    # Create a mapping of hour to value from the location foot traffic
-    hour_to_value = {}
-    for ft in location_foot_traffic:
-        hour_to_value[ft.hour] = ft.value
+        logger.debug(
+            "Error parsing event times for foot traffic: %s", e, extra={"sample": "event"}
+        )
 
     # Generate event-specific foot traffic with peaks at start and end times
     event_traffic = []
@@ -1355,37 +1518,36 @@ def generate_event_specific_foot_traffic(
         if start_hour < end_hour and start_hour < hour < end_hour:
             value = max(value, int(hour_to_value.get(hour, 100) * 0.4))
 
-        # Set data type based on current hour
-        if hour < target_hour:
-            data_type = FootTrafficType.PAST
-        elif hour > target_hour:
-            data_type = FootTrafficType.PREDICTED
-        else:
-            data_type = FootTrafficType.CURRENT
-
-        event_traffic.append(FootTrafficData(hour=hour, value=value, type=data_type))
+        event_traffic.append(value)
 
     return event_traffic
 
 
-def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
-    """Get all locations as hotspots (natural or event), sorted by foot traffic."""
+@timed("locations")
+def get_all_locations(
+    target_date=None, target_hour=None, compact: bool = False
+) -> List[Location]:
+    """Get all locations as hotspots (natural or event), sorted by foot traffic.
+
+    With compact=True foot traffic series use the CompactFootTraffic encoding.
+    """
     # Set defaults for target_date and target_hour
     if target_date is None:
         target_date = datetime.now().strftime("%Y-%m-%d")
     if target_hour is None:
         target_hour = datetime.now().hour
 
-    print(
-        f"DEBUG: get_all_locations called with target_date={target_date}, target_hour={target_hour}"
+    logger.debug(
+        f"get_all_locations called with target_date={target_date}, target_hour={target_hour}"
     )
 
     # Create a cache key that depends only on the target date and hour
     # This ensures consistent results for the same query parameters
-    cache_key = f"locations_{target_date}_{target_hour}"
+    cache_key = f"locations_{target_date}_{target_hour}{'_compact' if compact else ''}"
 
-    if cache_key in location_cache:
-        return location_cache[cache_key]
+    cached = location_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     # Load all locations
     locations_data = load_locations_data()
@@ -1408,21 +1570,21 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
             all_events[location_id] = []
         all_events[location_id].append(event)
 
+    # Generate foot traffic for all locations in one vectorized call
+    values_by_location = get_locations_foot_traffic_values(
+        [location["location_id"] for location in locations_data], target_date
+    )
+
     # Create locations list with traffic data
     locations_with_traffic = []
 
     for location in locations_data:
         location_id = location["location_id"]
-
-        # Generate foot traffic for this location
-        foot_traffic = generate_location_foot_traffic(
-            location_id, target_date, target_hour
-        )
+        foot_traffic_values = values_by_location[location_id]
+        _seed_location_attributes(location_id, target_date)
 
         # Get the current hour's traffic
-        current_traffic = next(
-            (ft.value for ft in foot_traffic if ft.type == FootTrafficType.CURRENT), 0
-        )
+        current_traffic = foot_traffic_values[target_hour]
 
         # Traffic level based on current value
         traffic_level = (
@@ -1447,15 +1609,15 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
             type=HotspotType.NATURAL,
             label="",  # Will be assigned after sorting
             trafficLevel=traffic_level,
-            weather=random.choice(list(WeatherType)),
+            weather=_rng.choice(list(WeatherType)),
             coordinates=(location["longitude"], location["latitude"]),
-            footTraffic=foot_traffic,
-            population=f"{demo['population'] if demo else random.randint(5000, 15000)}",
-            areaType="Commercial" if random.random() < 0.5 else "Residential",
-            peakHour=f"{8 + random.randint(0, 10):02d}:00",
-            avgDailyTraffic=f"{random.randint(2000, 10000)}",
-            dominantDemographics=f"{20 + random.randint(0, 30)}-{40 + random.randint(0, 30)}",
-            nearbyBusinesses=f"{random.randint(10, 60)}+",
+            footTraffic=format_foot_traffic(foot_traffic_values, target_hour, compact),
+            population=f"{demo['population'] if demo else _rng.randint(5000, 15000)}",
+            areaType="Commercial" if _rng.random() < 0.5 else "Residential",
+            peakHour=f"{8 + _rng.randint(0, 10):02d}:00",
+            avgDailyTraffic=f"{_rng.randint(2000, 10000)}",
+            dominantDemographics=f"{20 + _rng.randint(0, 30)}-{40 + _rng.randint(0, 30)}",
+            nearbyBusinesses=f"{_rng.randint(10, 60)}+",
         )
 
         locations_with_traffic.append((location_obj, current_traffic))
@@ -1468,11 +1630,11 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
     locations = []
 
     # Save current random state
-    random_state = random.getstate()
+    random_state = _rng.getstate()
 
     # Generate a seed based on the date AND hour to ensure different event selection each hour
     hour_date_seed = sum(ord(c) for c in f"{target_date}_{target_hour}")
-    random.seed(hour_date_seed)
+    _rng.seed(hour_date_seed)
 
     for i, (location, _) in enumerate(locations_with_traffic):
         if i < len(labels):
@@ -1483,12 +1645,12 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
         # Randomly upgrade some locations to event hotspots
         # This simulates events happening at some locations
         if (
-            random.random() < 0.4
+            _rng.random() < 0.4
             and location.id in all_events
             and all_events[location.id]
         ):
             # Pick a random event for this location
-            event = random.choice(all_events[location.id])
+            event = _rng.choice(all_events[location.id])
 
             # Convert to event hotspot
             location.type = HotspotType.EVENT
@@ -1524,8 +1686,10 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
 
                 # Use the target_hour that was passed to the function
                 # This is the hour that the frontend is requesting data for
-                print(
-                    f"DEBUG: Using target hour {target_hour} for event time calculation"
+                logger.debug(
+                    "Using target hour %s for event time calculation",
+                    target_hour,
+                    extra={"sample": "event"},
                 )
 
                 # Create a consistent timezone for Finland (UTC+2/UTC+3 depending on DST)
@@ -1538,7 +1702,7 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
                 )
 
                 # Choose either target_hour + 30 minutes or target_hour + 1 hour
-                time_option = random.choice([30, 60])  # Either 30 minutes or 1 hour
+                time_option = _rng.choice([30, 60])  # Either 30 minutes or 1 hour
 
                 if time_option == 30:
                     # target_hour + 30 minutes
@@ -1547,8 +1711,11 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
                     # target_hour + 1 hour
                     new_start_time = event_date + timedelta(hours=1)
 
-                print(
-                    f"DEBUG: Event {event.get('event_id', 'unknown')} start time set to {new_start_time.strftime('%H:%M')}"
+                logger.debug(
+                    "Event %s start time set to %s",
+                    event.get("event_id", "unknown"),
+                    new_start_time.strftime("%H:%M"),
+                    extra={"sample": "event"},
                 )
 
                 # Calculate new end time by adding the original duration
@@ -1568,8 +1735,11 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
                 )
             except Exception as e:
                 # Fallback to original times if parsing fails
-                print(
-                    f"DEBUG: Error parsing times for event {event.get('event_id', 'unknown')}: {e}"
+                logger.debug(
+                    "Error parsing times for event %s: %s",
+                    event.get("event_id", "unknown"),
+                    e,
+                    extra={"sample": "event"},
                 )
 
                 # Try to fix timezone if possible
@@ -1605,7 +1775,7 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
             location.event_name = event.get("name", "Unknown Event")
             location.event_type = event.get("event_type", "Event")
             location.expected_attendance = event.get(
-                "expected_attendance", random.randint(200, 2000)
+                "expected_attendance", _rng.randint(200, 2000)
             )
             location.description = event.get("description", "")
             location.location_id = event.get("location_id", "")
@@ -1613,17 +1783,19 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
 
             # Add event-specific foot traffic with peaks at start and end times
             if location.start_time and location.end_time:
-                location.event_foot_traffic = generate_event_specific_foot_traffic(
-                    location.footTraffic,
+                event_values = event_specific_foot_traffic_values(
+                    dict(enumerate(values_by_location[location.id])),
                     location.start_time,
                     location.end_time,
-                    target_hour,
+                )
+                location.event_foot_traffic = format_foot_traffic(
+                    event_values, target_hour, compact
                 )
 
         locations.append(location)
 
     # Restore random state
-    random.setstate(random_state)
+    _rng.setstate(random_state)
 
     # Cache the results (top 6 locations)
     location_cache[cache_key] = locations[:6]
@@ -1632,10 +1804,14 @@ def get_all_locations(target_date=None, target_hour=None) -> List[Location]:
     return locations[:6]
 
 
+@timed("location")
 def get_location_by_id(
-    location_id: str, target_date=None, target_hour=None
+    location_id: str, target_date=None, target_hour=None, compact: bool = False
 ) -> Optional[Location]:
-    """Get a specific location by ID"""
+    """Get a specific location by ID
+
+    With compact=True foot traffic series use the CompactFootTraffic encoding.
+    """
     # Set defaults
     if target_date is None:
         target_date = datetime.now().strftime("%Y-%m-%d")
@@ -1650,9 +1826,10 @@ def get_location_by_id(
     cache_key = (
         f"locations_{target_date}_{target_hour}_sys_{current_date}_{current_hour}"
     )
-    if cache_key in location_cache:
+    cached = location_cache.get(cache_key)
+    if cached is not None:
         # Check if the location is in the top 6
-        for location in location_cache[cache_key]:
+        for location in cached:
             if location.id == location_id:
                 return location
 
@@ -1662,15 +1839,13 @@ def get_location_by_id(
         if location_data["location_id"] == location_id:
             # Found the location, now create a Location object with traffic data
             # Generate foot traffic for this location
-            foot_traffic = generate_location_foot_traffic(
-                location_id, target_date, target_hour
-            )
+            foot_traffic_values = get_locations_foot_traffic_values(
+                [location_id], target_date
+            )[location_id]
+            _seed_location_attributes(location_id, target_date)
 
             # Get the current hour's traffic
-            current_traffic = next(
-                (ft.value for ft in foot_traffic if ft.type == FootTrafficType.CURRENT),
-                0,
-            )
+            current_traffic = foot_traffic_values[target_hour]
 
             # Traffic level based on current value
             traffic_level = (
@@ -1688,15 +1863,17 @@ def get_location_by_id(
                 type=HotspotType.NATURAL,  # Default to natural type
                 label="Z",  # Not in top locations, so give it a Z label
                 trafficLevel=traffic_level,
-                weather=random.choice(list(WeatherType)),
+                weather=_rng.choice(list(WeatherType)),
                 coordinates=(location_data["longitude"], location_data["latitude"]),
-                footTraffic=foot_traffic,
-                population=f"{random.randint(5000, 15000)}",
-                areaType="Commercial" if random.random() < 0.5 else "Residential",
-                peakHour=f"{8 + random.randint(0, 10):02d}:00",
-                avgDailyTraffic=f"{random.randint(2000, 10000)}",
-                dominantDemographics=f"{20 + random.randint(0, 30)}-{40 + random.randint(0, 30)}",
-                nearbyBusinesses=f"{random.randint(10, 60)}+",
+                footTraffic=format_foot_traffic(
+                    foot_traffic_values, target_hour, compact
+                ),
+                population=f"{_rng.randint(5000, 15000)}",
+                areaType="Commercial" if _rng.random() < 0.5 else "Residential",
+                peakHour=f"{8 + _rng.randint(0, 10):02d}:00",
+                avgDailyTraffic=f"{_rng.randint(2000, 10000)}",
+                dominantDemographics=f"{20 + _rng.randint(0, 30)}-{40 + _rng.randint(0, 30)}",
+                nearbyBusinesses=f"{_rng.randint(10, 60)}+",
             )
 
             # Check if there are any events associated with this location
@@ -1707,7 +1884,7 @@ def get_location_by_id(
 
             if location_events:
                 # Convert to event hotspot if there are events
-                event = random.choice(location_events)
+                event = _rng.choice(location_events)
                 location.type = HotspotType.EVENT
 
                 # Get original times or generate new ones
@@ -1719,7 +1896,7 @@ def get_location_by_id(
                     event_date = datetime.now().replace(
                         hour=target_hour, minute=0, second=0, microsecond=0
                     )
-                    time_option = random.choice([30, 60])
+                    time_option = _rng.choice([30, 60])
 
                     if time_option == 30:
                         new_start_time = event_date.replace(minute=30)
@@ -1750,7 +1927,7 @@ def get_location_by_id(
                 location.event_name = event.get("name", "Unknown Event")
                 location.event_type = event.get("event_type", "Event")
                 location.expected_attendance = event.get(
-                    "expected_attendance", random.randint(200, 2000)
+                    "expected_attendance", _rng.randint(200, 2000)
                 )
                 location.description = event.get("description", "")
                 location.location_id = event.get("location_id", "")
@@ -1758,11 +1935,13 @@ def get_location_by_id(
 
                 # Add event-specific foot traffic with peaks at start and end times
                 if location.start_time and location.end_time:
-                    location.event_foot_traffic = generate_event_specific_foot_traffic(
-                        location.footTraffic,
+                    event_values = event_specific_foot_traffic_values(
+                        dict(enumerate(foot_traffic_values)),
                         location.start_time,
                         location.end_time,
-                        target_hour,
+                    )
+                    location.event_foot_traffic = format_foot_traffic(
+                        event_values, target_hour, compact
                     )
 
             return location
@@ -1770,6 +1949,111 @@ def get_location_by_id(
     return None
 
 
+def get_traffic_coordinates(location: Location) -> Tuple[float, float]:
+    """Get the point that drives road traffic for a location (the venue for events)."""
+    if (
+        location.type == HotspotType.EVENT
+        and location.venue_coordinates
+        and None not in location.venue_coordinates
+    ):
+        return location.venue_coordinates
+    return location.coordinates
+
+
+def get_traffic_sources(locations: List[Location]) -> TrafficSources:
+    """Get the road traffic input for a list of locations as plain coordinate arrays."""
+    return TrafficSources.from_points(
+        get_traffic_coordinates(location) for location in locations
+    )
+
+
+# Translates road status codes (0, 1, 2, ...) to their ASCII digits
+_STATUS_DIGITS = bytes.maketrans(
+    bytes(range(len(STATUS_BY_CODE))),
+    "".join(str(code) for code in range(len(STATUS_BY_CODE))).encode(),
+)
+
+
+@timed("timeline")
+def get_locations_timeline(
+    target_date: Optional[str] = None, include_roads: bool = True
+) -> LocationsTimelineResponse:
+    """Get the location ranking and road statuses for all 24 hours of a date.
+
+    Mock data, foot traffic curves and the road network are loaded once and
+    shared by every hour. Road statuses are sent as one digit per road, and the
+    road geometry (if requested) is sent only once.
+    """
+    if target_date is None:
+        target_date = datetime.now().strftime("%Y-%m-%d")
+
+    network = get_road_network()
+
+    timeline_locations = {}
+    statuses_by_coords = {}
+    hours = []
+    for hour in range(24):
+        ranking = []
+        hotspot_coords = []
+        for location in get_all_locations(target_date, hour, compact=True):
+            if location.id not in timeline_locations:
+                timeline_locations[location.id] = TimelineLocation(
+                    id=location.id,
+                    name=location.name,
+                    coordinates=location.coordinates,
+                    footTraffic=location.footTraffic.values,
+                )
+
+            entry = TimelineRankingEntry(
+                id=location.id,
+                label=location.label,
+                type=location.type,
+                trafficLevel=location.trafficLevel,
+                value=location.footTraffic.values[hour],
+            )
+            if location.type == HotspotType.EVENT:
+                entry.event_id = location.event_id
+                entry.event_name = location.event_name
+                entry.start_time = location.start_time
+                entry.end_time = location.end_time
+                entry.venue_coordinates = get_traffic_coordinates(location)
+                if location.event_foot_traffic:
+                    entry.event_foot_traffic = location.event_foot_traffic.values
+            ranking.append(entry)
+            hotspot_coords.append(get_traffic_coordinates(location))
+
+        # Hours that share the same hotspots share the same road statuses
+        coords_key = tuple(hotspot_coords)
+        if coords_key not in statuses_by_coords:
+            status_codes = classify_road_statuses(
+                network, TrafficSources.from_points(hotspot_coords)
+            )
+            statuses_by_coords[coords_key] = status_codes.translate(
+                _STATUS_DIGITS
+            ).decode()
+
+        hours.append(
+            TimelineHour(
+                hour=hour, ranking=ranking, road_statuses=statuses_by_coords[coords_key]
+            )
+        )
+
+    roads = None
+    if include_roads:
+        roads = TimelineRoads(
+            coordinates=list(network.coords), offsets=list(network.offsets)
+        )
+
+    return LocationsTimelineResponse(
+        date=target_date,
+        status_codes=list(STATUS_BY_CODE),
+        locations=list(timeline_locations.values()),
+        hours=hours,
+        roads=roads,
+    )
+
+
+@timed("metrics")
 def get_location_detailed_metrics(location_id: str) -> dict:
     """Get detailed metrics for a specific location"""
     location = get_location_by_id(location_id)
@@ -1831,17 +2115,15 @@ def get_location_detailed_metrics(location_id: str) -> dict:
                     }
                     break
         except Exception as e:
-            print(f"Error loading demographics: {e}")
+            logger.warning(f"Error loading demographics: {e}")
     elif getattr(location, "type", None) == "event":
         # Event hotspot: add expected crowd (mock/heuristic)
         # Heuristic: use event size, time, or just random for now
-        import random
-
         expected_crowd = {
-            "primary_demographic": random.choice(
+            "primary_demographic": _rng.choice(
                 ["18-25", "26-35", "36-45", "All Ages"]
             ),
-            "estimated_size": random.randint(100, 1000),
+            "estimated_size": _rng.randint(100, 1000),
             "notes": "Estimate based on event type and time",
         }
         location_data["expected_crowd"] = expected_crowd
@@ -0,0 +1,274 @@
+"""
+Executor module for Tampere Explorer Hub.
+This module runs CPU-bound request work off the asyncio event loop.
+
+Streaming responses produce their chunks lazily, so their CPU work happens
+while the response is sent. Those chunks are produced one executor job at a
+time in a separate thread executor (a process pool can't keep a generator's
+state between jobs), which also caps how many streams are open at once.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from app import config
+from app import metrics
+from app.timing import record_stage
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the executor queue is full and new work is rejected."""
+
+
+class WorkExecutor:
+    """
+    Thread or process pool with a concurrency limit and queue-depth tracking.
+
+    Jobs first wait for a concurrency slot on the event loop (this wait is the
+    queue), then run in the pool. When the queue is full new jobs are rejected
+    with ExecutorBusyError instead of piling up behind slow requests. Thread
+    executors can also produce the chunks of streaming responses (see stream).
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_concurrency: Optional[int] = None,
+        max_queue: int = 0,
+        name: str = "cpu",
+        max_streams: int = 0,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.max_queue = max_queue
+        self.max_streams = max_streams
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters exposed through stats()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_queued_seen = 0
+        self.open_streams = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_pool(self) -> Executor:
+        """Create the underlying pool on first use."""
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-worker",
+                )
+            logger.info(
+                f"Started {self.name} {self.kind} executor with {self.max_workers} workers "
+                f"(concurrency={self.max_concurrency}, max_queue={self.max_queue})"
+            )
+        return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func(*args, **kwargs) in the pool and await its result."""
+        if self.max_queue and self.queued >= self.max_queue:
+            self.rejected += 1
+            metrics.EXECUTOR_JOBS.labels(executor=self.name, outcome="rejected").inc()
+            raise ExecutorBusyError(
+                f"Executor queue is full ({self.queued} jobs waiting)"
+            )
+
+        semaphore = self._get_semaphore()
+        self.queued += 1
+        metrics.EXECUTOR_QUEUED.labels(executor=self.name).inc()
+        self.max_queued_seen = max(self.max_queued_seen, self.queued)
+        enqueued_at = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+            metrics.EXECUTOR_QUEUED.labels(executor=self.name).dec()
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - enqueued_at
+        metrics.EXECUTOR_WAIT_SECONDS.labels(executor=self.name).observe(
+            started_at - enqueued_at
+        )
+        record_stage("queue", started_at - enqueued_at)
+        self.active += 1
+        metrics.EXECUTOR_ACTIVE.labels(executor=self.name).inc()
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(func, *args, **kwargs)
+            if self.kind == "thread":
+                # Carry the request context (e.g. stage timings) into the worker
+                call = functools.partial(contextvars.copy_context().run, call)
+            result = await loop.run_in_executor(self._get_pool(), call)
+            self.completed += 1
+            metrics.EXECUTOR_JOBS.labels(executor=self.name, outcome="completed").inc()
+            return result
+        except Exception:
+            self.failed += 1
+            metrics.EXECUTOR_JOBS.labels(executor=self.name, outcome="failed").inc()
+            raise
+        finally:
+            self.active -= 1
+            metrics.EXECUTOR_ACTIVE.labels(executor=self.name).dec()
+            self.total_run_seconds += time.perf_counter() - started_at
+            semaphore.release()
+
+    def stream(self, chunks: Iterable[Any]) -> "ExecutorStream":
+        """
+        Produce the chunks of a synchronous iterable in this executor.
+
+        Raises ExecutorBusyError when max_streams streams are already open, so
+        a route can answer 503 before its response starts.
+        """
+        if self.kind != "thread":
+            raise ValueError("Streams need a thread executor")
+        if self.max_streams and self.open_streams >= self.max_streams:
+            self.rejected += 1
+            metrics.EXECUTOR_JOBS.labels(executor=self.name, outcome="rejected").inc()
+            raise ExecutorBusyError(f"Too many open streams ({self.open_streams})")
+        return ExecutorStream(self, chunks)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the executor counters."""
+        finished = self.completed + self.failed
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "max_queued_seen": self.max_queued_seen,
+            "open_streams": self.open_streams,
+            "max_streams": self.max_streams,
+            "avg_wait_ms": (self.total_wait_seconds / finished * 1000)
+            if finished
+            else 0.0,
+            "avg_run_ms": (self.total_run_seconds / finished * 1000)
+            if finished
+            else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the underlying pool, if it was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Marks the end of a stream's chunks
+_END = object()
+
+
+class ExecutorStream:
+    """
+    Async iterator over chunks produced one executor job at a time.
+
+    It holds one of the executor's stream slots from creation until it is
+    exhausted, fails, is closed or is garbage collected (a response that
+    never started).
+    """
+
+    def __init__(self, executor: WorkExecutor, chunks: Iterable[Any]):
+        self._executor = executor
+        self._chunks = iter(chunks)
+        self._open = True
+        executor.open_streams += 1
+        metrics.EXECUTOR_OPEN_STREAMS.labels(executor=executor.name).inc()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self._open:
+            raise StopAsyncIteration
+        try:
+            chunk = await self._executor.run(next, self._chunks, _END)
+        except BaseException:
+            self.close()
+            raise
+        if chunk is _END:
+            self.close()
+            raise StopAsyncIteration
+        return chunk
+
+    def close(self) -> None:
+        """Release the stream slot."""
+        if self._open:
+            self._open = False
+            self._executor.open_streams -= 1
+            metrics.EXECUTOR_OPEN_STREAMS.labels(executor=self._executor.name).dec()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+# Application-wide executor for CPU-bound work
+cpu_executor = WorkExecutor(
+    kind=config.EXECUTOR_KIND,
+    max_workers=config.EXECUTOR_MAX_WORKERS,
+    max_concurrency=config.EXECUTOR_MAX_CONCURRENCY,
+    max_queue=config.EXECUTOR_MAX_QUEUE,
+)
+# Thread executor that produces the chunks of streaming responses
+stream_executor = WorkExecutor(
+    kind="thread",
+    max_workers=config.STREAM_MAX_WORKERS,
+    name="stream",
+    max_streams=config.STREAM_MAX_OPEN,
+)
+
+
+async def run_cpu_bound(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run CPU-heavy work (location ranking, road pipeline) off the event loop."""
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+def stream_in_executor(chunks: Iterable[Any]) -> ExecutorStream:
+    """Produce a streaming response's chunks in the stream executor (may raise ExecutorBusyError)."""
+    return stream_executor.stream(chunks)
+
+
+def get_executor_stats() -> dict:
+    """Get queue depth and throughput counters for the CPU and stream executors."""
+    stats = cpu_executor.stats()
+    stats["stream"] = stream_executor.stats()
+    return stats
+
+
+def shutdown_executor() -> None:
+    """Release executor resources on application shutdown."""
+    cpu_executor.shutdown()
+    stream_executor.shutdown()
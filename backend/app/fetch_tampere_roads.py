@@ -1,10 +1,15 @@
 import requests
 import json
+import logging
 import random
-from typing import Dict, List, Any, Tuple
+from array import array
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple, Union
 import math
 import os
+import time
 
+from app import config
+from app.timing import timed
 from app.models import (
     TrafficStatus,
     TrafficFeatureProperties,
@@ -14,6 +19,8 @@ from app.models import (
     Hotspot,
 )
 
+logger = logging.getLogger(__name__)
+
 # Overpass API query for Tampere's main roads
 OVERPASS_QUERY = """
 [out:json];
@@ -36,43 +43,88 @@ OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 # Path to cache file for raw Overpass API data
 OVERPASS_CACHE_FILE = os.path.join(os.path.dirname(__file__), "tampere_roads_raw.json")
 
+# Traffic statuses indexed by the compact status codes used in road arrays
+STATUS_BY_CODE = (
+    TrafficStatus.AVAILABLE,
+    TrafficStatus.MODERATE,
+    TrafficStatus.CONGESTED,
+)
+CODE_BY_STATUS = {status: code for code, status in enumerate(STATUS_BY_CODE)}
+
 
+@timed("roads.load")
 def fetch_tampere_roads() -> Dict[str, Any]:
     """Fetch road data for Tampere from Overpass API or cache"""
     # Try to load from cache first
     if os.path.exists(OVERPASS_CACHE_FILE):
         try:
-            print("Loading road data from cache...")
+            logger.debug("Loading road data from cache...")
             with open(OVERPASS_CACHE_FILE, "r") as f:
                 data = json.load(f)
-                print(f"Loaded {len(data['elements'])} elements from cache")
+                logger.debug(f"Loaded {len(data['elements'])} elements from cache")
                 return data
         except Exception as e:
-            print(f"Error loading cached road data: {e}")
+            logger.error(f"Error loading cached road data: {e}")
 
     # If cache doesn't exist or couldn't be loaded, fetch from API
-    print("Fetching Tampere road data from Overpass API...")
-    response = requests.post(OVERPASS_URL, data={"data": OVERPASS_QUERY})
+    logger.info("Fetching Tampere road data from Overpass API...")
+    response = requests.post(
+        OVERPASS_URL,
+        data={"data": OVERPASS_QUERY},
+        timeout=config.OVERPASS_TIMEOUT_SECONDS,
+    )
 
     if response.status_code != 200:
-        print(f"Error fetching data: {response.status_code}")
-        print(response.text)
+        logger.error(
+            f"Error fetching data: {response.status_code} {response.text[:500]}"
+        )
         return {"elements": []}
 
     data = response.json()
-    print(f"Fetched {len(data['elements'])} elements from Overpass API")
+    logger.info(f"Fetched {len(data['elements'])} elements from Overpass API")
 
     # Save raw data to cache
     try:
         with open(OVERPASS_CACHE_FILE, "w") as f:
             json.dump(data, f)
-        print("Saved road data to cache")
+        logger.info("Saved road data to cache")
     except Exception as e:
-        print(f"Error saving road data to cache: {e}")
+        logger.error(f"Error saving road data to cache: {e}")
 
     return data
 
 
+_road_network = None
+# Monotonic time before which a failed load isn't retried
+_road_network_retry_at = 0.0
+
+
+def load_road_network() -> "RoadNetwork":
+    """Load the road network once per process (from cache or Overpass API)
+
+    Returns an empty network if the roads can't be loaded. The load is then
+    retried at most every ROAD_NETWORK_RETRY_SECONDS, so requests don't each
+    wait for an unreachable Overpass API.
+    """
+    global _road_network, _road_network_retry_at
+    if _road_network is not None:
+        return _road_network
+    if time.monotonic() < _road_network_retry_at:
+        return RoadNetwork(array("d"), array("q", [0]))
+
+    try:
+        network = RoadNetwork.from_osm(fetch_tampere_roads())
+    except Exception as e:
+        logger.error(f"Error loading road network: {e}")
+        network = RoadNetwork(array("d"), array("q", [0]))
+    if len(network) == 0:
+        # Don't keep an empty network around; retry later
+        _road_network_retry_at = time.monotonic() + config.ROAD_NETWORK_RETRY_SECONDS
+        return network
+    _road_network = network
+    return _road_network
+
+
 def calculate_distance(
     coord1: Tuple[float, float], coord2: Tuple[float, float]
 ) -> float:
@@ -94,10 +146,92 @@ def calculate_distance(
     return R * c
 
 
+class TrafficSources:
+    """
+    Points that make nearby roads busier, as plain arrays.
+
+    coords holds interleaved [lon0, lat0, lon1, lat1, ...] pairs, in the same
+    order as Hotspot.coordinates. Optional weights scale each point's reach: a
+    road d meters from a point of weight w is treated as d / w meters away.
+    Without weights every point counts the same.
+    """
+
+    __slots__ = ("coords", "weights")
+
+    def __init__(
+        self, coords: Sequence[float] = (), weights: Optional[Sequence[float]] = None
+    ):
+        if len(coords) % 2:
+            raise ValueError("coords must hold (longitude, latitude) pairs")
+        if weights is not None:
+            if len(weights) * 2 != len(coords):
+                raise ValueError("weights must have one value per point")
+            if any(weight <= 0 for weight in weights):
+                raise ValueError("weights must be positive")
+        self.coords = array("d", coords)
+        self.weights = array("d", weights) if weights is not None else None
+
+    @classmethod
+    def from_points(
+        cls,
+        points: Iterable[Tuple[float, float]],
+        weights: Optional[Sequence[float]] = None,
+    ) -> "TrafficSources":
+        """Build sources from (longitude, latitude) pairs"""
+        coords = array("d")
+        for lon, lat in points:
+            coords.append(lon)
+            coords.append(lat)
+        return cls(coords, weights)
+
+    @classmethod
+    def from_hotspots(cls, hotspots: Iterable[Hotspot]) -> "TrafficSources":
+        """Build sources from Hotspot models (only their coordinates are used)"""
+        return cls.from_points(hotspot.coordinates for hotspot in hotspots)
+
+    @classmethod
+    def coerce(
+        cls, sources: Union["TrafficSources", Sequence[Any], None]
+    ) -> "TrafficSources":
+        """Accept sources, a list of Hotspots or a list of (longitude, latitude) pairs"""
+        if isinstance(sources, cls):
+            return sources
+        if not sources:
+            return cls()
+        if hasattr(sources[0], "coordinates"):
+            return cls.from_hotspots(sources)
+        return cls.from_points(sources)
+
+    def __len__(self) -> int:
+        return len(self.coords) // 2
+
+    def key(self) -> bytes:
+        """Hashable identity of the points and weights, for coalescing identical work"""
+        weights = self.weights.tobytes() if self.weights is not None else b""
+        return self.coords.tobytes() + b"|" + weights
+
+    def lat_lon(self) -> List[Tuple[float, float]]:
+        """Get the (latitude, longitude) of every point, as calculate_distance expects"""
+        coords = self.coords
+        return [(coords[2 * i + 1], coords[2 * i]) for i in range(len(self))]
+
+    def max_weight(self) -> float:
+        """Largest weight (1.0 without weights)"""
+        if self.weights is None or len(self.weights) == 0:
+            return 1.0
+        return max(self.weights)
+
+
+# Traffic sources, or the forms TrafficSources.coerce accepts
+TrafficSourcesLike = Union[TrafficSources, Sequence[Hotspot], Sequence[Tuple[float, float]]]
+
+
 def determine_traffic_status(
-    road_coords: List[List[float]], hotspots: List[Hotspot]
+    road_coords: List[List[float]], hotspots: TrafficSourcesLike
 ) -> TrafficStatus:
     """Determine traffic status based on proximity to hotspots"""
+    sources = TrafficSources.coerce(hotspots)
+
     # Calculate the midpoint of the road segment
     road_midpoint = (
         sum(coord[1] for coord in road_coords) / len(road_coords),  # latitude
@@ -106,40 +240,39 @@ def determine_traffic_status(
 
     # Check distance to each hotspot
     min_distance = float("inf")
-    closest_hotspot = None
-    for hotspot in hotspots:
-        # Hotspot coordinates are stored as (longitude, latitude)
-        hotspot_coords = (
-            hotspot.coordinates[1],
-            hotspot.coordinates[0],
-        )  # Convert to (latitude, longitude)
+    weights = sources.weights
+    for i, hotspot_coords in enumerate(sources.lat_lon()):
         distance = calculate_distance(road_midpoint, hotspot_coords)
+        if weights is not None:
+            distance /= weights[i]
         if distance < min_distance:
             min_distance = distance
-            closest_hotspot = hotspot
 
-    # Debug logging for the closest hotspot
-    # if closest_hotspot and min_distance < 200:  # Only log for very close roads
-    #     print(f"Road near hotspot '{closest_hotspot.name}':")
-    #     print(f"  Road midpoint: {road_midpoint}")
-    #     print(f"  Hotspot coords: {closest_hotspot.coordinates}")
-    #     print(f"  Distance: {min_distance:.2f}m")
+    return status_for_distance(min_distance)
+
+
+# Distance beyond which roads are always available, and the matching latitude band
+AVAILABLE_DISTANCE_METERS = 200
+STATUS_LATITUDE_BAND = math.degrees(AVAILABLE_DISTANCE_METERS / 6371000) * 1.000001
 
-    # Determine traffic status based on distance to nearest hotspot
+
+def status_for_distance(min_distance: float) -> TrafficStatus:
+    """Determine traffic status based on distance to nearest hotspot"""
     if min_distance < 100:  # Only very close streets get congested
         return TrafficStatus.CONGESTED
-    elif min_distance < 200:  # Slightly further gets moderate
+    elif min_distance < AVAILABLE_DISTANCE_METERS:  # Slightly further gets moderate
         return TrafficStatus.MODERATE
     else:  # Everything else is available
         return TrafficStatus.AVAILABLE
 
 
+@timed("roads.process")
 def process_road_data(
-    data: Dict[str, Any], hotspots: List[Hotspot] = None
+    data: Dict[str, Any], hotspots: Optional[TrafficSourcesLike] = None
 ) -> TrafficData:
     """Process the Overpass API data into our TrafficData format with optional traffic status based on hotspots"""
-    if hotspots is None:
-        hotspots = []
+    # Convert once, not per road
+    hotspots = TrafficSources.coerce(hotspots)
 
     # Extract nodes (points) and ways (roads)
     nodes = {
@@ -149,7 +282,7 @@ def process_road_data(
     }
     ways = [way for way in data["elements"] if way["type"] == "way"]
 
-    print(f"Processing {len(ways)} road segments...")
+    logger.debug(f"Processing {len(ways)} road segments...")
 
     # Convert to TrafficFeature objects
     features = []
@@ -183,7 +316,7 @@ def process_road_data(
     # Create the TrafficData object
     traffic_data = TrafficData(type="FeatureCollection", features=features)
 
-    print(f"Created traffic data with {len(features)} features")
+    logger.debug(f"Created traffic data with {len(features)} features")
     return traffic_data
 
 
@@ -191,7 +324,7 @@ def save_traffic_data(traffic_data: TrafficData, file_path: str) -> None:
     """Save the traffic data to a JSON file"""
     with open(file_path, "w") as f:
         json.dump(traffic_data.dict(), f, indent=2)
-    print(f"Saved traffic data to {file_path}")
+    logger.info(f"Saved traffic data to {file_path}")
 
 
 def interpolate_point(p1: List[float], p2: List[float], t: float) -> List[float]:
@@ -202,6 +335,142 @@ def interpolate_point(p1: List[float], p2: List[float], t: float) -> List[float]
     ]
 
 
+# Target spacing for AVAILABLE roads
+BASE_SPACING_METERS = 100.0
+
+# Point density multipliers per traffic status
+DENSITY_MULTIPLIERS = {
+    TrafficStatus.CONGESTED: 6.0,  # e.g., 1 point every ~17m
+    TrafficStatus.MODERATE: 3.0,  # e.g., 1 point every ~33m
+    TrafficStatus.AVAILABLE: 1.0,  # e.g., 1 point every 100m
+}
+
+# Small tolerance value for float comparisons
+EPSILON = 1e-9
+
+
+def place_points_along_polyline(
+    coords: Sequence[Sequence[float]], status: TrafficStatus
+) -> List[List[float]]:
+    """
+    Place traffic points evenly along the *entire length* of a polyline.
+
+    The number of points is based on the target spacing for the traffic status,
+    which avoids point clustering at the nodes connecting segments.
+    """
+    # Early return for features with insufficient coordinates
+    if len(coords) < 2:
+        return []
+
+    # 1. Calculate segment lengths and total length of the feature polyline
+    segment_lengths = []
+    total_length = 0.0
+
+    for i in range(len(coords) - 1):
+        p1 = coords[i]
+        p2 = coords[i + 1]
+        # Convert coordinates once
+        p1_lat_lon = (p1[1], p1[0])
+        p2_lat_lon = (p2[1], p2[0])
+
+        length = calculate_distance(p1_lat_lon, p2_lat_lon)
+
+        # Only store non-zero lengths
+        if length > EPSILON:
+            segment_lengths.append(length)
+            total_length += length
+        else:
+            segment_lengths.append(0.0)
+
+    # Skip if no valid segments or total length is effectively zero
+    if total_length <= EPSILON:
+        return []
+
+    # 2. Determine Total Points for the entire polyline
+    multiplier = DENSITY_MULTIPLIERS.get(status, 1.0)
+    target_spacing = BASE_SPACING_METERS / multiplier
+    # Calculate points based on length and spacing - very short polylines might get 0 points
+    total_num_points = round(total_length / target_spacing)
+
+    # Skip if no points would be generated
+    if total_num_points <= 0:
+        return []
+
+    # 3. Calculate Actual Point Spacing
+    actual_spacing = total_length / total_num_points
+
+    # 4. Place Points along the polyline
+    points = []
+    cumulative_distance = 0.0
+    segment_index = 0
+    segment_count = len(segment_lengths)
+
+    for k in range(total_num_points):
+        # Target distance for current point
+        target_dist = (k + 0.5) * actual_spacing
+
+        # Find the segment containing this target distance
+        while (
+            segment_index < segment_count
+            and target_dist
+            > cumulative_distance + segment_lengths[segment_index] + EPSILON
+        ):
+            cumulative_distance += segment_lengths[segment_index]
+            segment_index += 1
+
+        # Ensure we don't exceed segment bounds
+        if segment_index >= segment_count:
+            segment_index = segment_count - 1
+
+        # Calculate position within the segment
+        current_segment_length = segment_lengths[segment_index]
+        dist_into_segment = target_dist - cumulative_distance
+
+        # Calculate interpolation factor
+        if current_segment_length > EPSILON:
+            t = min(1.0, max(0.0, dist_into_segment / current_segment_length))
+        else:
+            t = 0.0 if dist_into_segment < EPSILON else 1.0
+
+        # Get segment endpoints
+        p_start = coords[segment_index]
+        p_end_index = min(segment_index + 1, len(coords) - 1)
+        p_end = coords[p_end_index]
+
+        # Interpolate point (inline for speed instead of calling function)
+        if segment_index == p_end_index:
+            point = p_start
+        else:
+            point = [
+                p_start[0] + t * (p_end[0] - p_start[0]),  # longitude
+                p_start[1] + t * (p_end[1] - p_start[1]),  # latitude
+            ]
+        points.append(point)
+
+    return points
+
+
+def iter_traffic_points(traffic_data: TrafficData) -> Iterator[Dict[str, Any]]:
+    """
+    Yield GeoJSON point features along every road, one road at a time.
+
+    Same points as generate_traffic_points, but nothing is kept in memory, so
+    a streaming response can send the first points before the last are placed.
+    """
+    for feature in traffic_data.features:
+        status = feature.properties.status
+        status_value = status.value  # Cache the status value
+
+        for point in place_points_along_polyline(feature.geometry.coordinates, status):
+            # Create point feature with cached status value
+            yield {
+                "type": "Feature",
+                "properties": {"status": status_value},
+                "geometry": {"type": "Point", "coordinates": point},
+            }
+
+
+@timed("points")
 def generate_traffic_points(traffic_data: TrafficData) -> Dict[str, Any]:
     """
     Generate a GeoJSON point collection from traffic data with density based on traffic status.
@@ -211,133 +480,223 @@ def generate_traffic_points(traffic_data: TrafficData) -> Dict[str, Any]:
     - Congested: Higher density
     - Moderate: Medium density
     - Available: Base density
-
-    This method avoids point clustering at the nodes connecting segments.
     """
-    points_features = []
-    BASE_SPACING_METERS = 100.0  # Target spacing for AVAILABLE roads
-
-    # Pre-define density multipliers as constants
-    density_multipliers = {
-        TrafficStatus.CONGESTED: 6.0,  # e.g., 1 point every ~17m
-        TrafficStatus.MODERATE: 3.0,  # e.g., 1 point every ~33m
-        TrafficStatus.AVAILABLE: 1.0,  # e.g., 1 point every 100m
-    }
-
-    # Predefine small tolerance value for float comparisons
-    EPSILON = 1e-9
-
-    for feature in traffic_data.features:
-        coords = feature.geometry.coordinates
-        status = feature.properties.status
-
-        # Early return for features with insufficient coordinates
-        if len(coords) < 2:
-            continue
-
-        # 1. Calculate segment lengths and total length of the feature polyline
-        segment_lengths = []
-        total_length = 0.0
+    points_features = list(iter_traffic_points(traffic_data))
 
-        for i in range(len(coords) - 1):
-            p1 = coords[i]
-            p2 = coords[i + 1]
-            # Convert coordinates once
-            p1_lat_lon = (p1[1], p1[0])
-            p2_lat_lon = (p2[1], p2[0])
+    # Create and return the GeoJSON feature collection
+    points_geojson = {"type": "FeatureCollection", "features": points_features}
+    logger.debug(f"Generated {len(points_features)} traffic points along polylines.")
+    return points_geojson
 
-            length = calculate_distance(p1_lat_lon, p2_lat_lon)
 
-            # Only store non-zero lengths
-            if length > EPSILON:
-                segment_lengths.append(length)
-                total_length += length
-            else:
-                segment_lengths.append(0.0)
+class RoadNetwork:
+    """
+    Road geometry stored as flat arrays, independent of any hotspots.
 
-        # Skip if no valid segments or total length is effectively zero
-        if total_length <= EPSILON:
-            continue
+    coords holds interleaved vertex coordinates [lon0, lat0, lon1, lat1, ...]
+    and way i spans vertices offsets[i] up to offsets[i + 1]. Both may be plain
+    arrays or memoryviews over shared memory.
+    """
 
-        # 2. Determine Total Points for the entire polyline
-        multiplier = density_multipliers.get(status, 1.0)
-        target_spacing = BASE_SPACING_METERS / multiplier
-        # Calculate points based on length and spacing - very short polylines might get 0 points
-        total_num_points = round(total_length / target_spacing)
+    def __init__(self, coords: Sequence[float], offsets: Sequence[int]):
+        self.coords = coords
+        self.offsets = offsets
+        self._midpoints = None
+
+    @classmethod
+    def from_osm(cls, data: Dict[str, Any]) -> "RoadNetwork":
+        """Build the network from raw Overpass API data (same filtering as process_road_data)"""
+        nodes = {
+            node["id"]: (node["lon"], node["lat"])
+            for node in data["elements"]
+            if node["type"] == "node"
+        }
+        coords = array("d")
+        offsets = array("q", [0])
+        vertex_count = 0
+
+        for way in data["elements"]:
+            if way["type"] != "way" or len(way["nodes"]) < 2:
+                continue
+            way_coords = [nodes[node_id] for node_id in way["nodes"] if node_id in nodes]
+            if len(way_coords) < 2:
+                continue
+            for lon, lat in way_coords:
+                coords.append(lon)
+                coords.append(lat)
+            vertex_count += len(way_coords)
+            offsets.append(vertex_count)
+
+        return cls(coords, offsets)
+
+    @classmethod
+    def from_traffic_data(cls, traffic_data: TrafficData) -> "RoadNetwork":
+        """Build the network from already processed traffic features"""
+        coords = array("d")
+        offsets = array("q", [0])
+        vertex_count = 0
+        for feature in traffic_data.features:
+            for lon, lat in feature.geometry.coordinates:
+                coords.append(lon)
+                coords.append(lat)
+            vertex_count += len(feature.geometry.coordinates)
+            offsets.append(vertex_count)
+        return cls(coords, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def way_coordinates(self, index: int) -> List[List[float]]:
+        """Get the [longitude, latitude] pairs of a single way"""
+        coords = self.coords
+        return [
+            [coords[2 * v], coords[2 * v + 1]]
+            for v in range(self.offsets[index], self.offsets[index + 1])
+        ]
+
+    def midpoints(self) -> List[Tuple[float, float]]:
+        """Get the (latitude, longitude) midpoint of every way (computed once)"""
+        if self._midpoints is None:
+            coords = self.coords
+            offsets = self.offsets
+            midpoints = []
+            for i in range(len(offsets) - 1):
+                start, end = offsets[i], offsets[i + 1]
+                count = end - start
+                midpoints.append(
+                    (
+                        sum(coords[2 * start + 1 : 2 * end : 2]) / count,  # latitude
+                        sum(coords[2 * start : 2 * end : 2]) / count,  # longitude
+                    )
+                )
+            self._midpoints = midpoints
+        return self._midpoints
+
+
+@timed("roads.classify")
+def classify_road_statuses(network: RoadNetwork, hotspots: TrafficSourcesLike) -> bytes:
+    """Compute a status code (see STATUS_BY_CODE) for every way in the network."""
+    sources = TrafficSources.coerce(hotspots)
+    # Convert to (latitude, longitude) once
+    hotspots_lat_lon = sources.lat_lon()
+    weights = sources.weights
+    # A weight stretches a hotspot's reach, so widen the band to match
+    latitude_band = STATUS_LATITUDE_BAND * sources.max_weight()
+    available = CODE_BY_STATUS[TrafficStatus.AVAILABLE]
+    codes = bytearray([available]) * len(network)
+    for i, midpoint in enumerate(network.midpoints()):
+        min_distance = float("inf")
+        for j, hotspot in enumerate(hotspots_lat_lon):
+            # The latitude difference alone is a lower bound on the distance, so
+            # hotspots outside the band can never make this road busier
+            if abs(midpoint[0] - hotspot[0]) > latitude_band:
+                continue
+            distance = calculate_distance(midpoint, hotspot)
+            if weights is not None:
+                distance /= weights[j]
+            if distance < min_distance:
+                min_distance = distance
+        if min_distance < float("inf"):
+            codes[i] = CODE_BY_STATUS[status_for_distance(min_distance)]
+    return bytes(codes)
+
+
+@timed("points")
+def generate_traffic_point_arrays(
+    network: RoadNetwork, status_codes: bytes
+) -> Tuple[array, bytes]:
+    """
+    Generate traffic points for a classified network as compact arrays.
 
-        # Skip if no points would be generated
-        if total_num_points <= 0:
-            continue
+    Returns interleaved point coordinates [lon0, lat0, ...] and one status code per point.
+    """
+    point_coords = array("d")
+    point_codes = bytearray()
+    for i, code in enumerate(status_codes):
+        points = place_points_along_polyline(
+            network.way_coordinates(i), STATUS_BY_CODE[code]
+        )
+        for lon, lat in points:
+            point_coords.append(lon)
+            point_coords.append(lat)
+        point_codes.extend(bytes([code]) * len(points))
+    return point_coords, bytes(point_codes)
+
+
+@timed("roads.features")
+def traffic_data_from_statuses(network: RoadNetwork, status_codes: bytes) -> TrafficData:
+    """Build TrafficData features from a network and its way status codes"""
+    features = [
+        TrafficFeature(
+            type="Feature",
+            properties=TrafficFeatureProperties(status=STATUS_BY_CODE[code]),
+            geometry=TrafficLineCoordinates(
+                type="LineString", coordinates=network.way_coordinates(i)
+            ),
+        )
+        for i, code in enumerate(status_codes)
+    ]
+    return TrafficData(type="FeatureCollection", features=features)
+
+
+def iter_traffic_points_from_arrays(
+    point_coords: Sequence[float], point_codes: bytes
+) -> Iterator[Dict[str, Any]]:
+    """Yield GeoJSON point features from compact point arrays"""
+    status_values = [status.value for status in STATUS_BY_CODE]
+    for i, code in enumerate(point_codes):
+        yield {
+            "type": "Feature",
+            "properties": {"status": status_values[code]},
+            "geometry": {
+                "type": "Point",
+                "coordinates": [point_coords[2 * i], point_coords[2 * i + 1]],
+            },
+        }
+
+
+class TrafficPointStream:
+    """
+    Traffic point features placed lazily, as they are iterated.
 
-        # 3. Calculate Actual Point Spacing
-        actual_spacing = total_length / total_num_points
+    Holds either classified traffic data (points are placed road by road) or
+    the compact point arrays from the road pool. Unlike a generator it can be
+    pickled, so it can be returned from a process pool worker; the points are
+    produced wherever it is iterated (e.g. by a streaming response).
+    """
 
-        # 4. Place Points along the polyline
-        cumulative_distance = 0.0
-        segment_index = 0
-        segment_count = len(segment_lengths)
-        status_value = status.value  # Cache the status value
+    def __init__(
+        self,
+        traffic_data: Optional[TrafficData] = None,
+        point_coords: Optional[Sequence[float]] = None,
+        point_codes: Optional[bytes] = None,
+    ):
+        self.traffic_data = traffic_data
+        self.point_coords = point_coords
+        self.point_codes = point_codes
 
-        for k in range(total_num_points):
-            # Target distance for current point
-            target_dist = (k + 0.5) * actual_spacing
-
-            # Find the segment containing this target distance
-            while (
-                segment_index < segment_count
-                and target_dist
-                > cumulative_distance + segment_lengths[segment_index] + EPSILON
-            ):
-                cumulative_distance += segment_lengths[segment_index]
-                segment_index += 1
-
-            # Ensure we don't exceed segment bounds
-            if segment_index >= segment_count:
-                segment_index = segment_count - 1
-
-            # Calculate position within the segment
-            current_segment_length = segment_lengths[segment_index]
-            dist_into_segment = target_dist - cumulative_distance
-
-            # Calculate interpolation factor
-            if current_segment_length > EPSILON:
-                t = min(1.0, max(0.0, dist_into_segment / current_segment_length))
-            else:
-                t = 0.0 if dist_into_segment < EPSILON else 1.0
-
-            # Get segment endpoints
-            p_start = coords[segment_index]
-            p_end_index = min(segment_index + 1, len(coords) - 1)
-            p_end = coords[p_end_index]
-
-            # Interpolate point (inline for speed instead of calling function)
-            if segment_index == p_end_index:
-                point = p_start
-            else:
-                point = [
-                    p_start[0] + t * (p_end[0] - p_start[0]),  # longitude
-                    p_start[1] + t * (p_end[1] - p_start[1]),  # latitude
-                ]
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self.traffic_data is not None:
+            return iter_traffic_points(self.traffic_data)
+        return iter_traffic_points_from_arrays(self.point_coords, self.point_codes)
 
-            # Create point feature with cached status value
-            points_features.append(
-                {
-                    "type": "Feature",
-                    "properties": {"status": status_value},
-                    "geometry": {"type": "Point", "coordinates": point},
-                }
-            )
 
-    # Create and return the GeoJSON feature collection
-    points_geojson = {"type": "FeatureCollection", "features": points_features}
-    print(f"Generated {len(points_features)} traffic points along polylines.")
-    return points_geojson
+@timed("points")
+def traffic_points_from_arrays(
+    point_coords: Sequence[float], point_codes: bytes
+) -> Dict[str, Any]:
+    """Build the GeoJSON point collection from compact point arrays"""
+    features = list(iter_traffic_points_from_arrays(point_coords, point_codes))
+    return {"type": "FeatureCollection", "features": features}
 
 
 def main():
     """Main function to fetch and cache the data"""
+    from app.logging_setup import configure_logging
+
+    configure_logging()
     data = fetch_tampere_roads()
-    print(f"Successfully processed {len(data['elements'])} road elements")
+    logger.info(f"Successfully processed {len(data['elements'])} road elements")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+"""
+Foot traffic module for Tampere Explorer Hub.
+This module generates synthetic hourly foot traffic curves for locations with NumPy.
+
+Curves for many locations are produced in one vectorized call as a
+locations x 24 matrix. Random values come from a counter-based hash of
+(date, location, hour), so a location's curve does not depend on which other
+locations are generated with it.
+"""
+
+import hashlib
+from typing import List, Sequence
+
+import numpy as np
+
+from app.models import (
+    CompactFootTraffic,
+    FootTrafficData,
+    FootTrafficSeries,
+    FootTrafficType,
+)
+
+# Hour-of-day multipliers: morning peak (7-9am), lunch (11am-1pm),
+# evening peak (4-6pm) and night low (10pm-5am)
+HOUR_FACTORS = np.ones(24)
+HOUR_FACTORS[7:10] = 1.5
+HOUR_FACTORS[11:14] = 1.3
+HOUR_FACTORS[16:19] = 1.7
+HOUR_FACTORS[22:24] = 0.4
+HOUR_FACTORS[0:6] = 0.4
+
+# Base traffic is drawn uniformly from this inclusive range
+BASE_MIN = 30
+BASE_MAX = 200
+# Final values are scaled by a uniform variation from this range
+VARIATION_MIN = 0.8
+VARIATION_MAX = 1.2
+# Lowest value a location can have in any hour
+MIN_VALUE = 10
+
+# Independent random streams for the base value and the variation
+_BASE_STREAM = np.uint64(0x5EED0001)
+_VARIATION_STREAM = np.uint64(0x5EED0002)
+_HOURS = np.arange(24, dtype=np.uint64)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer, applied elementwise (uint64 arithmetic wraps)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _uniform(keys: np.ndarray, stream: np.uint64) -> np.ndarray:
+    """Uniform floats in [0, 1) for every (location key, hour) pair."""
+    location_states = _splitmix64(keys ^ stream)
+    bits = _splitmix64(location_states[:, None] + _HOURS[None, :])
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def _location_keys(location_ids: Sequence[str], target_date: str) -> np.ndarray:
+    """Stable 64-bit key per (date, location)."""
+    return np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(
+                    f"{target_date}_{location_id}".encode(), digest_size=8
+                ).digest(),
+                "little",
+            )
+            for location_id in location_ids
+        ],
+        dtype=np.uint64,
+    )
+
+
+def generate_foot_traffic_matrix(
+    location_ids: Sequence[str], target_date: str
+) -> np.ndarray:
+    """
+    Generate foot traffic for every location and hour of a date.
+
+    Args:
+        location_ids: Locations to generate curves for
+        target_date: Date in ISO format (YYYY-MM-DD)
+
+    Returns:
+        An int64 matrix of shape (len(location_ids), 24)
+    """
+    keys = _location_keys(location_ids, target_date)
+
+    # Base traffic value per location and hour
+    base = BASE_MIN + np.floor(
+        _uniform(keys, _BASE_STREAM) * (BASE_MAX - BASE_MIN + 1)
+    ).astype(np.int64)
+
+    # Adjust for time of day (broadcast over locations)
+    values = (base * HOUR_FACTORS).astype(np.int64)
+
+    # Randomize slightly
+    variation = VARIATION_MIN + (VARIATION_MAX - VARIATION_MIN) * _uniform(
+        keys, _VARIATION_STREAM
+    )
+    return np.maximum(MIN_VALUE, (values * variation).astype(np.int64))
+
+
+def tag_foot_traffic(values: Sequence[int], target_hour: int) -> List[FootTrafficData]:
+    """
+    Label an hourly curve as past, current or predicted relative to target_hour.
+
+    Curves are cached without labels (they don't depend on the hour), so this
+    runs per response. Values are trusted ints, so validation is skipped.
+    """
+    return [
+        FootTrafficData.model_construct(
+            hour=hour,
+            value=value,
+            type=FootTrafficType.PAST
+            if hour < target_hour
+            else FootTrafficType.PREDICTED
+            if hour > target_hour
+            else FootTrafficType.CURRENT,
+        )
+        for hour, value in enumerate(values)
+    ]
+
+
+def format_foot_traffic(
+    values: Sequence[int], target_hour: int, compact: bool = False
+) -> FootTrafficSeries:
+    """Encode an hourly curve as labelled hours, or compactly as values plus current hour."""
+    if compact:
+        return CompactFootTraffic.model_construct(
+            values=list(values), currentHour=target_hour
+        )
+    return tag_foot_traffic(values, target_hour)
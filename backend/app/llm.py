@@ -0,0 +1,240 @@
+"""
+LLM client module for Tampere Explorer Hub.
+This module owns the application-wide AsyncOpenAI client.
+
+One client (and so one keep-alive connection pool) is created in the FastAPI
+lifespan and shared by every request. Calls are awaited on the event loop,
+bounded by request timeouts and a concurrency semaphore.
+
+Every call also has an overall deadline, can be hedged with a second attempt
+once it runs longer than the recent p95, and goes through a circuit breaker
+that fails fast while OpenAI is down (see app/resilience.py).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+import openai
+
+from app import config
+from app.metrics import OPENAI_DEADLINE_EXCEEDED, observe_openai_call
+from app.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, hedged
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[openai.AsyncOpenAI] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+breaker = CircuitBreaker(
+    "openai",
+    failure_threshold=config.LLM_BREAKER_FAILURES,
+    reset_seconds=config.LLM_BREAKER_RESET_SECONDS,
+)
+# Recent successful call durations per operation, for the hedge delay
+_latencies: Dict[str, LatencyTracker] = {}
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when an LLM call missed its deadline or the circuit breaker is open."""
+
+
+def _create_client() -> openai.AsyncOpenAI:
+    """Build an AsyncOpenAI client with pooled connections and configured timeouts."""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY environment variable not set.")
+    http_client = openai.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=config.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=config.OPENAI_MAX_CONNECTIONS,
+        ),
+    )
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        base_url=config.OPENAI_BASE_URL,
+        timeout=httpx.Timeout(
+            config.OPENAI_TIMEOUT_SECONDS, connect=config.OPENAI_CONNECT_TIMEOUT_SECONDS
+        ),
+        max_retries=config.OPENAI_MAX_RETRIES,
+        http_client=http_client,
+    )
+
+
+def start_llm_client() -> None:
+    """Create the shared client (called from the application lifespan)."""
+    global _client, _semaphore
+    _semaphore = asyncio.Semaphore(config.OPENAI_MAX_CONCURRENCY)
+    if _client is None:
+        try:
+            _client = _create_client()
+        except RuntimeError as e:
+            # Routes report the missing key when they are called
+            logger.warning(f"OpenAI client not started: {e}")
+            return
+        logger.info(
+            f"Started OpenAI client (timeout={config.OPENAI_TIMEOUT_SECONDS}s, "
+            f"max_concurrency={config.OPENAI_MAX_CONCURRENCY})"
+        )
+
+
+async def close_llm_client() -> None:
+    """Close the shared client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_llm_client() -> openai.AsyncOpenAI:
+    """Get the shared client, creating it on first use outside the lifespan."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Whether an error means OpenAI is unhealthy: a timeout, connection error, 429 or 5xx.
+
+    Other errors (400 for a bad prompt, for example) are the caller's and
+    must not open the breaker for everyone.
+    """
+    if isinstance(
+        error, (asyncio.TimeoutError, openai.APIConnectionError, openai.RateLimitError)
+    ):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def _record_error(error: BaseException) -> None:
+    if _is_upstream_failure(error):
+        breaker.record_failure()
+    else:
+        # Still releases a half-open trial
+        breaker.record_ignored()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(config.OPENAI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+def _hedge_delay(operation: str) -> Optional[float]:
+    """Seconds before a hedged second attempt is sent, or None to not hedge."""
+    if not config.LLM_HEDGING:
+        return None
+    tracker = _latencies.get(operation)
+    if tracker is None or len(tracker) < config.LLM_HEDGE_MIN_SAMPLES:
+        return None
+    return tracker.percentile(95)
+
+
+async def create_chat_completion(operation: str, **kwargs: Any) -> Any:
+    """
+    Await a chat completion on the shared client.
+
+    At most OPENAI_MAX_CONCURRENCY calls are in flight at once; the rest wait
+    for a slot. `operation` labels the call in the OpenAI metrics. Raises
+    LLMUnavailableError if the breaker is open or LLM_DEADLINE_SECONDS passes.
+    """
+    # Before before_call(), so a client error can't strand a half-open trial
+    client = get_llm_client()
+    try:
+        breaker.before_call()
+    except CircuitOpenError as e:
+        raise LLMUnavailableError(str(e)) from e
+
+    async def attempt():
+        async with _get_semaphore():
+            with observe_openai_call(operation):
+                return await client.chat.completions.create(**kwargs)
+
+    started = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(
+            hedged(attempt, _hedge_delay(operation), operation),
+            config.LLM_DEADLINE_SECONDS,
+        )
+    except asyncio.TimeoutError as e:
+        breaker.record_failure()
+        OPENAI_DEADLINE_EXCEEDED.labels(operation=operation).inc()
+        raise LLMUnavailableError(
+            f"OpenAI {operation} call exceeded {config.LLM_DEADLINE_SECONDS}s deadline"
+        ) from e
+    except asyncio.CancelledError:
+        breaker.record_ignored()
+        raise
+    except Exception as e:
+        _record_error(e)
+        raise
+    breaker.record_success()
+    _latencies.setdefault(operation, LatencyTracker()).record(
+        time.perf_counter() - started
+    )
+    return response
+
+
+async def stream_chat_completion(operation: str, **kwargs: Any) -> AsyncIterator[str]:
+    """
+    Stream a chat completion on the shared client, yielding content deltas.
+
+    The concurrency slot is held until the stream is exhausted or closed.
+    LLM_DEADLINE_SECONDS covers the whole stream: waiting for a slot, the
+    start of the stream and every chunk, so a stalled stream can't hold the
+    slot (or a half-open breaker trial) indefinitely. The breaker applies as
+    in create_chat_completion.
+    """
+    # Before before_call(), so a client error can't strand a half-open trial
+    client = get_llm_client()
+    try:
+        breaker.before_call()
+    except CircuitOpenError as e:
+        raise LLMUnavailableError(str(e)) from e
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + config.LLM_DEADLINE_SECONDS
+    semaphore = _get_semaphore()
+    try:
+        # Each wait gets what is left of the deadline. (An asyncio.timeout
+        # block can't span the yields: it would cancel the consumer's code.)
+        await asyncio.wait_for(semaphore.acquire(), deadline - loop.time())
+        try:
+            with observe_openai_call(operation):
+                stream = await asyncio.wait_for(
+                    client.chat.completions.create(stream=True, **kwargs),
+                    deadline - loop.time(),
+                )
+                try:
+                    chunks = aiter(stream)
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(
+                                anext(chunks), deadline - loop.time()
+                            )
+                        except StopAsyncIteration:
+                            break
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                finally:
+                    await stream.close()
+        finally:
+            semaphore.release()
+    except (asyncio.CancelledError, GeneratorExit):
+        breaker.record_ignored()
+        raise
+    except asyncio.TimeoutError as e:
+        breaker.record_failure()
+        OPENAI_DEADLINE_EXCEEDED.labels(operation=operation).inc()
+        raise LLMUnavailableError(
+            f"OpenAI {operation} stream exceeded {config.LLM_DEADLINE_SECONDS}s deadline"
+        ) from e
+    except Exception as e:
+        _record_error(e)
+        raise
+    breaker.record_success()
@@ -0,0 +1,174 @@
+"""
+LLM cache module for Tampere Explorer Hub.
+This module caches LLM results in memory and in a SQLite file on disk.
+
+Entries are looked up in an in-process LRU first and then in SQLite, so
+results survive restarts and are shared by all workers on the host. Every
+entry carries a version (a hash of the prompt template and model), so
+changing the prompt invalidates old results without clearing the store.
+Only the in-memory lookup runs on the event loop; aget and aset touch
+SQLite in a worker thread, so a slow disk or a busy WAL never stalls it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from app.cache import InstrumentedCache
+from app.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize free text for use as a cache key (case, punctuation, whitespace)."""
+    text = _PUNCTUATION.sub(" ", text.casefold())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def prompt_version(*parts: str) -> str:
+    """Short stable hash of a prompt template and the settings that shape its output."""
+    digest = hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+    return digest[:16]
+
+
+class LLMCache:
+    """
+    Two-level cache for LLM results: in-memory LRU backed by SQLite.
+
+    Values must be JSON serializable. A value older than ttl_seconds, or stored
+    under a different version, is treated as a miss. With path set to None
+    (or an empty string) only the in-memory level is used.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        path: Optional[str] = None,
+        ttl_seconds: int = 0,
+        max_entries: int = 1024,
+    ):
+        self.name = name
+        self.version = version
+        self.path = path or None
+        self.ttl_seconds = ttl_seconds
+        self._memory = InstrumentedCache(name, max_entries)
+        self._disk_hits = CACHE_REQUESTS.labels(cache=f"{name}.disk", result="hit")
+        self._disk_misses = CACHE_REQUESTS.labels(cache=f"{name}.disk", result="miss")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite store on first use; disable the disk level on failure."""
+        if self._conn is None and self.path:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, version TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, value TEXT NOT NULL, "
+                    "PRIMARY KEY (namespace, key))"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache store {self.path} unavailable: {e}")
+                self.path = None
+        return self._conn
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created_at > self.ttl_seconds
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss (SQLite is read in a worker thread)."""
+        value = self._memory_get(key)
+        if value is None and self.path:
+            value = await asyncio.to_thread(self._disk_get, key)
+        return value
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Store value for key in both levels (SQLite is written in a worker thread)."""
+        created_at = time.time()
+        self._memory[key] = (created_at, value)
+        if self.path:
+            await asyncio.to_thread(self._disk_set, key, value, created_at)
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if self._expired(created_at):
+            self._memory.pop(key, None)
+            return None
+        return value
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        """Read key from SQLite and copy a hit into memory."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT version, created_at, value FROM llm_cache "
+                    "WHERE namespace = ? AND key = ?",
+                    (self.name, key),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache read failed: {e}")
+                return None
+
+        if row is None or row[0] != self.version or self._expired(row[1]):
+            self._disk_misses.inc()
+            return None
+        self._disk_hits.inc()
+        value = json.loads(row[2])
+        self._memory[key] = (row[1], value)
+        return value
+
+    def _disk_set(self, key: str, value: Any, created_at: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(namespace, key, version, created_at, value) VALUES (?, ?, ?, ?, ?)",
+                    (self.name, key, self.version, created_at, json.dumps(value)),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every entry of this cache from memory and disk."""
+        self._memory.clear()
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM llm_cache WHERE namespace = ?", (self.name,))
+                conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,133 @@
+"""
+Logging setup module for Tampere Explorer Hub.
+This module configures application logging so that log I/O never runs on a
+request thread.
+
+Records are put on an in-memory queue by a QueueHandler and written to
+stderr by a QueueListener thread. Level, format (text or JSON lines) and
+sampling of per-item debug lines are configured in app/config.py.
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app import config
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "sample":
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only one in `every` records that carry a `sample` key.
+
+    Per-item debug lines (one per map item or event) pass
+    extra={"sample": "<key>"}; each key is sampled separately. Records without
+    the key are never dropped.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters: Dict[str, "itertools.count"] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None or self.every == 1:
+            return True
+        counter = self._counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(key, itertools.count())
+        return next(counter) % self.every == 0
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only render the message (args may change after the call returns);
+        # timestamps, JSON encoding and tracebacks are formatted off-thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_configured = False
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging() -> None:
+    """Install the queue-based handler on the root logger (once per process)."""
+    global _configured, _handler, _listener
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+
+        formatter = (
+            JsonFormatter()
+            if config.LOG_FORMAT == "json"
+            else logging.Formatter(TEXT_FORMAT)
+        )
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+
+        if config.LOG_QUEUE:
+            log_queue = queue.SimpleQueue()
+            handler = _PreparedQueueHandler(log_queue)
+            _listener = QueueListener(log_queue, stream_handler)
+            _listener.start()
+        else:
+            handler = stream_handler
+        handler.addFilter(SamplingFilter(config.LOG_SAMPLE_EVERY))
+
+        root = logging.getLogger()
+        root.setLevel(config.LOG_LEVEL)
+        root.addHandler(handler)
+        _handler = handler
+
+
+def stop_logging() -> None:
+    """Flush queued records, stop the listener thread and remove the handler."""
+    global _configured, _handler, _listener
+    with _configure_lock:
+        if _handler is not None:
+            logging.getLogger().removeHandler(_handler)
+            _handler = None
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        _configured = False
+
+
+atexit.register(stop_logging)
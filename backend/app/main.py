@@ -1,7 +1,10 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query, APIRouter, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from app.models import (
@@ -18,6 +21,11 @@ from app.models import (
     HotspotType,
     LocationsResponse,
     LocationResponse,
+    LocationsTimelineResponse,
+    BatchSummaryRequest,
+    BatchSummaryResponse,
+    MapItemsBatchRequest,
+    MapItemsBatchResponse,
 )
 from app.database import (
     get_all_hotspots,
@@ -26,7 +34,11 @@ from app.database import (
     get_events_by_date,
     get_event_by_id,
     get_map_items,
+    get_map_items_batch,
     get_traffic_data,
+    get_traffic_snapshot,
+    get_traffic_sources,
+    get_traffic_stream,
     get_event_foot_traffic,
     get_hotspot_detailed_metrics,
     get_event_detailed_metrics,
@@ -34,27 +46,74 @@ from app.database import (
     get_all_locations,
     get_location_by_id,
     get_location_detailed_metrics,
+    get_locations_timeline,
 )
-from app.fetch_tampere_roads import generate_traffic_points
+from app.fetch_tampere_roads import TrafficPointStream, generate_traffic_points
 from app.business_requirements import (
     get_business_requirements_response,
-    classify_business_requirement_with_openai,
+    SUMMARY_FALLBACK,
+    classify_business_requirement,
     generate_llm_summary,
+    generate_llm_summaries_batch,
+    stream_llm_summary,
 )
-
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
+from app import config
+from app.llm import LLMUnavailableError, close_llm_client, start_llm_client
+from app.logging_setup import configure_logging, stop_logging
+from app.road_pool import shutdown_road_pool
+from app.timing import ServerTimingMiddleware, set_stage_observer, stage
+from app import metrics
+from app.singleflight import SingleFlight
+from app.responses import (
+    NDJSON_MEDIA_TYPE,
+    SSE_MEDIA_TYPE,
+    dumps,
+    fast_json,
+    iter_feature_collection,
+    iter_ndjson,
+    sse_event,
+    stream_features,
+)
+from app.executor import (
+    ExecutorBusyError,
+    run_cpu_bound,
+    stream_in_executor,
+    get_executor_stats,
+    shutdown_executor,
 )
+
+# Configure logging (queue-based, see app/logging_setup.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Identical concurrent snapshot requests (e.g. every client at an hour
+# rollover) share one computation instead of each queueing for the executor
+snapshot_flight = SingleFlight("snapshots")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up and tear down application-scoped resources."""
+    configure_logging()
+    start_llm_client()
+    lag_monitor = None
+    if config.METRICS_ENABLED:
+        lag_monitor = asyncio.create_task(metrics.monitor_event_loop_lag())
+    yield
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+    await close_llm_client()
+    shutdown_executor()
+    shutdown_road_pool()
+    metrics.mark_process_dead()
+    stop_logging()
+
 
 app = FastAPI(
     title="Tampere Explorer Hub API",
     description="API for the Tampere Explorer Hub application",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware to allow requests from the frontend
@@ -64,8 +123,168 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Per-stage request timings (Server-Timing header and a log line per request)
+if config.SERVER_TIMING:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Prometheus request metrics; stage durations feed the stage histogram
+if config.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    set_stage_observer(metrics.observe_stage)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics():
+        """Prometheus metrics (all workers in multiprocess mode)"""
+        body, content_type = metrics.render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    """Shed load when the CPU executor queue is full."""
+    logger.warning(f"Rejecting {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailableError):
+    """Fail fast when the LLM is down and there is no local fallback."""
+    logger.warning(f"LLM unavailable for {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Classification is temporarily unavailable, please retry shortly."},
+        headers={"Retry-After": str(int(config.LLM_BREAKER_RESET_SECONDS))},
+    )
+
+
+def _build_traffic(locations: List[Location]) -> Tuple[TrafficData, dict]:
+    """Run the road pipeline for the given locations (CPU-bound)."""
+    # Generate traffic data and traffic points using locations
+    traffic_data, traffic_points = get_traffic_snapshot(get_traffic_sources(locations))
+    logger.info("Traffic data and traffic points generated")
+    return traffic_data, traffic_points
+
+
+def _build_locations_snapshot(
+    date: str, time: int, compact: bool = False
+) -> LocationsResponse:
+    """Build the /locations payload for a date and hour (CPU-bound)."""
+    # Get locations with traffic data
+    locations = get_all_locations(date, time, compact)
+    logger.info(f"Retrieved {len(locations)} locations")
+
+    traffic_data, traffic_points = _build_traffic(locations)
+    return LocationsResponse(
+        locations=locations, traffic_data=traffic_data, traffic_points=traffic_points
+    )
+
+
+def _build_location_snapshot(
+    location_id: str, date: str, time: int, compact: bool = False
+) -> Optional[LocationResponse]:
+    """Build the /locations/{id} payload, or None if not found (CPU-bound)."""
+    location = get_location_by_id(location_id, date, time, compact)
+    if not location:
+        return None
+
+    traffic_data, traffic_points = _build_traffic([location])
+    return LocationResponse(
+        location=location, traffic_data=traffic_data, traffic_points=traffic_points
+    )
+
+
+def _build_traffic_data(
+    use_hotspots: bool, date: Optional[str], time: Optional[int]
+) -> TrafficData:
+    """Generate road traffic data, optionally around the ranked locations (CPU-bound)."""
+    if not use_hotspots:
+        return get_traffic_data([])  # Use empty list when hotspots are not wanted
+
+    # Use current date/time if not provided
+    if not date:
+        date = datetime.now().strftime("%Y-%m-%d")
+    if time is None:
+        time = datetime.now().hour
+
+    # Get locations from the database
+    locations = get_all_locations(date, time)
+    return get_traffic_data(get_traffic_sources(locations))
+
+
+def _build_traffic_points(
+    use_hotspots: bool, date: Optional[str], time: Optional[int]
+) -> dict:
+    """Generate road traffic points, optionally around the ranked locations (CPU-bound)."""
+    if not use_hotspots:
+        return get_traffic_snapshot([])[1]
+
+    # Use current date/time if not provided
+    if not date:
+        date = datetime.now().strftime("%Y-%m-%d")
+    if time is None:
+        time = datetime.now().hour
+
+    locations = get_all_locations(date, time)
+    return get_traffic_snapshot(get_traffic_sources(locations))[1]
+
+
+def _build_traffic_points_stream(
+    use_hotspots: bool, date: Optional[str], time: Optional[int]
+) -> TrafficPointStream:
+    """Classify the roads and return the lazily placed traffic points (CPU-bound)."""
+    if not use_hotspots:
+        return get_traffic_stream([])[1]
+
+    # Use current date/time if not provided
+    if not date:
+        date = datetime.now().strftime("%Y-%m-%d")
+    if time is None:
+        time = datetime.now().hour
+
+    locations = get_all_locations(date, time)
+    return get_traffic_stream(get_traffic_sources(locations))[1]
+
+
+def _build_locations_stream(
+    date: str, time: int, compact: bool = False
+) -> Tuple[List[Location], TrafficData, TrafficPointStream]:
+    """Rank locations and classify the roads; points are placed while streaming (CPU-bound)."""
+    locations = get_all_locations(date, time, compact)
+    logger.info(f"Retrieved {len(locations)} locations for streaming")
+    traffic_data, traffic_points = get_traffic_stream(get_traffic_sources(locations))
+    return locations, traffic_data, traffic_points
+
+
+def _iter_locations_json(
+    locations: List[Location], traffic_data: TrafficData, traffic_points: Iterable[Dict]
+) -> Iterator[bytes]:
+    """Encode a LocationsResponse-shaped JSON document chunk by chunk."""
+    yield b'{"locations":' + dumps(locations) + b',"traffic_data":'
+    yield from iter_feature_collection(traffic_data.features)
+    yield b',"traffic_points":'
+    yield from iter_feature_collection(traffic_points)
+    yield b"}"
+
+
+def _iter_locations_records(
+    locations: List[Location], traffic_data: TrafficData, traffic_points: Iterable[Dict]
+) -> Iterator[Dict]:
+    """Yield locations, roads and traffic points as tagged NDJSON records."""
+    for location in locations:
+        yield {"kind": "location", "data": location}
+    for feature in traffic_data.features:
+        yield {"kind": "road", "data": feature}
+    for point in traffic_points:
+        yield {"kind": "point", "data": point}
+
+
 # Create API router with /api prefix
 api_router = APIRouter(prefix="/api")
 
@@ -81,8 +300,9 @@ async def analyze_business_requirement(requirement: BusinessRequirementRequest):
     """Analyze business requirement text and return business preferences"""
     logger.info(f"Analyzing business requirement: {requirement.text}")
 
-    # Use OpenAI classification
-    result = classify_business_requirement_with_openai(requirement.text)
+    # Classify locally when confident, otherwise with OpenAI
+    with stage("llm"):
+        result = await classify_business_requirement(requirement.text)
     logger.debug(f"OpenAI classification result: {result}")
     logger.debug(f"Business field from OpenAI result: {result.get('business')}")
     if not result.get("supported", False):
@@ -147,6 +367,10 @@ async def read_locations(
         None, description="Selected date in ISO format (YYYY-MM-DD)"
     ),
     time: Optional[int] = Query(None, ge=0, le=23, description="Selected hour (0-23)"),
+    compact: bool = Query(
+        False,
+        description="Encode foot traffic as {values, currentHour} instead of one object per hour",
+    ),
 ):
     """
     Get all locations as hotspots (natural and event types).
@@ -165,47 +389,94 @@ async def read_locations(
 
     logger.info(f"Using date={date}, hour={time} for location request")
 
-    # Get locations with traffic data
-    locations = get_all_locations(date, time)
-    logger.info(f"Retrieved {len(locations)} locations")
+    return fast_json(
+        await snapshot_flight.do(
+            ("locations", date, time, compact),
+            run_cpu_bound,
+            _build_locations_snapshot,
+            date,
+            time,
+            compact,
+        )
+    )
 
-    # Convert Location objects to Hotspot objects for traffic generation
-    hotspots = []
-    for location in locations:
-        # Use venue_coordinates for event-hotspots if available
-        coordinates = location.coordinates
-        if location.type == HotspotType.EVENT and location.venue_coordinates:
-            coordinates = location.venue_coordinates
-
-        hotspot = Hotspot(
-            id=location.id,
-            name=location.name,
-            label=location.label,
-            address=f"{location.name} Area",  # Simple address
-            trafficLevel=location.trafficLevel,
-            weather=location.weather,
-            coordinates=coordinates,
-            population=location.population,
-            areaType=location.areaType,
-            peakHour=location.peakHour,
-            avgDailyTraffic=location.avgDailyTraffic,
-            dominantDemographics=location.dominantDemographics,
-            nearbyBusinesses=location.nearbyBusinesses,
-            footTraffic=location.footTraffic,
+
+@api_router.get("/locations/stream")
+async def read_locations_stream(
+    date: Optional[str] = Query(
+        None, description="Selected date in ISO format (YYYY-MM-DD)"
+    ),
+    time: Optional[int] = Query(None, ge=0, le=23, description="Selected hour (0-23)"),
+    compact: bool = Query(
+        False,
+        description="Encode foot traffic as {values, currentHour} instead of one object per hour",
+    ),
+    stream_format: str = Query(
+        "json",
+        alias="format",
+        pattern="^(json|ndjson)$",
+        description="json: chunked /locations document; ndjson: one {kind, data} record per line",
+    ),
+):
+    """
+    Streamed variant of /locations.
+    Locations and road statuses are computed first; traffic points are placed
+    and sent in chunks while the client is already reading the response.
+    """
+    logger.info(f"Locations stream requested: date={date}, time={time}")
+
+    # Use current date/time if not provided
+    if not date:
+        date = datetime.now().strftime("%Y-%m-%d")
+    if time is None:
+        time = datetime.now().hour
+
+    locations, traffic_data, traffic_points = await run_cpu_bound(
+        _build_locations_stream, date, time, compact
+    )
+    # Points are placed in the stream executor as the chunks are sent
+    if stream_format == "ndjson":
+        return StreamingResponse(
+            stream_in_executor(
+                iter_ndjson(
+                    _iter_locations_records(locations, traffic_data, traffic_points)
+                )
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
         )
-        hotspots.append(hotspot)
+    return StreamingResponse(
+        stream_in_executor(_iter_locations_json(locations, traffic_data, traffic_points)),
+        media_type="application/json",
+    )
 
-    # Generate traffic data using locations
-    traffic_data = get_traffic_data(hotspots)
-    logger.info("Traffic data generated")
 
-    # Generate traffic points from traffic data
-    traffic_points = generate_traffic_points(traffic_data)
-    logger.info("Traffic points generated")
+@api_router.get("/locations/timeline", response_model=LocationsTimelineResponse)
+async def read_locations_timeline(
+    date: Optional[str] = Query(
+        None, description="Selected date in ISO format (YYYY-MM-DD)"
+    ),
+    include_roads: bool = Query(
+        True, description="Whether to include the road geometry (sent once per day)"
+    ),
+):
+    """
+    Get the location ranking and road statuses for every hour of a date.
+    Lets the timeline slider scrub through the day without further requests.
+    """
+    logger.info(f"Locations timeline requested for date={date}")
 
-    # Return combined response
-    return LocationsResponse(
-        locations=locations, traffic_data=traffic_data, traffic_points=traffic_points
+    # Use current date if not provided
+    if not date:
+        date = datetime.now().strftime("%Y-%m-%d")
+
+    return fast_json(
+        await snapshot_flight.do(
+            ("timeline", date, include_roads),
+            run_cpu_bound,
+            get_locations_timeline,
+            date,
+            include_roads,
+        )
     )
 
 
@@ -216,6 +487,10 @@ async def read_location(
         None, description="Selected date in ISO format (YYYY-MM-DD)"
     ),
     time: Optional[int] = Query(None, ge=0, le=23, description="Selected hour (0-23)"),
+    compact: bool = Query(
+        False,
+        description="Encode foot traffic as {values, currentHour} instead of one object per hour",
+    ),
 ):
     """Get a specific location by ID with all its data, traffic data, and traffic points."""
     logger.info(
@@ -228,51 +503,27 @@ async def read_location(
     if time is None:
         time = datetime.now().hour
 
-    location = get_location_by_id(location_id, date, time)
-    if not location:
+    response = await snapshot_flight.do(
+        ("location", location_id, date, time, compact),
+        run_cpu_bound,
+        _build_location_snapshot,
+        location_id,
+        date,
+        time,
+        compact,
+    )
+    if response is None:
         logger.warning(f"Location with ID {location_id} not found")
         raise HTTPException(status_code=404, detail="Location not found")
 
-    # Create a hotspot object for traffic data generation
-    coordinates = location.coordinates
-    if location.type == HotspotType.EVENT and location.venue_coordinates:
-        coordinates = location.venue_coordinates
-
-    hotspot = Hotspot(
-        id=location.id,
-        name=location.name,
-        label=location.label,
-        address=f"{location.name} Area",  # Simple address
-        trafficLevel=location.trafficLevel,
-        weather=location.weather,
-        coordinates=coordinates,
-        population=location.population,
-        areaType=location.areaType,
-        peakHour=location.peakHour,
-        avgDailyTraffic=location.avgDailyTraffic,
-        dominantDemographics=location.dominantDemographics,
-        nearbyBusinesses=location.nearbyBusinesses,
-        footTraffic=location.footTraffic,
-    )
-
-    # Generate traffic data using this single location
-    traffic_data = get_traffic_data([hotspot])
-    logger.info("Traffic data generated for location")
-
-    # Generate traffic points from traffic data
-    traffic_points = generate_traffic_points(traffic_data)
-    logger.info("Traffic points generated for location")
-
-    return LocationResponse(
-        location=location, traffic_data=traffic_data, traffic_points=traffic_points
-    )
+    return fast_json(response)
 
 
 @api_router.get("/locations/{location_id}/detailed-metrics")
 async def read_location_detailed_metrics(location_id: str):
     """Get detailed metrics for a specific location"""
     logger.info(f"Detailed metrics requested for location ID: {location_id}")
-    detailed_metrics = get_location_detailed_metrics(location_id)
+    detailed_metrics = await run_cpu_bound(get_location_detailed_metrics, location_id)
     if "error" in detailed_metrics:
         logger.warning(f"Location with ID {location_id} not found")
         raise HTTPException(status_code=404, detail="Location not found")
@@ -280,6 +531,31 @@ async def read_location_detailed_metrics(location_id: str):
     return detailed_metrics
 
 
+@api_router.get("/map-items", response_model=List[MapItem])
+async def read_map_items(
+    lat: float = Query(..., description="Latitude of the center"),
+    lng: float = Query(..., description="Longitude of the center"),
+    radius: float = Query(500, gt=0, le=5000, description="Search radius in meters"),
+    types: Optional[List[str]] = Query(
+        None, description="Item types to include (repeat for several); all by default"
+    ),
+):
+    """Get bus stops, tram stations, businesses etc. placed on the streets near a point"""
+    return await run_cpu_bound(get_map_items, lat, lng, radius, types)
+
+
+@api_router.post("/map-items/batch", response_model=MapItemsBatchResponse)
+async def read_map_items_batch(request: MapItemsBatchRequest):
+    """Get map items around several centers (e.g. every visible hotspot) in one request"""
+    items = await run_cpu_bound(
+        get_map_items_batch,
+        [(center.lat, center.lng) for center in request.centers],
+        request.radius,
+        request.types,
+    )
+    return {"items": items}
+
+
 @api_router.get("/traffic", response_model=TrafficData, deprecated=True)
 async def read_traffic_data(
     use_hotspots: bool = Query(
@@ -296,49 +572,17 @@ async def read_traffic_data(
     """
     logger.info(f"Traffic data requested (use_hotspots={use_hotspots})")
 
-    if not use_hotspots:
-        data = get_traffic_data([])  # Use empty list when hotspots are not wanted
-    else:
-        # Use current date/time if not provided
-        if not date:
-            date = datetime.now().strftime("%Y-%m-%d")
-        if time is None:
-            time = datetime.now().hour
-
-        # Get locations from the database
-        locations = get_all_locations(date, time)
-
-        # Convert Location objects to Hotspot objects for traffic generation
-        hotspots = []
-        for location in locations:
-            # Use venue_coordinates for event-hotspots if available
-            coordinates = location.coordinates
-            if location.type == HotspotType.EVENT and location.venue_coordinates:
-                coordinates = location.venue_coordinates
-
-            hotspot = Hotspot(
-                id=location.id,
-                name=location.name,
-                label=location.label,
-                address=f"{location.name} Area",  # Simple address
-                trafficLevel=location.trafficLevel,
-                weather=location.weather,
-                coordinates=coordinates,
-                population=location.population,
-                areaType=location.areaType,
-                peakHour=location.peakHour,
-                avgDailyTraffic=location.avgDailyTraffic,
-                dominantDemographics=location.dominantDemographics,
-                nearbyBusinesses=location.nearbyBusinesses,
-                footTraffic=location.footTraffic,
-            )
-            hotspots.append(hotspot)
-
-        # Generate traffic data using converted hotspots
-        data = get_traffic_data(hotspots)
+    data = await snapshot_flight.do(
+        ("traffic", use_hotspots, date, time),
+        run_cpu_bound,
+        _build_traffic_data,
+        use_hotspots,
+        date,
+        time,
+    )
 
     logger.info("Traffic data generated")
-    return data
+    return fast_json(data)
 
 
 @api_router.get("/traffic/points", deprecated=True)
@@ -350,6 +594,11 @@ async def read_traffic_points(
         None, description="Selected date in ISO format (YYYY-MM-DD)"
     ),
     time: Optional[int] = Query(None, ge=0, le=23, description="Selected hour (0-23)"),
+    stream: Optional[str] = Query(
+        None,
+        pattern="^(geojson|ndjson)$",
+        description="Stream the points as chunked GeoJSON or as one feature per line (NDJSON)",
+    ),
 ):
     """
     Get traffic points for Tampere, optionally using hotspots.
@@ -357,49 +606,23 @@ async def read_traffic_points(
     """
     logger.info(f"Traffic points requested (use_hotspots={use_hotspots})")
 
-    if not use_hotspots:
-        traffic_data = get_traffic_data([])
-    else:
-        # Use current date/time if not provided
-        if not date:
-            date = datetime.now().strftime("%Y-%m-%d")
-        if time is None:
-            time = datetime.now().hour
-
-        # Get locations from the database
-        locations = get_all_locations(date, time)
-
-        # Convert Location objects to Hotspot objects
-        hotspots = []
-        for location in locations:
-            # Use venue_coordinates for event-hotspots if available
-            coordinates = location.coordinates
-            if location.type == HotspotType.EVENT and location.venue_coordinates:
-                coordinates = location.venue_coordinates
-
-            hotspot = Hotspot(
-                id=location.id,
-                name=location.name,
-                label=location.label,
-                address=f"{location.name} Area",
-                trafficLevel=location.trafficLevel,
-                weather=location.weather,
-                coordinates=coordinates,
-                population=location.population,
-                areaType=location.areaType,
-                peakHour=location.peakHour,
-                avgDailyTraffic=location.avgDailyTraffic,
-                dominantDemographics=location.dominantDemographics,
-                nearbyBusinesses=location.nearbyBusinesses,
-                footTraffic=location.footTraffic,
-            )
-            hotspots.append(hotspot)
-
-        traffic_data = get_traffic_data(hotspots)
-
-    points = generate_traffic_points(traffic_data)
+    if stream:
+        # Points are placed in the stream executor as they are sent
+        points = await run_cpu_bound(
+            _build_traffic_points_stream, use_hotspots, date, time
+        )
+        return stream_features(points, stream)
+
+    points = await snapshot_flight.do(
+        ("traffic_points", use_hotspots, date, time),
+        run_cpu_bound,
+        _build_traffic_points,
+        use_hotspots,
+        date,
+        time,
+    )
     logger.info("Traffic points generated")
-    return points
+    return fast_json(points)
 
 
 @api_router.post("/llm-summary")
@@ -411,18 +634,60 @@ async def llm_summary(request: Request):
         business_requirement = data.get("business_requirement", "")
         location_type = data.get("location_type", None)
         instructions = data.get("instructions", "")
-        summary = generate_llm_summary(
-            metrics=metrics,
-            business_requirement=business_requirement,
-            location_type=location_type,
-            instructions=instructions,
-        )
+        with stage("llm"):
+            summary = await generate_llm_summary(
+                metrics=metrics,
+                business_requirement=business_requirement,
+                location_type=location_type,
+                instructions=instructions,
+            )
         return {"summary": summary}
     except Exception as e:
         logger.error(f"LLM summary error: {e}", exc_info=True)
-        return {
-            "summary": "This area has promising metrics for your business. (LLM summary unavailable)"
-        }
+        return {"summary": SUMMARY_FALLBACK}
+
+
+@api_router.post("/llm-summary/batch", response_model=BatchSummaryResponse)
+async def llm_summary_batch(request: BatchSummaryRequest):
+    """Summarize and compare several zones (comparison views) in one request"""
+    with stage("llm"):
+        return await generate_llm_summaries_batch(
+            zones=[zone.model_dump() for zone in request.zones],
+            business_requirement=request.business_requirement,
+            instructions=request.instructions,
+        )
+
+
+@api_router.post("/llm-summary/stream")
+async def llm_summary_stream(request: Request):
+    """Stream a zone summary as Server-Sent Events while the LLM generates it"""
+    data = await request.json()
+
+    async def events():
+        parts = []
+        cached = False
+        with stage("llm"):
+            async for delta, cached in stream_llm_summary(
+                metrics=data.get("metrics", {}),
+                business_requirement=data.get("business_requirement", ""),
+                location_type=data.get("location_type", None),
+                instructions=data.get("instructions", ""),
+            ):
+                parts.append(delta)
+                yield sse_event({"delta": delta})
+        yield sse_event({"summary": "".join(parts).strip(), "cached": cached}, "done")
+
+    return StreamingResponse(
+        events(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@api_router.get("/executor/stats")
+async def read_executor_stats():
+    """Get queue depth and throughput counters for the CPU and stream executors"""
+    return get_executor_stats()
 
 
 # Include the API router in the main app
@@ -0,0 +1,225 @@
+"""
+Metrics module for Tampere Explorer Hub.
+This module defines the Prometheus metrics served at /metrics.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers (before they start). prometheus_client then
+keeps samples in files there and /metrics aggregates every worker.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Buckets for request handlers and pipeline stages (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration by route (until the last body byte)",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result", ["cache", "result"]
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total", "Entries evicted from bounded caches", ["cache"]
+)
+
+STAGE_SECONDS = Histogram(
+    "stage_duration_seconds",
+    "Duration of request stages (road loading, classification, points, ...)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+OPENAI_REQUEST_SECONDS = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI API call duration by operation",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+OPENAI_REQUEST_FAILURES = Counter(
+    "openai_request_failures_total", "Failed OpenAI API calls by operation", ["operation"]
+)
+CIRCUIT_BREAKER_OPEN = Gauge(
+    "circuit_breaker_open",
+    "1 while a circuit breaker is open (calls fail fast), else 0",
+    ["breaker"],
+    multiprocess_mode="max",
+)
+CIRCUIT_BREAKER_REJECTED = Counter(
+    "circuit_breaker_rejected_total", "Calls rejected by an open circuit breaker", ["breaker"]
+)
+HEDGED_REQUESTS = Counter(
+    "hedged_requests_total",
+    "Hedged second attempts launched after the hedge delay, and how many finished first",
+    ["operation", "result"],
+)
+OPENAI_DEADLINE_EXCEEDED = Counter(
+    "openai_deadline_exceeded_total",
+    "OpenAI calls abandoned at their deadline, by operation",
+    ["operation"],
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Calls that ran a computation (leader) or joined an identical in-flight one (coalesced)",
+    ["group", "role"],
+)
+LOCAL_CLASSIFIER_RESULTS = Counter(
+    "local_classifier_results_total",
+    "Business requirement classifications by the local classifier (hit) or the LLM (fallback)",
+    ["outcome"],
+)
+LOCAL_CLASSIFIER_AGREEMENT = Counter(
+    "local_classifier_agreement_total",
+    "Low-confidence local guesses compared with the LLM answer",
+    ["result"],
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up for a scheduled sleep",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+EXECUTOR_QUEUED = Gauge(
+    "executor_queued_jobs",
+    "Jobs waiting for an executor slot",
+    ["executor"],
+    multiprocess_mode="livesum",
+)
+EXECUTOR_ACTIVE = Gauge(
+    "executor_active_jobs",
+    "Jobs running in an executor",
+    ["executor"],
+    multiprocess_mode="livesum",
+)
+EXECUTOR_JOBS = Counter(
+    "executor_jobs_total", "Executor jobs by outcome", ["executor", "outcome"]
+)
+EXECUTOR_WAIT_SECONDS = Histogram(
+    "executor_wait_seconds",
+    "Time jobs waited for an executor slot",
+    ["executor"],
+    buckets=LATENCY_BUCKETS,
+)
+EXECUTOR_OPEN_STREAMS = Gauge(
+    "executor_open_streams",
+    "Streaming responses producing their chunks in an executor",
+    ["executor"],
+    multiprocess_mode="livesum",
+)
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    """Record a stage duration (registered as the timing module's stage observer)."""
+    STAGE_SECONDS.labels(stage=name).observe(seconds)
+
+
+@contextmanager
+def observe_openai_call(operation: str) -> Iterator[None]:
+    """Measure an OpenAI API call and count it as failed if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        OPENAI_REQUEST_FAILURES.labels(operation=operation).inc()
+        raise
+    finally:
+        OPENAI_REQUEST_SECONDS.labels(operation=operation).observe(
+            time.perf_counter() - started
+        )
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Sample event loop lag until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - scheduled))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render all metrics (from every worker in multiprocess mode)."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges on shutdown (multiprocess mode only)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count, duration and body size per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        body_bytes = 0
+
+        async def send_with_metrics(message):
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            # Label by route template (e.g. /api/locations/{location_id}) to keep
+            # the number of series bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+            HTTP_REQUEST_SECONDS.labels(method, route_path).observe(
+                time.perf_counter() - started
+            )
+            HTTP_RESPONSE_BYTES.labels(method, route_path).observe(body_bytes)
@@ -1,6 +1,6 @@
 from enum import Enum
-from typing import List, Optional, Tuple, Literal, Dict, Any
-from pydantic import BaseModel
+from typing import List, Optional, Tuple, Literal, Dict, Any, Union
+from pydantic import BaseModel, Field
 
 
 class TrafficLevel(str, Enum):
@@ -33,6 +33,17 @@ class FootTrafficData(BaseModel):
     type: FootTrafficType
 
 
+class CompactFootTraffic(BaseModel):
+    """Compact foot traffic series: hours before currentHour are past, after it predicted."""
+
+    values: List[int]  # Foot traffic value for each hour 0-23
+    currentHour: int
+
+
+# Either the full list of labelled hours or the compact encoding
+FootTrafficSeries = Union[List[FootTrafficData], CompactFootTraffic]
+
+
 class Hotspot(BaseModel):
     id: str
     name: str  # Fixed zone name
@@ -47,7 +58,7 @@ class Hotspot(BaseModel):
     avgDailyTraffic: Optional[str] = None
     dominantDemographics: Optional[str] = None
     nearbyBusinesses: Optional[str] = None
-    footTraffic: Optional[List[FootTrafficData]] = None
+    footTraffic: Optional[FootTrafficSeries] = None
 
 
 class Event(BaseModel):
@@ -89,7 +100,7 @@ class Location(BaseModel):
     coordinates: Tuple[float, float]  # [longitude, latitude]
 
     # Common fields for both types
-    footTraffic: Optional[List[FootTrafficData]] = None
+    footTraffic: Optional[FootTrafficSeries] = None
 
     # Natural-hotspot specific fields
     population: Optional[str] = None
@@ -113,7 +124,7 @@ class Location(BaseModel):
     venue_coordinates: Optional[Tuple[float, float]] = (
         None  # [longitude, latitude] for venue
     )
-    event_foot_traffic: Optional[List[FootTrafficData]] = (
+    event_foot_traffic: Optional[FootTrafficSeries] = (
         None  # Event-specific foot traffic data
     )
 
@@ -135,6 +146,21 @@ class MapItem(BaseModel):
     label: Optional[str] = None
 
 
+class MapItemsCenter(BaseModel):
+    lat: float
+    lng: float
+
+
+class MapItemsBatchRequest(BaseModel):
+    centers: List[MapItemsCenter] = Field(..., min_length=1, max_length=100)
+    radius: float = Field(500, gt=0, le=5000)  # meters
+    types: Optional[List[str]] = None
+
+
+class MapItemsBatchResponse(BaseModel):
+    items: List[List[MapItem]]  # One list per center, in request order
+
+
 class TimelineRange(BaseModel):
     start: int
     end: int
@@ -194,6 +220,23 @@ class BusinessRequirementNotSupported(BaseModel):
     input_text: Optional[str] = None
 
 
+class ZoneSummaryRequest(BaseModel):
+    id: str
+    metrics: Dict[str, Any] = {}
+    location_type: Optional[str] = None
+
+
+class BatchSummaryRequest(BaseModel):
+    zones: List[ZoneSummaryRequest] = Field(..., min_length=1, max_length=10)
+    business_requirement: str = ""
+    instructions: str = ""
+
+
+class BatchSummaryResponse(BaseModel):
+    summaries: Dict[str, str]  # Zone id -> summary
+    verdict: str  # Comparison of the zones
+
+
 class LocationsResponse(BaseModel):
     locations: List[Location]
     traffic_data: Optional[TrafficData] = None
@@ -204,3 +247,50 @@ class LocationResponse(BaseModel):
     location: Location
     traffic_data: Optional[TrafficData] = None
     traffic_points: Optional[Dict[str, Any]] = None
+
+
+class TimelineLocation(BaseModel):
+    """Hour-independent data for a location that appears in a timeline."""
+
+    id: str
+    name: str
+    coordinates: Tuple[float, float]  # [longitude, latitude]
+    footTraffic: List[int]  # Foot traffic value for each hour 0-23
+
+
+class TimelineRankingEntry(BaseModel):
+    """A ranked location within one hour of a timeline."""
+
+    id: str
+    label: str
+    type: HotspotType
+    trafficLevel: TrafficLevel
+    value: int  # Foot traffic at this hour
+    event_id: Optional[str] = None
+    event_name: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    venue_coordinates: Optional[Tuple[float, float]] = None
+    event_foot_traffic: Optional[List[int]] = None  # Values for each hour 0-23
+
+
+class TimelineHour(BaseModel):
+    hour: int
+    ranking: List[TimelineRankingEntry]
+    # One digit per road (same order as roads), indexing status_codes
+    road_statuses: str
+
+
+class TimelineRoads(BaseModel):
+    """Road geometry as flat arrays: road i spans vertices offsets[i] to offsets[i + 1]."""
+
+    coordinates: List[float]  # Interleaved [lon0, lat0, lon1, lat1, ...]
+    offsets: List[int]
+
+
+class LocationsTimelineResponse(BaseModel):
+    date: str
+    status_codes: List[TrafficStatus]
+    locations: List[TimelineLocation]
+    hours: List[TimelineHour]
+    roads: Optional[TimelineRoads] = None
@@ -0,0 +1,160 @@
+"""
+Resilience module for Tampere Explorer Hub.
+This module bounds the latency of calls to slow or failing upstreams.
+
+It provides a circuit breaker that fails fast after repeated errors, a
+rolling latency tracker, and a helper that races a hedged second attempt
+against a slow first one. app/llm.py combines them with a per-call deadline.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from app.metrics import CIRCUIT_BREAKER_OPEN, CIRCUIT_BREAKER_REJECTED, HEDGED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the breaker opens and calls are
+    rejected with CircuitOpenError for reset_seconds. Then one trial call is
+    let through (half-open): success closes the breaker, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._open_gauge = CIRCUIT_BREAKER_OPEN.labels(breaker=name)
+        self._rejected = CIRCUIT_BREAKER_REJECTED.labels(breaker=name)
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        self._rejected.inc()
+        raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit breaker '{self.name}' closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+            self._open_gauge.set(0)
+
+    def record_ignored(self) -> None:
+        """
+        A call ended without showing whether the upstream is healthy (it was
+        cancelled, or rejected as a caller error): neither success nor failure.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            trial_failed = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial_failed or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+                self._open_gauge.set(1)
+                logger.warning(
+                    f"Circuit breaker '{self.name}' opened after {self.failures} "
+                    f"consecutive failures (retry in {self.reset_seconds}s)"
+                )
+
+
+class LatencyTracker:
+    """Rolling window of recent call durations, for percentile estimates."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th percentile (0-100) of the window, or None when it is empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+async def hedged(
+    call: Callable[[], Awaitable[Any]], hedge_after: Optional[float], operation: str
+) -> Any:
+    """
+    Await call(); if it hasn't finished after hedge_after seconds, start a
+    second call() and return whichever finishes first (the other is cancelled).
+
+    A failed attempt doesn't end the race while the other is still running.
+    With hedge_after None only one attempt is made.
+    """
+    attempts = [asyncio.ensure_future(call())]
+    try:
+        if hedge_after is None:
+            return await attempts[0]
+
+        done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+        if done:
+            return attempts[0].result()
+
+        HEDGED_REQUESTS.labels(operation=operation, result="launched").inc()
+        attempts.append(asyncio.ensure_future(call()))
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is attempts[1]:
+                        HEDGED_REQUESTS.labels(operation=operation, result="won").inc()
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Also runs when the caller's deadline cancels us
+        for task in attempts:
+            if not task.done():
+                task.cancel()
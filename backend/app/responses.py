@@ -0,0 +1,130 @@
+"""
+Responses module for Tampere Explorer Hub.
+This module provides a fast JSON response class for large API payloads.
+
+FastAPI normally validates a returned object against the route's response
+model, walks it with jsonable_encoder and encodes it with the stdlib json
+module. For data the backend builds itself (locations, road traffic, traffic
+points) that work is redundant: OrjsonModelResponse dumps pydantic models
+straight to Python objects and encodes the result with orjson, which also
+handles enums, tuples and NumPy arrays natively.
+
+It also has helpers for streaming GeoJSON and NDJSON, so large feature
+collections are sent in chunks while they are still being produced, and for
+encoding Server-Sent Events.
+"""
+
+from typing import Any, Iterable, Iterator, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app import config
+from app.executor import stream_in_executor
+from app.timing import stage
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+# Items encoded per chunk, so the response isn't flushed once per feature
+STREAM_BATCH_SIZE = 500
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "tolist"):  # array.array
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize models, dicts and arrays to JSON bytes with orjson."""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class OrjsonModelResponse(JSONResponse):
+    """JSON response that serializes pydantic models and raw arrays with orjson.
+
+    Returning it from a route skips FastAPI's response-model validation, so
+    only use it for trusted data built by the backend.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with stage("serialize"):
+            return dumps(content)
+
+
+def fast_json(content: Any) -> Any:
+    """Wrap trusted route output in OrjsonModelResponse when FAST_JSON_RESPONSES is on.
+
+    With the setting off the content is returned unchanged and FastAPI
+    validates and encodes it as usual.
+    """
+    if config.FAST_JSON_RESPONSES:
+        return OrjsonModelResponse(content)
+    return content
+
+
+def iter_json_array(items: Iterable[Any]) -> Iterator[bytes]:
+    """Encode items as one JSON array, yielding a chunk every STREAM_BATCH_SIZE items."""
+    batch = []
+    first = True
+    yield b"["
+    for item in items:
+        batch.append(dumps(item))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield (b"" if first else b",") + b",".join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield (b"" if first else b",") + b",".join(batch)
+    yield b"]"
+
+
+def iter_feature_collection(features: Iterable[Any]) -> Iterator[bytes]:
+    """Encode features as a chunked GeoJSON FeatureCollection."""
+    yield b'{"type":"FeatureCollection","features":'
+    yield from iter_json_array(features)
+    yield b"}"
+
+
+def iter_ndjson(records: Iterable[Any]) -> Iterator[bytes]:
+    """Encode records as newline-delimited JSON, yielding a chunk every STREAM_BATCH_SIZE lines."""
+    batch = []
+    for record in records:
+        batch.append(dumps(record))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+def stream_features(features: Iterable[Any], stream_format: str) -> StreamingResponse:
+    """
+    Stream features as a GeoJSON FeatureCollection ("geojson") or one per line ("ndjson").
+
+    Features that are produced lazily are produced in the stream executor
+    along with their chunks. Raises ExecutorBusyError when too many streams
+    are open.
+    """
+    if stream_format == "ndjson":
+        chunks = iter_ndjson(features)
+        media_type = NDJSON_MEDIA_TYPE
+    else:
+        chunks = iter_feature_collection(features)
+        media_type = GEOJSON_MEDIA_TYPE
+    return StreamingResponse(stream_in_executor(chunks), media_type=media_type)
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Event with a JSON data payload."""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + dumps(data) + b"\n\n"
@@ -0,0 +1,153 @@
+"""
+Road pool module for Tampere Explorer Hub.
+This module runs the road traffic pipeline in worker processes.
+
+The road geometry is loaded once in the parent process and published to the
+workers through shared memory, so each request only ships the hotspot
+coordinate arrays in and compact status/point arrays back out.
+"""
+
+import logging
+import multiprocessing
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional
+
+from app import config
+from app.fetch_tampere_roads import (
+    RoadNetwork,
+    TrafficSources,
+    TrafficSourcesLike,
+    classify_road_statuses,
+    generate_traffic_point_arrays,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RoadPipelineResult(NamedTuple):
+    """Compact output of the road pipeline for one set of hotspots."""
+
+    status_codes: bytes  # One status code per way in the network
+    point_coords: array  # Interleaved [lon0, lat0, lon1, lat1, ...] traffic points
+    point_codes: bytes  # One status code per traffic point
+
+
+def compute_road_pipeline(
+    network: RoadNetwork, hotspots: TrafficSourcesLike
+) -> RoadPipelineResult:
+    """Classify every way and place traffic points for the given hotspots."""
+    status_codes = classify_road_statuses(network, hotspots)
+    point_coords, point_codes = generate_traffic_point_arrays(network, status_codes)
+    return RoadPipelineResult(status_codes, point_coords, point_codes)
+
+
+# Worker-side state, set by _init_worker in each pool process
+_worker_network: Optional[RoadNetwork] = None
+_worker_segments = []
+
+
+def _init_worker(coords_name: str, coords_len: int, offsets_name: str, offsets_len: int):
+    """Map the shared road geometry into this worker process."""
+    global _worker_network, _worker_segments
+    # Workers share the parent's resource tracker, so attaching here does not
+    # make the blocks get unlinked when a worker exits.
+    coords_segment = shared_memory.SharedMemory(name=coords_name)
+    offsets_segment = shared_memory.SharedMemory(name=offsets_name)
+    _worker_segments = [coords_segment, offsets_segment]
+    _worker_network = RoadNetwork(
+        coords_segment.buf.cast("d")[:coords_len],
+        offsets_segment.buf.cast("q")[:offsets_len],
+    )
+
+
+def _run_in_worker(sources: TrafficSources) -> RoadPipelineResult:
+    """Pool entry point: run the pipeline against the shared network."""
+    return compute_road_pipeline(_worker_network, sources)
+
+
+class RoadProcessPool:
+    """Process pool whose workers share one read-only copy of the road network."""
+
+    def __init__(self, network: RoadNetwork, max_workers: int):
+        self.network = network
+        self.max_workers = max_workers
+        self._segments = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _share(self, data: array) -> shared_memory.SharedMemory:
+        """Copy an array into a new shared memory block."""
+        payload = data.tobytes()
+        segment = shared_memory.SharedMemory(create=True, size=max(1, len(payload)))
+        segment.buf[: len(payload)] = payload
+        self._segments.append(segment)
+        return segment
+
+    def start(self) -> None:
+        """Publish the network to shared memory and start the workers."""
+        if self._pool is not None:
+            return
+        coords = array("d", self.network.coords)
+        offsets = array("q", self.network.offsets)
+        coords_segment = self._share(coords)
+        offsets_segment = self._share(offsets)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Spawn instead of fork: the server process runs many threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                coords_segment.name,
+                len(coords),
+                offsets_segment.name,
+                len(offsets),
+            ),
+        )
+        logger.info(
+            f"Started road process pool with {self.max_workers} workers "
+            f"({len(self.network)} ways, {len(coords) * 8 // 1024} KiB shared)"
+        )
+
+    def run(self, hotspots: TrafficSourcesLike) -> RoadPipelineResult:
+        """Run the road pipeline in a worker and wait for the result."""
+        self.start()
+        # Ship plain coordinate arrays, never pydantic models
+        sources = TrafficSources.coerce(hotspots)
+        return self._pool.submit(_run_in_worker, sources).result()
+
+    def shutdown(self) -> None:
+        """Stop the workers and release the shared memory."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+
+_road_pool: Optional[RoadProcessPool] = None
+_road_pool_lock = threading.Lock()
+
+
+def get_road_pool(network: RoadNetwork) -> RoadProcessPool:
+    """Get the application-wide road pool, starting it on first use."""
+    global _road_pool
+    with _road_pool_lock:
+        if _road_pool is None or _road_pool.network is not network:
+            if _road_pool is not None:
+                _road_pool.shutdown()
+            _road_pool = RoadProcessPool(network, config.ROAD_PROCESS_WORKERS)
+            _road_pool.start()
+        return _road_pool
+
+
+def shutdown_road_pool() -> None:
+    """Release road pool resources on application shutdown."""
+    global _road_pool
+    with _road_pool_lock:
+        if _road_pool is not None:
+            _road_pool.shutdown()
+            _road_pool = None
@@ -0,0 +1,84 @@
+"""
+Single-flight module for Tampere Explorer Hub.
+This module coalesces identical concurrent calls into one computation.
+
+When several callers ask for the same key while a call for it is in flight,
+they wait for that call's result instead of starting their own. Results are
+not kept after the call finishes; that is what the caches are for. The
+difference is the window before a cache is filled, e.g. when the hour rolls
+over and every client asks for the new snapshot at once.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.metrics import SINGLEFLIGHT_CALLS
+
+
+class SingleFlight:
+    """Coalesce concurrent coroutine calls with the same key (asyncio)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._leaders = SINGLEFLIGHT_CALLS.labels(group=name, role="leader")
+        self._coalesced = SINGLEFLIGHT_CALLS.labels(group=name, role="coalesced")
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Await func(*args, **kwargs), or the in-flight call for key if there is one."""
+        task = self._inflight.get(key)
+        if task is None:
+            self._leaders.inc()
+            # Run as a task so a cancelled caller doesn't cancel the others
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._coalesced.inc()
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class ThreadSingleFlight:
+    """Coalesce concurrent function calls with the same key across threads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._leaders = SINGLEFLIGHT_CALLS.labels(group=name, role="leader")
+        self._coalesced = SINGLEFLIGHT_CALLS.labels(group=name, role="coalesced")
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call func(*args, **kwargs), or wait for the in-flight call for key."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            self._coalesced.inc()
+            return future.result()
+
+        self._leaders.inc()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,178 @@
+"""
+Spatial index module for Tampere Explorer Hub.
+This module answers "which roads are near this point" without scanning the network.
+
+Road vertices are projected once to a local equirectangular plane (meters
+east/north of the network's centre) and hashed into square grid cells. A
+radius query only looks at the cells the circle touches, and a nearest-road
+query walks rings of cells outward from the query point. Over the few
+hundred meters these queries cover, the projected distance differs from the
+haversine distance by well under a meter.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from app.fetch_tampere_roads import RoadNetwork
+
+EARTH_RADIUS = 6371000  # meters
+
+
+class RoadVertexIndex:
+    """Grid hash of a road network's vertices, for radius and nearest-road queries."""
+
+    def __init__(self, network: RoadNetwork, cell_size: float = 100.0):
+        self.network = network
+        self.cell_size = cell_size
+        coords = network.coords
+        offsets = network.offsets
+        vertex_count = len(coords) // 2
+
+        # Project around the mean vertex position
+        if vertex_count:
+            self.origin_lat = sum(coords[1::2]) / vertex_count
+            self.origin_lng = sum(coords[0::2]) / vertex_count
+        else:
+            self.origin_lat = self.origin_lng = 0.0
+        self._scale_x = math.radians(1) * EARTH_RADIUS * math.cos(
+            math.radians(self.origin_lat)
+        )
+        self._scale_y = math.radians(1) * EARTH_RADIUS
+
+        self.xs = array("d", bytes(8 * vertex_count))
+        self.ys = array("d", bytes(8 * vertex_count))
+        # Way index of every vertex
+        self.ways = array("q", bytes(8 * vertex_count))
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for way in range(len(offsets) - 1):
+            for v in range(offsets[way], offsets[way + 1]):
+                x, y = self.project(coords[2 * v + 1], coords[2 * v])
+                self.xs[v] = x
+                self.ys[v] = y
+                self.ways[v] = way
+                self._cells.setdefault(self._cell(x, y), []).append(v)
+
+    def __len__(self) -> int:
+        return len(self.network)
+
+    def project(self, lat: float, lng: float) -> Tuple[float, float]:
+        """Meters east and north of the index origin."""
+        return (
+            (lng - self.origin_lng) * self._scale_x,
+            (lat - self.origin_lat) * self._scale_y,
+        )
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def ways_within(self, lat: float, lng: float, radius: float) -> List[int]:
+        """Indexes (ascending) of the ways with a vertex within radius meters."""
+        return self.ways_within_many([(lat, lng)], radius)[0]
+
+    def ways_within_many(
+        self, points: Sequence[Tuple[float, float]], radius: float
+    ) -> List[List[int]]:
+        """
+        ways_within for several (lat, lng) points in one pass.
+
+        Every cell touched by any of the circles is visited once, and each of
+        its vertices is tested only against the points whose circle touches it.
+        """
+        projected = [self.project(lat, lng) for lat, lng in points]
+        points_by_cell: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x, y) in enumerate(projected):
+            min_cx, min_cy = self._cell(x - radius, y - radius)
+            max_cx, max_cy = self._cell(x + radius, y + radius)
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    if (cx, cy) in self._cells:
+                        points_by_cell.setdefault((cx, cy), []).append(i)
+
+        radius_sq = radius * radius
+        xs, ys, ways = self.xs, self.ys, self.ways
+        found = [set() for _ in projected]
+        for cell, point_ids in points_by_cell.items():
+            for v in self._cells[cell]:
+                way = ways[v]
+                for i in point_ids:
+                    if way in found[i]:
+                        continue
+                    dx = xs[v] - projected[i][0]
+                    dy = ys[v] - projected[i][1]
+                    if dx * dx + dy * dy <= radius_sq:
+                        found[i].add(way)
+        return [sorted(ways_found) for ways_found in found]
+
+    def nearest_ways(self, lat: float, lng: float, count: int) -> List[int]:
+        """
+        Indexes of the count ways whose closest vertex is nearest, nearest first.
+
+        Cells are visited in square rings around the query point. Once the
+        ring at distance r has been visited, every unvisited vertex is at least
+        r cells away, so the search stops as soon as count ways are closer
+        than that.
+        """
+        x, y = self.project(lat, lng)
+        qx, qy = self._cell(x, y)
+        best: Dict[int, float] = {}
+        visited = 0
+        ring = 0
+        while visited < len(self._cells):
+            if ring == 0:
+                ring_cells = [(qx, qy)]
+            else:
+                ring_cells = [
+                    (qx + dx, qy + dy)
+                    for dx in range(-ring, ring + 1)
+                    for dy in (-ring, ring)
+                ] + [
+                    (qx + dx, qy + dy)
+                    for dx in (-ring, ring)
+                    for dy in range(-ring + 1, ring)
+                ]
+            for cell in ring_cells:
+                vertices = self._cells.get(cell)
+                if vertices is None:
+                    continue
+                visited += 1
+                self._update_best(best, vertices, x, y)
+
+            reach = ring * self.cell_size
+            if len(best) >= count and sum(
+                1 for d in best.values() if d <= reach
+            ) >= count:
+                break
+            # Far outside the network the rings are mostly empty; scan what's left
+            if (2 * ring + 1) ** 2 > 4 * len(self._cells):
+                self._update_best(best, range(len(self.xs)), x, y)
+                break
+            ring += 1
+
+        return sorted(best, key=lambda way: (best[way], way))[:count]
+
+    def _update_best(self, best: Dict[int, float], vertices, x: float, y: float) -> None:
+        """Lower best[way] to the distance of each given vertex of that way."""
+        xs, ys, ways = self.xs, self.ys, self.ways
+        for v in vertices:
+            distance = math.hypot(xs[v] - x, ys[v] - y)
+            way = ways[v]
+            if distance < best.get(way, float("inf")):
+                best[way] = distance
+
+    def closest_vertex(self, way: int, lat: float, lng: float) -> int:
+        """Position (within the way) of the way's vertex closest to the point."""
+        x, y = self.project(lat, lng)
+        start = self.network.offsets[way]
+        end = self.network.offsets[way + 1]
+        xs, ys = self.xs, self.ys
+        closest = start
+        closest_sq = float("inf")
+        for v in range(start, end):
+            dx = xs[v] - x
+            dy = ys[v] - y
+            distance_sq = dx * dx + dy * dy
+            if distance_sq < closest_sq:
+                closest_sq = distance_sq
+                closest = v
+        return closest - start
@@ -0,0 +1,172 @@
+"""
+Timing module for Tampere Explorer Hub.
+This module records how long each stage of a request takes.
+
+Stages (location ranking, road loading, classification, point placement,
+serialization, ...) are measured with stage() or @timed and collected in a
+per-request RequestTimings held in a context variable. ServerTimingMiddleware
+creates one per request, sends the totals in a Server-Timing header and logs
+them as one JSON line. A stage observer (the Prometheus stage histogram)
+can also be registered. With neither enabled, stage() and @timed only do a
+context variable lookup.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """Accumulated stage durations (seconds) for one request, in first-seen order."""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        # Stages may finish in executor threads while the request is running
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def header_value(self) -> str:
+        """Format the durations as a Server-Timing header value."""
+        with self._lock:
+            return ", ".join(
+                f"{name};dur={seconds * 1000:.1f}"
+                for name, seconds in self.durations.items()
+            )
+
+    def as_millis(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                name: round(seconds * 1000, 2)
+                for name, seconds in self.durations.items()
+            }
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+# Called with (name, seconds) for every finished stage, when set
+_stage_observer: Optional[Callable[[str, float], None]] = None
+
+
+def set_stage_observer(observer: Optional[Callable[[str, float], None]]) -> None:
+    """Register a function that receives every stage duration (e.g. for metrics)."""
+    global _stage_observer
+    _stage_observer = observer
+
+
+def _finish_stage(
+    timings: Optional[RequestTimings], name: str, seconds: float
+) -> None:
+    if timings is not None:
+        timings.add(name, seconds)
+    observer = _stage_observer
+    if observer is not None:
+        observer(name, seconds)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Get the timings of the request being handled, if timing is enabled."""
+    return _current_timings.get()
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Add an already measured duration to the current request."""
+    _finish_stage(_current_timings.get(), name, seconds)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Measure the enclosed block as a named stage of the current request."""
+    timings = _current_timings.get()
+    if timings is None and _stage_observer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _finish_stage(timings, name, time.perf_counter() - started)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of stage()."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None and _stage_observer is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _finish_stage(timings, name, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that times every HTTP request.
+
+    The Server-Timing header holds the stages finished before the response
+    headers were sent plus "app" (time to headers). The log line is written
+    after the body, so it also covers streamed responses ("total").
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings.add("app", time.perf_counter() - started)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header_value())
+                headers.append("Timing-Allow-Origin", "*")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            logger.info(
+                "server-timing "
+                + json.dumps(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+                        "stages_ms": timings.as_millis(),
+                    }
+                )
+            )
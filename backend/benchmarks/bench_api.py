@@ -0,0 +1,97 @@
+"""Benchmarks for full API requests and response serialization."""
+
+import asyncio
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from app import config, database
+from app.main import _build_locations_snapshot, _build_traffic_points, app
+from app.responses import dumps
+
+from benchmarks.conftest import BENCH_DATE, BENCH_HOUR
+
+LOCATIONS_URL = f"/api/locations?date={BENCH_DATE}&time={BENCH_HOUR}"
+# Every hotspot as a map items center
+MAP_ITEMS_CENTERS = [
+    {"lat": template["coordinates"][1], "lng": template["coordinates"][0]}
+    for template in database.HOTSPOT_TEMPLATES
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def locations_snapshot():
+    return _build_locations_snapshot(BENCH_DATE, BENCH_HOUR)
+
+
+@pytest.fixture(scope="module")
+def traffic_points():
+    return _build_traffic_points(True, BENCH_DATE, BENCH_HOUR)
+
+
+@pytest.mark.benchmark(group="api")
+@pytest.mark.parametrize("fast_json", [False, True], ids=["default", "orjson"])
+def test_api_locations(benchmark, client, monkeypatch, fast_json):
+    monkeypatch.setattr(config, "FAST_JSON_RESPONSES", fast_json)
+    response = benchmark(client.get, LOCATIONS_URL)
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="api")
+def test_api_locations_compact(benchmark, client):
+    response = benchmark(client.get, LOCATIONS_URL + "&compact=true")
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="api")
+def test_api_map_items_batch_cold(benchmark, client):
+    def request():
+        database.map_items_cache.clear()
+        return client.post(
+            "/api/map-items/batch", json={"centers": MAP_ITEMS_CENTERS, "radius": 500}
+        )
+
+    response = benchmark(request)
+    assert len(response.json()["items"]) == len(MAP_ITEMS_CENTERS)
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_serialize_locations_default(benchmark, locations_snapshot):
+    """FastAPI's path: validate against LocationsResponse, then the stdlib encoder."""
+    route = next(r for r in app.routes if getattr(r, "path", "") == "/api/locations")
+
+    def render():
+        content = asyncio.run(
+            serialize_response(
+                field=route.secure_cloned_response_field,
+                response_content=locations_snapshot,
+                is_coroutine=True,
+            )
+        )
+        return JSONResponse(content).body
+
+    assert benchmark(render)
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_serialize_locations_orjson(benchmark, locations_snapshot):
+    assert benchmark(dumps, locations_snapshot)
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_serialize_traffic_points_default(benchmark, traffic_points):
+    assert benchmark(lambda: JSONResponse(jsonable_encoder(traffic_points)).body)
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_serialize_traffic_points_orjson(benchmark, traffic_points):
+    assert benchmark(dumps, traffic_points)
@@ -0,0 +1,80 @@
+"""Benchmarks for location ranking, lookups, metrics, map items and foot traffic."""
+
+import pytest
+
+from app import database
+from app.foot_traffic import generate_foot_traffic_matrix
+
+from benchmarks.conftest import BENCH_DATE, BENCH_HOUR, clear_caches
+
+TAMPERE_LAT = 61.4978
+TAMPERE_LNG = 23.7610
+
+
+@pytest.mark.benchmark(group="locations")
+def test_get_all_locations_cold(benchmark):
+    locations = benchmark.pedantic(
+        database.get_all_locations,
+        args=(BENCH_DATE, BENCH_HOUR),
+        setup=clear_caches,
+        rounds=10,
+    )
+    assert locations
+
+
+@pytest.mark.benchmark(group="locations")
+def test_get_all_locations_warm(benchmark):
+    database.get_all_locations(BENCH_DATE, BENCH_HOUR)
+    locations = benchmark(database.get_all_locations, BENCH_DATE, BENCH_HOUR)
+    assert locations
+
+
+@pytest.mark.benchmark(group="locations")
+def test_get_all_locations_every_hour(benchmark, cold_caches):
+    def rank_day():
+        clear_caches()
+        return [database.get_all_locations(BENCH_DATE, hour) for hour in range(24)]
+
+    assert len(benchmark.pedantic(rank_day, rounds=3)) == 24
+
+
+@pytest.mark.benchmark(group="locations")
+def test_get_location_by_id(benchmark, locations):
+    location_id = locations[0].id
+    location = benchmark(
+        database.get_location_by_id, location_id, BENCH_DATE, BENCH_HOUR
+    )
+    assert location is not None
+
+
+@pytest.mark.benchmark(group="locations")
+def test_get_location_detailed_metrics(benchmark, locations):
+    location_id = next(loc.id for loc in locations if loc.id.startswith("LOC"))
+    metrics = benchmark(database.get_location_detailed_metrics, location_id)
+    assert "error" not in metrics
+
+
+@pytest.mark.benchmark(group="map-items")
+@pytest.mark.parametrize("radius", [500, 2000])
+def test_get_map_items(benchmark, radius):
+    def place():
+        database.map_items_cache.clear()
+        return database.get_map_items(TAMPERE_LAT, TAMPERE_LNG, radius)
+
+    items = benchmark(place)
+    assert items is not None
+
+
+@pytest.mark.benchmark(group="map-items")
+def test_get_map_items_cached(benchmark):
+    database.get_map_items(TAMPERE_LAT, TAMPERE_LNG, 500)
+    items = benchmark(database.get_map_items, TAMPERE_LAT, TAMPERE_LNG, 500)
+    assert items is not None
+
+
+@pytest.mark.benchmark(group="foot-traffic")
+@pytest.mark.parametrize("count", [100, 10_000])
+def test_generate_foot_traffic_matrix(benchmark, count):
+    location_ids = [f"LOC{i:05d}" for i in range(count)]
+    matrix = benchmark(generate_foot_traffic_matrix, location_ids, BENCH_DATE)
+    assert matrix.shape == (count, 24)
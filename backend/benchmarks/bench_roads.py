@@ -0,0 +1,72 @@
+"""Benchmarks for the road traffic pipeline on the bundled 5,454-way network."""
+
+import pytest
+
+from app.fetch_tampere_roads import (
+    RoadNetwork,
+    classify_road_statuses,
+    generate_traffic_point_arrays,
+    generate_traffic_points,
+    process_road_data,
+)
+from app.spatial_index import RoadVertexIndex
+
+# Keskustori, the busiest hotspot
+CENTER = (61.4978, 23.7610)
+
+
+@pytest.mark.benchmark(group="roads")
+def test_process_road_data(benchmark, osm_data, traffic_sources):
+    traffic_data = benchmark(process_road_data, osm_data, traffic_sources)
+    assert len(traffic_data.features) == 5454
+
+
+@pytest.mark.benchmark(group="roads")
+def test_process_road_data_without_hotspots(benchmark, osm_data):
+    traffic_data = benchmark(process_road_data, osm_data, None)
+    assert len(traffic_data.features) == 5454
+
+
+@pytest.mark.benchmark(group="roads")
+def test_generate_traffic_points(benchmark, traffic_data):
+    points = benchmark(generate_traffic_points, traffic_data)
+    assert points["features"]
+
+
+@pytest.mark.benchmark(group="roads")
+def test_classify_road_statuses(benchmark, osm_data, traffic_sources):
+    network = RoadNetwork.from_osm(osm_data)
+    network.midpoints()  # Computed once per process in the server
+    codes = benchmark(classify_road_statuses, network, traffic_sources)
+    assert len(codes) == len(network)
+
+
+@pytest.mark.benchmark(group="roads")
+def test_generate_traffic_point_arrays(benchmark, osm_data, traffic_sources):
+    network = RoadNetwork.from_osm(osm_data)
+    codes = classify_road_statuses(network, traffic_sources)
+    point_coords, point_codes = benchmark(
+        generate_traffic_point_arrays, network, codes
+    )
+    assert len(point_coords) == 2 * len(point_codes)
+
+
+@pytest.mark.benchmark(group="roads")
+def test_build_road_vertex_index(benchmark, osm_data):
+    network = RoadNetwork.from_osm(osm_data)
+    index = benchmark(RoadVertexIndex, network)
+    assert len(index) == len(network)
+
+
+@pytest.mark.benchmark(group="roads")
+def test_road_vertex_index_ways_within(benchmark, osm_data):
+    index = RoadVertexIndex(RoadNetwork.from_osm(osm_data))
+    ways = benchmark(index.ways_within, *CENTER, 300)
+    assert ways
+
+
+@pytest.mark.benchmark(group="roads")
+def test_road_vertex_index_nearest_ways(benchmark, osm_data):
+    index = RoadVertexIndex(RoadNetwork.from_osm(osm_data))
+    ways = benchmark(index.nearest_ways, *CENTER, 3)
+    assert len(ways) == 3
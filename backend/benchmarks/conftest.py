@@ -0,0 +1,114 @@
+"""
+Shared fixtures for the backend benchmarks.
+
+Road benchmarks run on the Tampere network bundled as app/tampere_roads.json
+(5,454 ways). It is converted to the Overpass response shape that
+process_road_data expects. The app's road loader is pointed at a copy in that
+shape too, so the API, location and map item benchmarks don't need the
+uncommitted Overpass cache (app/tampere_roads_raw.json) or network access.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mock data paths in app.database are relative to the backend directory
+os.chdir(BACKEND_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app import database, fetch_tampere_roads  # noqa: E402
+from app.fetch_tampere_roads import TrafficSources  # noqa: E402
+from app.models import TrafficData  # noqa: E402
+
+BUNDLED_ROADS_FILE = os.path.join(BACKEND_DIR, "app", "tampere_roads.json")
+
+# Fixed date and hour so runs are comparable between commits
+BENCH_DATE = "2025-05-10"
+BENCH_HOUR = 14
+
+
+def osm_from_traffic_data(traffic_data: dict) -> dict:
+    """Convert processed road features back into Overpass API elements."""
+    elements = []
+    node_ids = {}
+    for way_id, feature in enumerate(traffic_data["features"], start=1):
+        way_nodes = []
+        for lon, lat in feature["geometry"]["coordinates"]:
+            node_id = node_ids.get((lon, lat))
+            if node_id is None:
+                node_id = node_ids[(lon, lat)] = len(node_ids) + 1
+                elements.append(
+                    {"type": "node", "id": node_id, "lat": lat, "lon": lon}
+                )
+            way_nodes.append(node_id)
+        elements.append({"type": "way", "id": way_id, "nodes": way_nodes})
+    return {"elements": elements}
+
+
+def clear_caches() -> None:
+    """Reset the in-memory caches in app.database (simulates a cold start)."""
+    database.foot_traffic_cache.clear()
+    database.events_cache.clear()
+    database.date_events_cache.clear()
+    database.location_cache.clear()
+    database.mock_data_cache.clear()
+    database.map_items_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def bundled_roads() -> dict:
+    """The bundled Tampere road network as a GeoJSON dict."""
+    with open(BUNDLED_ROADS_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def osm_data(bundled_roads) -> dict:
+    """The bundled road network in Overpass API format."""
+    return osm_from_traffic_data(bundled_roads)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def bundled_road_loader(tmp_path_factory, osm_data):
+    """Make load_road_network() read the bundled network instead of Overpass."""
+    cache_file = tmp_path_factory.mktemp("roads") / "tampere_roads_raw.json"
+    cache_file.write_text(json.dumps(osm_data))
+    original = fetch_tampere_roads.OVERPASS_CACHE_FILE
+    fetch_tampere_roads.OVERPASS_CACHE_FILE = str(cache_file)
+    fetch_tampere_roads._road_network = None
+    yield
+    fetch_tampere_roads.OVERPASS_CACHE_FILE = original
+    fetch_tampere_roads._road_network = None
+
+
+@pytest.fixture(scope="session")
+def locations():
+    """Ranked locations for the benchmark date and hour."""
+    return database.get_all_locations(BENCH_DATE, BENCH_HOUR)
+
+
+@pytest.fixture(scope="session")
+def traffic_sources(locations) -> TrafficSources:
+    """Road traffic input for the ranked locations."""
+    return database.get_traffic_sources(locations)
+
+
+@pytest.fixture(scope="session")
+def traffic_data(osm_data, traffic_sources) -> TrafficData:
+    """Classified road features for the ranked locations."""
+    from app.fetch_tampere_roads import process_road_data
+
+    return process_road_data(osm_data, traffic_sources)
+
+
+@pytest.fixture
+def cold_caches():
+    """Clear the database caches before and after a benchmark."""
+    clear_caches()
+    yield clear_caches
+    clear_caches()
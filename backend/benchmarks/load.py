@@ -0,0 +1,417 @@
+"""
+Load generator for the backend (asyncio + httpx).
+
+Starts the OpenAI stub and one uvicorn worker running the app (unless
+--base-url points at a running server), replays a mix of requests and
+reports throughput, latency percentiles, error rate and response sizes per
+endpoint.
+
+Scenarios:
+    cold   Fresh server; every request uses a date nothing has cached yet.
+    warm   All 24 hours of one date are requested once, then the mix runs.
+    scrub  Virtual users drag the timeline slider: /locations for hours
+           0-23 in order, again and again, on one date.
+    llm    Only the LLM endpoints (classification, single, streamed and batch
+           summaries) over a small set of zones, so repeats exercise the
+           caches and request coalescing; the stub's call counts are reported.
+
+Run from the backend directory:
+    uv run python -m benchmarks.load --scenario all --concurrency 8 --requests 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOCATION_IDS = [f"LOC{i:03d}" for i in range(1, 11)]
+BUSINESS_REQUIREMENTS = [
+    "I want to open a food stall near busy streets",
+    "Looking for a good spot for a car wash in Tampere",
+    "Where should I set up my artisan stall on weekends?",
+]
+
+# (name, weight) of the endpoints in the default mix
+REQUEST_MIX = [
+    ("locations", 50),
+    ("location_by_id", 25),
+    ("detailed_metrics", 15),
+    ("analyze_business", 5),
+    ("llm_summary", 5),
+]
+
+# Zones the llm scenario summarizes; few, so requests repeat
+LLM_ZONES = [
+    {"id": f"zone{i}", "metrics": {"footTraffic": 80 + 40 * i}, "location_type": "natural"}
+    for i in range(6)
+]
+LLM_MIX = [
+    ("analyze_business", 30),
+    ("llm_summary", 40),
+    ("llm_summary_stream", 20),
+    ("llm_summary_batch", 10),
+]
+
+# A request: (endpoint name, method, path, JSON body)
+Request = Tuple[str, str, str, Optional[dict]]
+
+
+@dataclass
+class EndpointStats:
+    """Latencies and sizes collected for one endpoint."""
+
+    latencies: List[float] = field(default_factory=list)
+    sizes: List[int] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    app_path: str, port: int, env: Optional[Dict[str, str]] = None
+) -> subprocess.Popen:
+    """Start one uvicorn worker serving app_path and wait until it accepts requests."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            app_path,
+            "--port",
+            str(port),
+            "--workers",
+            "1",
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{app_path} exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{app_path} did not start on port {port}")
+
+
+def stop_server(process: Optional[subprocess.Popen]) -> None:
+    if process is not None and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def build_request(name: str, day: str, hour: int, rng: random.Random) -> Request:
+    """Build one request of the given endpoint type."""
+    if name == "locations":
+        return name, "GET", f"/api/locations?date={day}&time={hour}", None
+    if name == "location_by_id":
+        location_id = rng.choice(LOCATION_IDS)
+        return name, "GET", f"/api/locations/{location_id}?date={day}&time={hour}", None
+    if name == "detailed_metrics":
+        location_id = rng.choice(LOCATION_IDS)
+        return name, "GET", f"/api/locations/{location_id}/detailed-metrics", None
+    if name == "analyze_business":
+        body = {"text": rng.choice(BUSINESS_REQUIREMENTS)}
+        return name, "POST", "/api/analyze-business", body
+    if name == "llm_summary":
+        body = {
+            "metrics": {"footTraffic": rng.randint(50, 400), "hour": hour},
+            "business_requirement": rng.choice(BUSINESS_REQUIREMENTS),
+            "location_type": "natural",
+            "instructions": "Keep it short.",
+        }
+        return name, "POST", "/api/llm-summary", body
+    if name in ("llm_zone_summary", "llm_summary_stream"):
+        zone = rng.choice(LLM_ZONES)
+        body = {
+            "metrics": zone["metrics"],
+            "business_requirement": BUSINESS_REQUIREMENTS[0],
+            "location_type": zone["location_type"],
+        }
+        path = "/api/llm-summary/stream" if name == "llm_summary_stream" else "/api/llm-summary"
+        return ("llm_summary" if name == "llm_zone_summary" else name), "POST", path, body
+    if name == "llm_summary_batch":
+        body = {
+            "zones": rng.sample(LLM_ZONES, 3),
+            "business_requirement": BUSINESS_REQUIREMENTS[0],
+        }
+        return name, "POST", "/api/llm-summary/batch", body
+    raise ValueError(f"Unknown endpoint: {name}")
+
+
+def mix_requests(
+    count: int, day_for: Callable[[int], str], rng: random.Random
+) -> List[Request]:
+    """Draw count requests from REQUEST_MIX."""
+    names = [name for name, _ in REQUEST_MIX]
+    weights = [weight for _, weight in REQUEST_MIX]
+    return [
+        build_request(name, day_for(i), rng.randrange(24), rng)
+        for i, name in enumerate(rng.choices(names, weights, k=count))
+    ]
+
+
+def llm_requests(count: int, rng: random.Random) -> List[Request]:
+    """Draw count requests from LLM_MIX."""
+    names = [name for name, _ in LLM_MIX]
+    weights = [weight for _, weight in LLM_MIX]
+    return [
+        build_request(
+            "llm_zone_summary" if name == "llm_summary" else name,
+            "",
+            rng.randrange(24),
+            rng,
+        )
+        for name in rng.choices(names, weights, k=count)
+    ]
+
+
+def scrub_requests(count: int, day: str) -> List[Request]:
+    """Timeline slider: /locations for hours 0-23 in order, repeated."""
+    return [
+        ("locations_scrub", "GET", f"/api/locations?date={day}&time={i % 24}", None)
+        for i in range(count)
+    ]
+
+
+async def run_requests(
+    client: httpx.AsyncClient, requests: List[Request], concurrency: int
+) -> Tuple[Dict[str, EndpointStats], float]:
+    """Send requests with a fixed number of concurrent virtual users."""
+    stats: Dict[str, EndpointStats] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def user():
+        while True:
+            try:
+                name, method, path, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            endpoint = stats.setdefault(name, EndpointStats())
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                endpoint.sizes.append(len(response.content))
+                if response.status_code >= 400:
+                    endpoint.errors += 1
+            except httpx.HTTPError:
+                endpoint.errors += 1
+            endpoint.latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def summarize(stats: Dict[str, EndpointStats], elapsed: float) -> Dict[str, dict]:
+    """Per-endpoint (and total) throughput, percentiles, error rate and sizes."""
+    summary = {}
+    all_latencies, all_sizes, all_errors = [], [], 0
+    for name, endpoint in sorted(stats.items()):
+        all_latencies += endpoint.latencies
+        all_sizes += endpoint.sizes
+        all_errors += endpoint.errors
+        summary[name] = _summarize_one(
+            endpoint.latencies, endpoint.sizes, endpoint.errors, elapsed
+        )
+    summary["total"] = _summarize_one(all_latencies, all_sizes, all_errors, elapsed)
+    return summary
+
+
+def _summarize_one(
+    latencies: List[float], sizes: List[int], errors: int, elapsed: float
+) -> dict:
+    count = len(latencies)
+    return {
+        "requests": count,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "error_rate": errors / count if count else 0.0,
+        "avg_bytes": sum(sizes) / len(sizes) if sizes else 0,
+    }
+
+
+def print_summary(scenario: str, summary: Dict[str, dict]) -> None:
+    print(f"\n== {scenario} ==")
+    print(
+        f"{'endpoint':<20}{'reqs':>6}{'req/s':>9}{'p50 ms':>9}"
+        f"{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'avg KB':>9}"
+    )
+    for name, row in summary.items():
+        if name == "stub_calls":
+            print(f"OpenAI stub calls: {row}")
+            continue
+        print(
+            f"{name:<20}{row['requests']:>6}{row['throughput_rps']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['error_rate']:>8.1%}{row['avg_bytes'] / 1024:>9.1f}"
+        )
+
+
+async def run_scenario(
+    scenario: str, base_url: str, concurrency: int, count: int, seed: int
+) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    base_day = date(2025, 5, 10)
+    timeout = httpx.Timeout(120.0)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits
+    ) as client:
+        if scenario == "cold":
+            # A new date per request, so no location/foot traffic cache can hit
+            def day_for(i: int) -> str:
+                return (base_day + timedelta(days=1 + i)).isoformat()
+
+            requests = mix_requests(count, day_for, rng)
+        elif scenario == "warm":
+            day = base_day.isoformat()
+            await run_requests(client, scrub_requests(24, day), concurrency)
+            requests = mix_requests(count, lambda i: day, rng)
+        elif scenario == "scrub":
+            requests = scrub_requests(count, base_day.isoformat())
+        elif scenario == "llm":
+            requests = llm_requests(count, rng)
+        else:
+            raise ValueError(f"Unknown scenario: {scenario}")
+
+        stats, elapsed = await run_requests(client, requests, concurrency)
+    return summarize(stats, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenario", choices=["cold", "warm", "scrub", "llm", "all"], default="all"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--base-url", help="Test a running server instead of starting one"
+    )
+    parser.add_argument("--stub-latency-ms", type=float, default=50)
+    parser.add_argument(
+        "--stub-latency-dist",
+        choices=["fixed", "uniform", "lognormal", "exponential"],
+        default="fixed",
+    )
+    parser.add_argument(
+        "--stub-tail-rate", type=float, default=0.0, help="Share of slow stub calls"
+    )
+    parser.add_argument(
+        "--stub-error-rate", type=float, default=0.0, help="Share of failing stub calls"
+    )
+    parser.add_argument("--json-out", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    scenarios = (
+        ["cold", "warm", "scrub", "llm"] if args.scenario == "all" else [args.scenario]
+    )
+    results = {}
+    stub = None
+    stub_url = None
+    try:
+        if not args.base_url:
+            stub_port = free_port()
+            stub = start_server(
+                "benchmarks.openai_stub:app",
+                stub_port,
+                {
+                    "STUB_LATENCY_MS": str(args.stub_latency_ms),
+                    "STUB_LATENCY_DIST": args.stub_latency_dist,
+                    "STUB_TAIL_RATE": str(args.stub_tail_rate),
+                    "STUB_ERROR_RATE": str(args.stub_error_rate),
+                    "STUB_SEED": str(args.seed),
+                },
+            )
+            stub_url = f"http://127.0.0.1:{stub_port}"
+            app_env = {
+                # Start every run from empty LLM caches
+                "LLM_CACHE_PATH": "",
+                "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+                "OPENAI_API_KEY": "stub",
+            }
+
+        for scenario in scenarios:
+            server = None
+            base_url = args.base_url
+            try:
+                if not base_url:
+                    # Every scenario gets a fresh process, so caches start empty
+                    port = free_port()
+                    server = start_server("app.main:app", port, app_env)
+                    base_url = f"http://127.0.0.1:{port}"
+                if stub_url:
+                    httpx.post(f"{stub_url}/stub/reset")
+                results[scenario] = asyncio.run(
+                    run_scenario(
+                        scenario, base_url, args.concurrency, args.requests, args.seed
+                    )
+                )
+                if stub_url:
+                    results[scenario]["stub_calls"] = httpx.get(
+                        f"{stub_url}/stub/stats"
+                    ).json()
+            finally:
+                stop_server(server)
+            print_summary(scenario, results[scenario])
+    finally:
+        stop_server(stub)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(
+                {
+                    "concurrency": args.concurrency,
+                    "requests": args.requests,
+                    "scenarios": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+OpenAI-compatible stub server for latency and load tests.
+
+Serves POST /v1/chat/completions, streamed (stream=true, as Server-Sent
+Events) or not, with canned answers:
+- a classification JSON object when the request asks for
+  response_format=json_object,
+- per-zone summaries and a verdict for batch summary prompts,
+- a short summary otherwise.
+
+Latency, errors and answers are configured with environment variables:
+    STUB_LATENCY_MS        Median delay before the answer (or first token), default 50
+    STUB_LATENCY_DIST      fixed (default), uniform, lognormal or exponential
+    STUB_LATENCY_SPREAD    uniform: +/- this many ms; lognormal: sigma (default 0.5)
+    STUB_TAIL_RATE         Share of calls that get STUB_TAIL_MS extra delay (default 0)
+    STUB_TAIL_MS           Extra delay for tail calls (default 2000)
+    STUB_TOKEN_MS          Delay between streamed chunks (default 20)
+    STUB_ERROR_RATE        Share of calls answered with an error (default 0)
+    STUB_ERROR_STATUS      HTTP status of those errors (default 500; 429 for rate limits)
+    STUB_CANNED_JSON       JSON file overriding the canned "classification" and/or "summary"
+    STUB_SEED              Seed for the latency and error draws
+
+GET /stub/stats reports how many calls it served (to check caching and
+coalescing), POST /stub/reset clears the counters.
+
+Point the backend at it with OPENAI_BASE_URL=http://host:port/v1 and any
+OPENAI_API_KEY. Run with: uvicorn benchmarks.openai_stub:app --port 8100
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from collections import Counter
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "50"))
+STUB_LATENCY_DIST = os.getenv("STUB_LATENCY_DIST", "fixed").strip().lower()
+STUB_LATENCY_SPREAD = float(
+    os.getenv("STUB_LATENCY_SPREAD")
+    or ("0.5" if STUB_LATENCY_DIST == "lognormal" else "0")
+)
+STUB_TAIL_RATE = float(os.getenv("STUB_TAIL_RATE", "0"))
+STUB_TAIL_MS = float(os.getenv("STUB_TAIL_MS", "2000"))
+STUB_TOKEN_MS = float(os.getenv("STUB_TOKEN_MS", "20"))
+STUB_ERROR_RATE = float(os.getenv("STUB_ERROR_RATE", "0"))
+STUB_ERROR_STATUS = int(os.getenv("STUB_ERROR_STATUS", "500"))
+
+CANNED_CLASSIFICATION = {
+    "supported": True,
+    "business_type": "Mobile",
+    "business": "Food Stall",
+    "intent": "Research",
+    "location": "Tampere",
+    "message": "Business requirement classified.",
+}
+CANNED_SUMMARY = (
+    "This zone sees steady foot traffic through the afternoon with a clear "
+    "evening peak, which suits a mobile food business."
+)
+CANNED_VERDICT = "The first zone has the strongest foot traffic for this business."
+
+if os.getenv("STUB_CANNED_JSON"):
+    with open(os.environ["STUB_CANNED_JSON"]) as f:
+        _canned = json.load(f)
+    CANNED_CLASSIFICATION = _canned.get("classification", CANNED_CLASSIFICATION)
+    CANNED_SUMMARY = _canned.get("summary", CANNED_SUMMARY)
+    CANNED_VERDICT = _canned.get("verdict", CANNED_VERDICT)
+
+# Marks the zones block of the backend's batch summary prompt
+BATCH_ZONES_MARKER = "(as JSON, keyed by zone id):\n"
+
+rng = random.Random(os.getenv("STUB_SEED"))
+stats: Counter = Counter()
+
+app = FastAPI(title="OpenAI stub")
+
+
+def draw_latency() -> float:
+    """Seconds to wait before answering, drawn from the configured distribution."""
+    base = STUB_LATENCY_MS
+    if STUB_LATENCY_DIST == "uniform":
+        delay = rng.uniform(base - STUB_LATENCY_SPREAD, base + STUB_LATENCY_SPREAD)
+    elif STUB_LATENCY_DIST == "lognormal":
+        delay = base * rng.lognormvariate(0, STUB_LATENCY_SPREAD)
+    elif STUB_LATENCY_DIST == "exponential":
+        delay = rng.expovariate(1 / base) if base > 0 else 0
+    else:
+        delay = base
+    if STUB_TAIL_RATE and rng.random() < STUB_TAIL_RATE:
+        delay += STUB_TAIL_MS
+    return max(0.0, delay) / 1000
+
+
+def batch_answer(prompt: str) -> dict:
+    """Per-zone summaries and a verdict for the zones listed in a batch prompt."""
+    block = prompt.split(BATCH_ZONES_MARKER, 1)[1].split("\n", 1)[0]
+    return {
+        "summaries": {zone_id: CANNED_SUMMARY for zone_id in json.loads(block)},
+        "verdict": CANNED_VERDICT,
+    }
+
+
+def answer_for(body: dict) -> str:
+    """Canned completion text for a request."""
+    prompt = "\n".join(
+        str(message.get("content", "")) for message in body.get("messages", [])
+    )
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        if BATCH_ZONES_MARKER in prompt:
+            try:
+                answer = batch_answer(prompt)
+            except ValueError:
+                answer = {"summaries": {}, "verdict": CANNED_VERDICT}
+            stats["batch"] += 1
+            return json.dumps(answer)
+        stats["classify"] += 1
+        return json.dumps(CANNED_CLASSIFICATION)
+    stats["summary"] += 1
+    return CANNED_SUMMARY
+
+
+def error_response() -> JSONResponse:
+    stats["errors"] += 1
+    kind = "rate_limit_exceeded" if STUB_ERROR_STATUS == 429 else "server_error"
+    return JSONResponse(
+        status_code=STUB_ERROR_STATUS,
+        content={
+            "error": {
+                "message": "Injected stub error",
+                "type": kind,
+                "param": None,
+                "code": kind,
+            }
+        },
+    )
+
+
+async def stream_chunks(completion_id: str, model: str, content: str):
+    """Send content word by word as chat.completion.chunk events."""
+
+    def chunk(delta: dict, finish_reason=None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    words = content.split(" ")
+    for i, word in enumerate(words):
+        if i:
+            await asyncio.sleep(STUB_TOKEN_MS / 1000)
+        yield chunk({"content": word if i == 0 else " " + word})
+    yield chunk({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+    await asyncio.sleep(draw_latency())
+    if STUB_ERROR_RATE and rng.random() < STUB_ERROR_RATE:
+        return error_response()
+
+    content = answer_for(body)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    model = body.get("model", "stub")
+    if body.get("stream"):
+        stats["streams"] += 1
+        return StreamingResponse(
+            stream_chunks(completion_id, model, content),
+            media_type="text/event-stream",
+        )
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.get("/stub/stats")
+async def read_stats():
+    """Calls served so far, by kind."""
+    return dict(stats)
+
+
+@app.post("/stub/reset")
+async def reset_stats():
+    stats.clear()
+    return {}
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from app.llm_cache import LLMCache, normalize_text, prompt_version
+
+
+def test_normalize_text_ignores_case_punctuation_and_spacing():
+    assert normalize_text("  I want a CAR wash,  in Tampere! ") == "i want a car wash in tampere"
+
+
+def test_prompt_version_changes_with_prompt_and_model():
+    version = prompt_version("Classify: {text}", "gpt-4o-mini")
+    assert version == prompt_version("Classify: {text}", "gpt-4o-mini")
+    assert version != prompt_version("Classify this: {text}", "gpt-4o-mini")
+    assert version != prompt_version("Classify: {text}", "gpt-4o")
+
+
+def test_memory_level_evicts_least_recently_used():
+    cache = LLMCache("test", version="v1", max_entries=2)
+
+    async def run():
+        await cache.aset("a", 1)
+        await cache.aset("b", 2)
+        # Reading "a" makes "b" the least recently used entry
+        assert await cache.aget("a") == 1
+        await cache.aset("c", 3)
+        return [await cache.aget(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == [1, None, 3]
+
+
+def test_sqlite_round_trip(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    value = {"supported": True, "business": "Car Wash", "score": 0.9}
+    writer = LLMCache("test", version="v1", path=path)
+    asyncio.run(writer.aset("key", value))
+    writer.close()
+
+    # A new cache (another worker, or after a restart) reads it from disk
+    reader = LLMCache("test", version="v1", path=path)
+    assert asyncio.run(reader.aget("key")) == value
+    reader.close()
+
+
+def test_other_namespaces_are_separate(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    summaries = LLMCache("summary", version="v1", path=path)
+    asyncio.run(summaries.aset("key", "summary"))
+    classifications = LLMCache("classification", version="v1", path=path)
+    assert asyncio.run(classifications.aget("key")) is None
+    summaries.close()
+    classifications.close()
+
+
+def test_changed_prompt_version_invalidates_entries(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    old = LLMCache("test", version=prompt_version("old prompt"), path=path)
+    asyncio.run(old.aset("key", "old answer"))
+    old.close()
+
+    new = LLMCache("test", version=prompt_version("new prompt"), path=path)
+    assert asyncio.run(new.aget("key")) is None
+    asyncio.run(new.aset("key", "new answer"))
+    assert asyncio.run(new.aget("key")) == "new answer"
+    new.close()
+
+
+def test_expired_entries_are_misses(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    cache = LLMCache("test", version="v1", path=path, ttl_seconds=60)
+    cache._disk_set("old", "stale", time.time() - 120)
+    cache._disk_set("fresh", "ok", time.time())
+    assert asyncio.run(cache.aget("old")) is None
+    assert asyncio.run(cache.aget("fresh")) == "ok"
+    cache.close()
+
+
+def test_clear_drops_memory_and_disk(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    cache = LLMCache("test", version="v1", path=path)
+    asyncio.run(cache.aset("key", "value"))
+    cache.clear()
+    assert asyncio.run(cache.aget("key")) is None
+    cache.close()
+
+
+def test_unusable_store_falls_back_to_memory(tmp_path):
+    # A directory can't be opened as the SQLite file
+    cache = LLMCache("test", version="v1", path=str(tmp_path))
+    asyncio.run(cache.aset("key", "value"))
+    assert asyncio.run(cache.aget("key")) == "value"
+    assert cache.path is None
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from app import business_requirements, config
+from app.business_requirements import (
+    classify_business_requirement,
+    classify_business_requirement_locally,
+)
+
+THRESHOLD = config.LOCAL_CLASSIFIER_THRESHOLD
+
+
+@pytest.mark.parametrize(
+    "text, business, intent",
+    [
+        ("I want to open a car wash in Tampere", "Car Wash", "Setup"),
+        ("I want to start a car washing business", "Car Wash", "Setup"),
+        ("food truck in Tampere", "Food Stall", "Research"),
+        ("food trucks in Tampere", "Food Stall", "Research"),
+        ("where is the best place for a food stall in the city center", "Food Stall", "Research"),
+        ("artisan stall in Tampere", "Artisan Stall", "Research"),
+        ("Haluan avata autopesun Tampereella", "Car Wash", "Setup"),
+        ("ruokakoju Tampereen keskustassa", "Food Stall", "Research"),
+    ],
+)
+def test_confident_matches(text, business, intent):
+    result = classify_business_requirement_locally(text)
+    assert result.confidence >= THRESHOLD
+    assert result.preferences.business == business
+    assert result.preferences.intent.value == intent
+    assert result.preferences.location == "Tampere"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "carpet washing business in Tampere",
+        "food standards consultancy",
+        "I run a carpet shop",
+    ],
+)
+def test_stems_match_whole_words_only(text):
+    result = classify_business_requirement_locally(text)
+    assert result.preferences is None
+    assert result.confidence == 0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "car wash in Paris",
+        "car wash in New York",
+        "car wash in Rovaniemi",
+        "a food truck near the Kalevan Prisma",
+        "autopesu Rovaniemellä",
+    ],
+)
+def test_unknown_places_fall_below_threshold(text):
+    result = classify_business_requirement_locally(text)
+    assert result.preferences is not None
+    assert result.confidence < THRESHOLD
+
+
+def test_other_city_scores_zero():
+    assert classify_business_requirement_locally("car wash in Helsinki").confidence == 0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a food truck or a car wash in Tampere",
+        "not a car wash in Tampere",
+    ],
+)
+def test_ambiguous_or_negated_text_falls_below_threshold(text):
+    assert classify_business_requirement_locally(text).confidence < THRESHOLD
+
+
+def test_misspelling_matches_fuzzily():
+    result = classify_business_requirement_locally("handicrafts stall in Tampere")
+    assert result.preferences.business == "Artisan Stall"
+    misspelled = classify_business_requirement_locally("handicarft stall in Tampere")
+    assert misspelled.preferences.business == "Artisan Stall"
+    assert 0 < misspelled.confidence < 1
+
+
+class FakeLLM:
+    def __init__(self):
+        self.texts = []
+
+    async def __call__(self, text):
+        self.texts.append(text)
+        return {
+            "supported": False,
+            "business_type": None,
+            "business": None,
+            "intent": None,
+            "location": "Paris",
+            "message": "Only Tampere is supported.",
+        }
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(
+        business_requirements, "classify_business_requirement_with_openai", fake
+    )
+    monkeypatch.setattr(config, "LOCAL_CLASSIFIER_ENABLED", True)
+    return fake
+
+
+def test_confident_text_is_answered_without_the_llm(fake_llm):
+    result = asyncio.run(classify_business_requirement("I want to open a car wash in Tampere"))
+    assert fake_llm.texts == []
+    assert result["business"] == "Car Wash"
+
+
+def test_unknown_place_defers_to_the_llm(fake_llm):
+    result = asyncio.run(classify_business_requirement("car wash in Paris"))
+    assert fake_llm.texts == ["car wash in Paris"]
+    assert result["supported"] is False
+    assert result["location"] == "Paris"
+
+
+def test_threshold_decides_between_local_and_llm(fake_llm, monkeypatch):
+    text = "I'm interested in a car wash in Tampere"
+    confidence = classify_business_requirement_locally(text).confidence
+    assert 0 < confidence < 1
+
+    monkeypatch.setattr(config, "LOCAL_CLASSIFIER_THRESHOLD", confidence)
+    asyncio.run(classify_business_requirement(text))
+    assert fake_llm.texts == []
+
+    monkeypatch.setattr(config, "LOCAL_CLASSIFIER_THRESHOLD", confidence + 0.01)
+    asyncio.run(classify_business_requirement(text))
+    assert fake_llm.texts == [text]
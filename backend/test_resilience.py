@@ -0,0 +1,180 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from app import resilience
+from app.llm import _is_upstream_failure
+from app.resilience import CircuitBreaker, CircuitOpenError, hedged
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    return fake
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_through_and_success_closes(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 29
+    assert breaker.state == "open"
+    clock.now += 1
+    assert breaker.state == "half-open"
+
+    breaker.before_call()
+    # Only one trial at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("test", failure_threshold=5, reset_seconds=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 30
+    assert breaker.state == "half-open"
+    breaker.before_call()
+
+
+def test_ignored_trial_releases_the_slot(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    # Cancelled, or rejected as a caller error: the next call may be the trial
+    breaker.record_ignored()
+    assert breaker.state == "half-open"
+    breaker.before_call()
+
+
+def _status_error(cls, status):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, request=request)
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+def test_only_upstream_errors_count_as_failures():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    assert _is_upstream_failure(asyncio.TimeoutError())
+    assert _is_upstream_failure(openai.APIConnectionError(request=request))
+    assert _is_upstream_failure(openai.APITimeoutError(request=request))
+    assert _is_upstream_failure(_status_error(openai.RateLimitError, 429))
+    assert _is_upstream_failure(_status_error(openai.InternalServerError, 503))
+
+    assert not _is_upstream_failure(_status_error(openai.BadRequestError, 400))
+    assert not _is_upstream_failure(_status_error(openai.NotFoundError, 404))
+    assert not _is_upstream_failure(ValueError("bad JSON"))
+
+
+class Attempts:
+    """Call stand-in whose attempts take the given durations (or raise)."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self):
+        number = len(self.started)
+        self.started.append(time.perf_counter())
+        delay, result = self.outcomes[number]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(number)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_hedged_without_delay_makes_one_attempt():
+    call = Attempts((0.05, "first"))
+    assert asyncio.run(hedged(call, None, "test")) == "first"
+    assert len(call.started) == 1
+
+
+def test_hedged_fast_call_is_not_hedged():
+    call = Attempts((0.01, "first"), (0.01, "second"))
+    assert asyncio.run(hedged(call, 0.2, "test")) == "first"
+    assert len(call.started) == 1
+
+
+def test_hedged_second_attempt_starts_after_the_delay_and_wins():
+    call = Attempts((1.0, "first"), (0.01, "second"))
+    assert asyncio.run(hedged(call, 0.05, "test")) == "second"
+    assert len(call.started) == 2
+    assert call.started[1] - call.started[0] >= 0.05
+    # The slow first attempt is cancelled
+    assert call.cancelled == [0]
+
+
+def test_hedged_failed_attempt_does_not_end_the_race():
+    call = Attempts((0.1, RuntimeError("first failed")), (0.15, "second"))
+    assert asyncio.run(hedged(call, 0.05, "test")) == "second"
+
+
+def test_hedged_raises_when_every_attempt_fails():
+    call = Attempts((0.1, RuntimeError("first")), (0.1, RuntimeError("second")))
+    with pytest.raises(RuntimeError):
+        asyncio.run(hedged(call, 0.05, "test"))
+
+
+def test_hedged_cancels_attempts_when_cancelled():
+    call = Attempts((1.0, "first"), (1.0, "second"))
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(hedged(call, 0.05, "test"), 0.1)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert sorted(call.cancelled) == [0, 1]
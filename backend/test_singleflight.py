@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+from app.singleflight import SingleFlight, ThreadSingleFlight
+
+
+class CountingCall:
+    """Async call stand-in that counts its runs and takes a little while."""
+
+    def __init__(self, result="result", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, *args):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if self.error is not None:
+            raise self.error
+        return (self.result, args)
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    call = CountingCall()
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", call, 1) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert call.calls == 1
+    assert results == [("result", (1,))] * 10
+    assert len(flight) == 0
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight("test")
+    call = CountingCall()
+
+    async def run():
+        return await asyncio.gather(flight.do("a", call, "a"), flight.do("b", call, "b"))
+
+    assert asyncio.run(run()) == [("result", ("a",)), ("result", ("b",))]
+    assert call.calls == 2
+
+
+def test_exception_reaches_every_caller():
+    flight = SingleFlight("test")
+    error = ValueError("upstream failed")
+    call = CountingCall(error=error)
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do("key", call) for _ in range(5)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert call.calls == 1
+    assert all(result is error for result in results)
+    assert len(flight) == 0
+
+
+def test_finished_calls_are_not_reused():
+    flight = SingleFlight("test")
+    call = CountingCall()
+
+    async def run():
+        await flight.do("key", call)
+        await flight.do("key", call)
+
+    asyncio.run(run())
+    assert call.calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight("test")
+    call = CountingCall()
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", call))
+        second = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == ("result", ())
+    assert call.calls == 1
+
+
+def _run_threads(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_thread_callers_share_one_call():
+    flight = ThreadSingleFlight("test")
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        time.sleep(0.2)
+        return value * 2
+
+    results = _run_threads(8, lambda: flight.do("key", compute, 21))
+    assert calls == [21]
+    assert results == [42] * 8
+    assert len(flight) == 0
+
+
+def test_thread_exception_reaches_every_caller():
+    flight = ThreadSingleFlight("test")
+    error = RuntimeError("road pipeline failed")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        raise error
+
+    results = _run_threads(8, lambda: flight.do("key", compute))
+    assert len(calls) == 1
+    assert all(result is error for result in results)
+
+    # The failure isn't remembered: the next call runs again
+    assert flight.do("key", lambda: "recovered") == "recovered"
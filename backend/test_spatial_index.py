@@ -0,0 +1,118 @@
+import random
+from array import array
+
+import pytest
+
+from app.fetch_tampere_roads import RoadNetwork, calculate_distance
+from app.spatial_index import RoadVertexIndex
+
+CENTER = (61.4978, 23.7610)  # Tampere, (lat, lng)
+# Projected and haversine distances may differ by this much (meters)
+TOLERANCE = 1.0
+
+
+def random_network(seed=7, ways=400, spread=0.03):
+    """Roads of 2-8 vertices scattered around the centre, plus a far-off one."""
+    rng = random.Random(seed)
+    coords = array("d")
+    offsets = array("q", [0])
+    for _ in range(ways):
+        lat = CENTER[0] + rng.uniform(-spread, spread)
+        lng = CENTER[1] + rng.uniform(-2 * spread, 2 * spread)
+        for _ in range(rng.randint(2, 8)):
+            lat += rng.uniform(-0.001, 0.001)
+            lng += rng.uniform(-0.002, 0.002)
+            coords.extend((lng, lat))
+        offsets.append(len(coords) // 2)
+    coords.extend((24.5, 61.9, 24.51, 61.91))
+    offsets.append(len(coords) // 2)
+    return RoadNetwork(coords, offsets)
+
+
+def way_distances(network, lat, lng):
+    """Haversine distance from the point to the closest vertex of every way."""
+    coords = network.coords
+    distances = []
+    for way in range(len(network.offsets) - 1):
+        distances.append(
+            min(
+                calculate_distance((lat, lng), (coords[2 * v + 1], coords[2 * v]))
+                for v in range(network.offsets[way], network.offsets[way + 1])
+            )
+        )
+    return distances
+
+
+def query_points(seed=11, count=25):
+    rng = random.Random(seed)
+    points = [
+        (CENTER[0] + rng.uniform(-0.035, 0.035), CENTER[1] + rng.uniform(-0.07, 0.07))
+        for _ in range(count)
+    ]
+    # Outside the network, where the ring search gives up and scans
+    points.append((CENTER[0] + 0.2, CENTER[1] - 0.3))
+    return points
+
+
+@pytest.fixture(scope="module")
+def network():
+    return random_network()
+
+
+@pytest.fixture(scope="module", params=[50.0, 100.0, 400.0])
+def index(request, network):
+    return RoadVertexIndex(network, cell_size=request.param)
+
+
+def assert_same_ways_within(found, distances, radius):
+    expected = {way for way, d in enumerate(distances) if d <= radius - TOLERANCE}
+    allowed = {way for way, d in enumerate(distances) if d <= radius + TOLERANCE}
+    assert expected <= set(found) <= allowed
+    assert found == sorted(found)
+
+
+@pytest.mark.parametrize("radius", [30.0, 150.0, 600.0])
+def test_ways_within_matches_brute_force(network, index, radius):
+    for lat, lng in query_points():
+        found = index.ways_within(lat, lng, radius)
+        assert_same_ways_within(found, way_distances(network, lat, lng), radius)
+
+
+def test_ways_within_many_matches_single_queries(network, index):
+    points = query_points()
+    many = index.ways_within_many(points, 250.0)
+    assert many == [index.ways_within(lat, lng, 250.0) for lat, lng in points]
+    for (lat, lng), found in zip(points, many):
+        assert_same_ways_within(found, way_distances(network, lat, lng), 250.0)
+
+
+@pytest.mark.parametrize("count", [1, 3, 10])
+def test_nearest_ways_matches_brute_force(network, index, count):
+    for lat, lng in query_points():
+        distances = way_distances(network, lat, lng)
+        found = index.nearest_ways(lat, lng, count)
+        assert len(found) == count
+        assert len(set(found)) == count
+        expected = sorted(distances)[:count]
+        for way, expected_distance in zip(found, expected):
+            assert distances[way] == pytest.approx(expected_distance, abs=TOLERANCE)
+
+
+def test_closest_vertex_matches_brute_force(network, index):
+    coords = network.coords
+    for lat, lng in query_points()[:10]:
+        for way in index.nearest_ways(lat, lng, 3):
+            start, end = network.offsets[way], network.offsets[way + 1]
+            distances = [
+                calculate_distance((lat, lng), (coords[2 * v + 1], coords[2 * v]))
+                for v in range(start, end)
+            ]
+            closest = index.closest_vertex(way, lat, lng)
+            assert distances[closest] == pytest.approx(min(distances), abs=TOLERANCE)
+
+
+def test_empty_network():
+    index = RoadVertexIndex(RoadNetwork(array("d"), array("q", [0])))
+    assert len(index) == 0
+    assert index.ways_within(*CENTER, 500.0) == []
+    assert index.nearest_ways(*CENTER, 3) == []
@@ -155,6 +155,36 @@ export const fetchMapItems = async (
   }
 };
 
+// Fetch map items around several centers (e.g. every visible hotspot) in one request.
+// Returns one list of items per center, in the same order as centers.
+export const fetchMapItemsBatch = async (
+  centers: { lat: number; lng: number }[],
+  radius: number,
+  types?: string[]
+): Promise<MapItem[][]> => {
+  const url = buildUrl(`/map-items/batch`);
+  debugLog(`POST ${url}`, { centers: centers.length, radius, types });
+
+  try {
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ centers, radius, types }),
+    });
+    if (!response.ok) {
+      const errorText = await response.text();
+      debugLog(`Error fetching map items batch: ${response.status} ${response.statusText}`, errorText);
+      throw new Error('Failed to fetch map items');
+    }
+    const data = await response.json();
+    debugLog(`Map items batch response received`, { centers: data.items.length, types });
+    return data.items;
+  } catch (error) {
+    debugLog(`Exception in fetchMapItemsBatch`, error);
+    throw error;
+  }
+};
+
 // Function to fetch foot traffic data for a hotspot
 // Now deprecated - foot traffic is included in the hotspot data
 // Keeping for backward compatibility